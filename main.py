@@ -7,6 +7,7 @@ Output: JSON, CSV, Markdown, or YAML file with mod information
 
 import argparse
 import logging
+import multiprocessing
 import sys
 from pathlib import Path
 from typing import Optional
@@ -23,8 +24,13 @@ except ImportError:
 
 from src import __version__
 from src.scanner import ModScanner
-from src.models import ScanResult
+from src.jarfile import normalize_hash_algorithms
+from src.cache import ScanCache
+from src.hashindex import HashIndex, build_index, read_dump
+from src import jsonbackend
+from src.models import MOD_FIELDS, CensusResult, ScanResult, UpdateReport, normalize_fields
 from src.formatters import FORMATTERS, get_formatter
+from src.updates import check_updates_from_file
 
 # Set up console
 console = Console() if RICH_AVAILABLE else None
@@ -56,6 +62,22 @@ def setup_logging(level: str = "INFO", log_file: Optional[Path] = None) -> None:
     )
 
 
+def parse_fields(value: str):
+    """Parse a comma-separated --fields value into a field projection."""
+    try:
+        return normalize_fields(name.strip() for name in value.split(',') if name.strip())
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_hashes(value: str):
+    """Parse a comma-separated --hash value into hash algorithm names."""
+    try:
+        return normalize_hash_algorithms(name for name in value.split(',') if name.strip())
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def print_summary(result: ScanResult, show_duplicates: bool = True) -> None:
     """Print a summary of the scan results."""
     if RICH_AVAILABLE and console:
@@ -68,6 +90,8 @@ def print_summary(result: ScanResult, show_duplicates: bool = True) -> None:
         table.add_row("Files Scanned", str(result.total_files))
         table.add_row("Scan Duration", f"{result.scan_duration:.2f}s")
         table.add_row("Errors", str(len(result.errors)))
+        if result.cache_hits or result.cache_misses:
+            table.add_row("Cache Hits", f"{result.cache_hits}/{result.cache_hits + result.cache_misses}")
         
         # Count by loader
         loaders = {}
@@ -99,6 +123,8 @@ def print_summary(result: ScanResult, show_duplicates: bool = True) -> None:
         print(f"Files Scanned: {result.total_files}")
         print(f"Scan Duration: {result.scan_duration:.2f}s")
         print(f"Errors: {len(result.errors)}")
+        if result.cache_hits or result.cache_misses:
+            print(f"Cache Hits: {result.cache_hits}/{result.cache_hits + result.cache_misses}")
         
         loaders = {}
         for mod in result.mods:
@@ -112,7 +138,73 @@ def print_summary(result: ScanResult, show_duplicates: bool = True) -> None:
             print(f"\n⚠ {len(result.errors)} error(s) encountered")
 
 
-def scan_with_progress(scanner: ModScanner, folder_path: Path, recursive: bool, exclude: list, include_disabled: bool = False) -> ScanResult:
+def print_census(census: CensusResult) -> None:
+    """Print the per-loader counts of a census."""
+    if RICH_AVAILABLE and console:
+        table = Table(title="Loader Census", show_header=False)
+        table.add_column("Loader", style="cyan")
+        table.add_column("JARs", style="green")
+        
+        for loader, count in census.counts.items():
+            table.add_row(loader.replace('_', ' ').capitalize(), str(count))
+        table.add_row("Files Scanned", str(census.total_files))
+        table.add_row("Scan Duration", f"{census.scan_duration:.2f}s")
+        table.add_row("Errors", str(len(census.errors)))
+        
+        console.print(table)
+        
+        if census.unknown:
+            console.print(f"\n[yellow]⚠ {len(census.unknown)} JAR(s) without loader metadata:[/yellow]")
+            for path in census.unknown:
+                console.print(f"  • {path}")
+    else:
+        print(f"\n{'='*50}")
+        print(f"Loader Census")
+        print(f"{'='*50}")
+        for loader, count in census.counts.items():
+            print(f"{loader.replace('_', ' ').capitalize()}: {count}")
+        print(f"Files Scanned: {census.total_files}")
+        print(f"Scan Duration: {census.scan_duration:.2f}s")
+        print(f"Errors: {len(census.errors)}")
+        
+        if census.unknown:
+            print(f"\n⚠ {len(census.unknown)} JAR(s) without loader metadata:")
+            for path in census.unknown:
+                print(f"  - {path}")
+
+
+def print_updates(report: UpdateReport) -> None:
+    """Print the mods with newer versions in the catalog."""
+    if RICH_AVAILABLE and console:
+        table = Table(title=f"Updates Available ({len(report.updates)})")
+        table.add_column("Mod", style="cyan")
+        table.add_column("Current")
+        table.add_column("Latest", style="green")
+        
+        for candidate in report.updates:
+            table.add_row(candidate.mod.name, candidate.mod.version, candidate.latest_version)
+        
+        console.print(table)
+        console.print(f"Up to date: {report.up_to_date}, not in catalog: {len(report.not_found)}, "
+                      f"not comparable: {len(report.not_comparable)}")
+    else:
+        print(f"\n{'='*50}")
+        print(f"Updates Available ({len(report.updates)})")
+        print(f"{'='*50}")
+        for candidate in report.updates:
+            print(f"{candidate.mod.name}: {candidate.mod.version} -> {candidate.latest_version}")
+        print(f"Up to date: {report.up_to_date}, not in catalog: {len(report.not_found)}, "
+              f"not comparable: {len(report.not_comparable)}")
+
+
+def scan_with_progress(
+    scanner: ModScanner,
+    folder_path: Path,
+    recursive: bool,
+    exclude: list,
+    include_disabled: bool = False,
+    max_depth: Optional[int] = None
+) -> ScanResult:
     """Scan with progress bar if rich is available."""
     if RICH_AVAILABLE and console:
         with Progress(
@@ -134,7 +226,8 @@ def scan_with_progress(scanner: ModScanner, folder_path: Path, recursive: bool,
                 recursive=recursive,
                 exclude_patterns=exclude,
                 include_disabled=include_disabled,
-                progress_callback=update_progress
+                progress_callback=update_progress,
+                max_depth=max_depth
             )
             
             progress.update(task, completed=result.total_files, description="[green]Done!")
@@ -149,7 +242,8 @@ def scan_with_progress(scanner: ModScanner, folder_path: Path, recursive: bool,
             recursive=recursive,
             exclude_patterns=exclude,
             include_disabled=include_disabled,
-            progress_callback=simple_progress
+            progress_callback=simple_progress,
+            max_depth=max_depth
         )
 
 
@@ -168,6 +262,13 @@ Examples:
   python main.py ./mods --workers 8           # Use 8 parallel workers
   python main.py ./mods --sort-by name        # Sort output by mod name
   python main.py ./mods --filter-loader forge # Only show Forge mods
+  python main.py ./mods -f csv --fields name,version,filename  # Quick CSV
+  python main.py ./mods -r --census           # Count JARs per loader only
+  python main.py ./mods --hash sha1,sha512    # Add Modrinth-style file hashes
+  python main.py ./mods --fingerprint         # Add CurseForge fingerprints
+  python main.py --build-index dump.jsonl --index mods.idx  # Build a hash index
+  python main.py ./mods --index mods.idx      # Identify JARs without metadata
+  python main.py ./mods --check-updates catalog.jsonl -f markdown  # Update report
         """
     )
     
@@ -197,6 +298,12 @@ Examples:
         help='Scan subdirectories recursively'
     )
     
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        help='Maximum subdirectory depth for recursive scans (default: unlimited)'
+    )
+    
     parser.add_argument(
         '-w', '--workers',
         type=int,
@@ -204,6 +311,96 @@ Examples:
         help='Number of parallel workers (default: 4)'
     )
     
+    parser.add_argument(
+        '--executor',
+        choices=['auto', 'thread', 'process'],
+        default='auto',
+        help='Worker pool type; process scales CPU-bound parsing across cores '
+             '(default: auto, picks based on file count)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        metavar='SECONDS',
+        help='Give up on any single JAR after this many seconds (default: no limit)'
+    )
+    
+    parser.add_argument(
+        '--deep',
+        action='store_true',
+        help='Scan class files for @Mod annotations in JARs without metadata files (slower)'
+    )
+    
+    parser.add_argument(
+        '--nested',
+        action='store_true',
+        help='Also list mods and libraries embedded in mod JARs (jar-in-jar), with their parent'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the persistent scan cache (re-parse every JAR)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        help='Directory for the scan cache (default: user cache directory)'
+    )
+    
+    parser.add_argument(
+        '--hash',
+        type=parse_hashes,
+        default=(),
+        metavar='ALGORITHM,...',
+        help='Hash every JAR with these hashlib algorithms in the same scan (e.g. sha1,sha512); '
+             'cached with the results'
+    )
+    
+    parser.add_argument(
+        '--fingerprint',
+        action='store_true',
+        help='Compute the CurseForge fingerprint of every JAR (much faster with numpy installed)'
+    )
+    
+    parser.add_argument(
+        '--index',
+        type=Path,
+        metavar='FILE',
+        help='Identify JARs without metadata by their hashes in this index (see --build-index)'
+    )
+    
+    parser.add_argument(
+        '--build-index',
+        type=Path,
+        metavar='DUMP',
+        help='Build the --index file from a metadata dump (JSON Lines or JSON) and exit'
+    )
+    
+    parser.add_argument(
+        '--check-updates',
+        type=Path,
+        metavar='CATALOG',
+        help='Report mods with newer versions for their loader and MC version in a local '
+             'version catalog (JSON Lines or JSON) instead of the modlist'
+    )
+    
+    parser.add_argument(
+        '--census',
+        action='store_true',
+        help='Only count JARs per loader from their entry names and list unknown ones '
+             '(nothing is decompressed; saved as JSON)'
+    )
+    
+    parser.add_argument(
+        '--fields',
+        type=parse_fields,
+        metavar='FIELD,...',
+        help=f'Only extract and output these fields (any of {",".join(MOD_FIELDS)}; default: all)'
+    )
+    
     parser.add_argument(
         '--exclude',
         nargs='*',
@@ -279,6 +476,8 @@ Examples:
     )
     
     args = parser.parse_args()
+    if args.build_index and not args.index:
+        parser.error('--build-index requires --index FILE to write')
     
     # Setup logging
     log_level = 'ERROR' if args.quiet else args.log_level
@@ -287,6 +486,16 @@ Examples:
     logger = logging.getLogger(__name__)
     
     try:
+        if args.build_index:
+            try:
+                count = build_index(read_dump(args.build_index), args.index)
+            except ValueError as e:
+                logger.error(f"Invalid dump {args.build_index}: {e}")
+                sys.exit(1)
+            if not args.quiet:
+                print(f"✓ Indexed {count} hashes in {args.index.resolve()}")
+            return
+        
         input_path = Path(args.input_folder).resolve()
         output_path = Path(args.output).resolve()
         
@@ -295,6 +504,9 @@ Examples:
         if not formatter:
             print(f"Error: Unknown format '{args.format}'", file=sys.stderr)
             sys.exit(1)
+        if args.census:
+            # A census is always saved as JSON
+            formatter = get_formatter('json')
         
         if not output_path.suffix:
             output_path = output_path.with_suffix(formatter.extension)
@@ -311,9 +523,59 @@ Examples:
                 print(f"Output: {output_path} ({formatter.name})")
                 print()
         
+        if args.census:
+            census_scanner = ModScanner(workers=args.workers, timeout=args.timeout)
+            census = census_scanner.census(
+                input_path,
+                recursive=args.recursive,
+                exclude_patterns=args.exclude,
+                include_disabled=args.include_disabled,
+                max_depth=args.max_depth
+            )
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(jsonbackend.dumps(census.to_dict(not args.no_errors), indent=None if args.compact else 2))
+            if not args.quiet:
+                print_census(census)
+                if RICH_AVAILABLE and console:
+                    console.print(f"\n[green]✓ Census saved to {output_path}[/green]")
+                else:
+                    print(f"\n✓ Census saved to {output_path}")
+            return
+        
         # Create scanner and run
-        scanner = ModScanner(workers=args.workers)
-        result = scan_with_progress(scanner, input_path, args.recursive, args.exclude, args.include_disabled)
+        try:
+            index = HashIndex(args.index) if args.index else None
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        cache = None if args.no_cache else ScanCache(args.cache_dir)
+        scanner = ModScanner(
+            workers=args.workers,
+            cache=cache,
+            executor=args.executor,
+            timeout=args.timeout,
+            deep=args.deep,
+            nested=args.nested,
+            # Updates are matched on the Minecraft versions as well
+            fields=args.fields | {'mc_versions'} if args.check_updates and args.fields else args.fields,
+            hashes=args.hash,
+            fingerprint=args.fingerprint,
+            index=index
+        )
+        try:
+            result = scan_with_progress(
+                scanner,
+                input_path,
+                args.recursive,
+                args.exclude,
+                args.include_disabled,
+                args.max_depth
+            )
+        finally:
+            if cache is not None:
+                cache.close()
+            if index is not None:
+                index.close()
         
         # Apply filters
         if args.filter_loader:
@@ -336,8 +598,29 @@ Examples:
         if args.sort_by:
             result.sort_mods(by=args.sort_by)
         
+        if args.check_updates:
+            try:
+                report = check_updates_from_file(result.mods, args.check_updates)
+            except ValueError as e:
+                logger.error(f"Invalid catalog {args.check_updates}: {e}")
+                sys.exit(1)
+            formatter.save_updates(report, output_path, compact=args.compact)
+            if not args.quiet:
+                print_updates(report)
+                if RICH_AVAILABLE and console:
+                    console.print(f"\n[green]✓ Update report saved to {output_path}[/green]")
+                else:
+                    print(f"\n✓ Update report saved to {output_path}")
+            return
+        
         # Save output
-        formatter.save(result, output_path, include_errors=not args.no_errors, compact=getattr(args, 'compact', False))
+        formatter.save(
+            result,
+            output_path,
+            include_errors=not args.no_errors,
+            compact=getattr(args, 'compact', False),
+            fields=args.fields
+        )
         
         # Print summary
         if not args.quiet:
@@ -361,4 +644,5 @@ Examples:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
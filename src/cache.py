@@ -0,0 +1,276 @@
+"""
+Persistent incremental scan cache.
+
+Stores the per-JAR extraction result in a SQLite database under the user
+cache directory. Entries are validated against the file's size, mtime and
+inode, so unchanged JARs are never reopened on a rescan, and keyed by a
+fingerprint of the scanner configuration that produced them, so scans with
+other settings don't reuse them.
+
+The database is in WAL mode and writes are committed in small batches, so
+concurrent scans sharing the cache only wait for each other briefly.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import FrozenSet, List, Optional, Tuple
+
+from . import __version__
+from .models import ModInfo
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored row layout, ModInfo serialization or the results
+# extracted for unchanged JARs change
+SCHEMA_VERSION = 4
+
+DEFAULT_MAX_ENTRIES = 50000
+
+# Stored results per write transaction
+COMMIT_BATCH = 64
+
+CACHE_FILENAME = 'scan-cache.sqlite3'
+
+
+def default_cache_dir() -> Path:
+    """Get the platform-specific user cache directory for the application."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+        return Path(base) / 'modlist-generator' / 'Cache'
+    if sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches' / 'modlist-generator'
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'modlist-generator'
+
+
+class ScanCache:
+    """SQLite-backed cache of extraction results keyed by file path."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the database (defaults to the user cache dir)
+            max_entries: Maximum number of entries kept; least recently used are evicted
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._touched: List[Tuple[str, str]] = []
+        self._pending = 0
+        self._store_failed = False
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.cache_dir / CACHE_FILENAME),
+                timeout=5.0,
+                check_same_thread=False
+            )
+            self._init_schema()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Scan cache disabled: {e}")
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache database is usable."""
+        return self._conn is not None
+
+    def _init_schema(self) -> None:
+        """Create tables, discarding entries written by another version."""
+        version = f"{__version__}:{SCHEMA_VERSION}"
+        conn = self._conn
+        try:
+            # Readers don't block writers, and writers block each other only
+            # while committing
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            logger.debug(f"Scan cache WAL mode unavailable: {e}")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != version:
+            if row is not None:
+                logger.info(f"Scan cache version changed ({row[0]} -> {version}), clearing")
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                path TEXT NOT NULL,
+                config TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                mod TEXT,
+                error TEXT,
+                fields TEXT,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (path, config)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        conn.commit()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _encode_fields(fields: Optional[FrozenSet[str]]) -> Optional[str]:
+        return ','.join(sorted(fields)) if fields is not None else None
+
+    def lookup(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        fields: Optional[FrozenSet[str]] = None,
+        config: str = ''
+    ) -> Optional[Tuple[Optional[ModInfo], Optional[str]]]:
+        """
+        Look up a cached result.
+
+        Results extracted with a field projection only satisfy lookups for
+        a subset of their fields.
+
+        Args:
+            path: Path to the JAR file
+            stat: Current stat result of the file
+            fields: Fields the result must hold (None for all)
+            config: Fingerprint of the scanner configuration (see store)
+
+        Returns:
+            Tuple of (ModInfo or None, error message or None), or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        key = self._key(path)
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, inode, mod, error, fields FROM entries WHERE path = ? AND config = ?",
+                    (key, config)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Scan cache lookup failed for {path.name}: {e}")
+            return None
+
+        if row is None:
+            return None
+        size, mtime_ns, inode, mod, error, cached_fields = row
+        if (size, mtime_ns, inode) != (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+            return None
+        if cached_fields is not None and (fields is None or not fields.issubset(cached_fields.split(','))):
+            return None
+
+        with self._lock:
+            self._touched.append((key, config))
+        mod_info = ModInfo.from_dict(json.loads(mod)) if mod else None
+        return (mod_info, error)
+
+    def store(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        mod_info: Optional[ModInfo],
+        error: Optional[str],
+        fields: Optional[FrozenSet[str]] = None,
+        config: str = ''
+    ) -> None:
+        """
+        Store an extraction result for a file.
+
+        Results are committed every COMMIT_BATCH stores and on flush.
+
+        Args:
+            path: Path to the JAR file
+            stat: Stat result the file was extracted with
+            mod_info: Extracted mod, if any
+            error: Error message, if any
+            fields: Fields the result was extracted with (None for all)
+            config: Fingerprint of the scanner configuration the result was
+                extracted with; only lookups with the same one find it
+        """
+        if not self.enabled:
+            return
+
+        mod = json.dumps(mod_info.to_dict(nested=True), ensure_ascii=False) if mod_info else None
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(path, config, size, mtime_ns, inode, mod, error, fields, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self._key(path), config, stat.st_size, stat.st_mtime_ns, stat.st_ino,
+                        mod, error, self._encode_fields(fields), time.time_ns()
+                    )
+                )
+                self._pending += 1
+                if self._pending >= COMMIT_BATCH:
+                    self._conn.commit()
+                    self._pending = 0
+        except sqlite3.Error as e:
+            self._store_failed_warning(path, e)
+
+    def _store_failed_warning(self, path: Path, error: sqlite3.Error) -> None:
+        """Log a failed write, as a warning the first time."""
+        if self._store_failed:
+            logger.debug(f"Scan cache store failed for {path.name}: {error}")
+            return
+        self._store_failed = True
+        logger.warning(f"Scan cache store failed for {path.name} ({error}), results may not be cached")
+
+    def flush(self) -> None:
+        """Record hit recency, evict least recently used entries and commit."""
+        if not self.enabled:
+            return
+
+        try:
+            with self._lock:
+                conn = self._conn
+                if self._touched:
+                    now = time.time_ns()
+                    conn.executemany(
+                        "UPDATE entries SET last_used = ? WHERE path = ? AND config = ?",
+                        ((now, key, config) for key, config in self._touched)
+                    )
+                    self._touched.clear()
+
+                count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM entries WHERE rowid IN "
+                        "(SELECT rowid FROM entries ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                conn.commit()
+                self._pending = 0
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update scan cache: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Flush pending updates and close the database."""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,235 @@
+"""
+Minimal Java class file reader for locating class annotations.
+
+Only the parts needed to find a class-level annotation are decoded: the
+constant pool (to tell whether the class references the annotation at all)
+and the class's ``RuntimeVisibleAnnotations`` attribute. Fields and
+methods are skipped over without being looked at.
+"""
+
+import struct
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+CLASS_MAGIC = b'\xca\xfe\xba\xbe'
+
+_HEADER = struct.Struct('>4s3H')
+_U2 = struct.Struct('>H')
+_U2_U4 = struct.Struct('>HL')
+_U2_U2 = struct.Struct('>2H')
+_MEMBER = struct.Struct('>4H')
+
+# Constant pool tag -> size of the entry after the tag byte (Utf8 is variable)
+_CONSTANT_UTF8 = 1
+_CONSTANT_SIZES = {
+    3: 4, 4: 4,               # Integer, Float
+    5: 8, 6: 8,               # Long, Double (take two slots)
+    7: 2, 8: 2,               # Class, String
+    9: 4, 10: 4, 11: 4,       # Field, Method, InterfaceMethod refs
+    12: 4,                    # NameAndType
+    15: 3, 16: 2,             # MethodHandle, MethodType
+    17: 4, 18: 4,             # Dynamic, InvokeDynamic
+    19: 2, 20: 2,             # Module, Package
+}
+_WIDE_CONSTANTS = (5, 6)
+
+_ANNOTATIONS_ATTRIBUTE = b'RuntimeVisibleAnnotations'
+
+
+class ClassFileError(ValueError):
+    """The data is not a well-formed class file."""
+
+
+class TruncatedClassError(ClassFileError):
+    """The data ends before the part being read (more bytes are needed)."""
+
+
+class ConstantPool:
+    """
+    Utf8 entries of a class file's constant pool.
+
+    Attributes:
+        end: Offset of the first byte after the constant pool
+    """
+
+    def __init__(self, data: bytes, utf8: Dict[int, Tuple[int, int]], end: int):
+        self._data = data
+        self._utf8 = utf8
+        self.end = end
+
+    def raw(self, index: int) -> bytes:
+        """Raw bytes of a Utf8 entry."""
+        try:
+            start, length = self._utf8[index]
+        except KeyError:
+            raise ClassFileError(f"Constant {index} is not a Utf8 entry")
+        return bytes(self._data[start:start + length])
+
+    def string(self, index: int) -> str:
+        """Decoded Utf8 entry (Java's modified UTF-8, read as UTF-8)."""
+        return self.raw(index).decode('utf-8', 'replace')
+
+    def contains(self, values: FrozenSet[bytes]) -> bool:
+        """Whether any Utf8 entry equals one of the values."""
+        lengths = {len(value) for value in values}
+        data = self._data
+        for start, length in self._utf8.values():
+            if length in lengths and bytes(data[start:start + length]) in values:
+                return True
+        return False
+
+
+def read_constant_pool(data: bytes) -> ConstantPool:
+    """
+    Parse the header and constant pool of a class file.
+
+    Args:
+        data: The class file, or a prefix of it
+
+    Raises:
+        TruncatedClassError: If data ends inside the constant pool
+        ClassFileError: If the data is not a class file
+    """
+    if len(data) < _HEADER.size:
+        raise TruncatedClassError("Class file header truncated")
+    magic, _, _, count = _HEADER.unpack_from(data, 0)
+    if magic != CLASS_MAGIC:
+        raise ClassFileError("Not a class file")
+
+    utf8: Dict[int, Tuple[int, int]] = {}
+    sizes = _CONSTANT_SIZES
+    size = len(data)
+    pos = _HEADER.size
+    index = 1
+    while index < count:
+        if pos >= size:
+            raise TruncatedClassError("Constant pool truncated")
+        tag = data[pos]
+        if tag == _CONSTANT_UTF8:
+            if pos + 3 > size:
+                raise TruncatedClassError("Constant pool truncated")
+            length = (data[pos + 1] << 8) | data[pos + 2]
+            utf8[index] = (pos + 3, length)
+            pos += 3 + length
+        else:
+            entry_size = sizes.get(tag)
+            if entry_size is None:
+                raise ClassFileError(f"Unknown constant pool tag {tag}")
+            pos += 1 + entry_size
+            if tag in _WIDE_CONSTANTS:
+                index += 1
+        index += 1
+
+    if pos > size:
+        raise TruncatedClassError("Constant pool truncated")
+    return ConstantPool(data, utf8, pos)
+
+
+def _skip_members(data: bytes, pos: int) -> int:
+    """Skip a fields or methods table."""
+    (count,) = _U2.unpack_from(data, pos)
+    pos += 2
+    for _ in range(count):
+        attributes = _MEMBER.unpack_from(data, pos)[3]
+        pos += _MEMBER.size
+        for _ in range(attributes):
+            pos += 6 + _U2_U4.unpack_from(data, pos)[1]
+    return pos
+
+
+def _read_element_value(data: bytes, pos: int, pool: ConstantPool) -> Tuple[Any, int]:
+    """
+    Read an annotation element value.
+
+    Strings and arrays of them are decoded; other values come back as None.
+    """
+    tag = data[pos:pos + 1]
+    pos += 1
+    if tag == b's':
+        return pool.string(_U2.unpack_from(data, pos)[0]), pos + 2
+    if tag and tag in b'BCDFIJSZc':
+        return None, pos + 2
+    if tag == b'e':
+        return None, pos + 4
+    if tag == b'@':
+        return None, _skip_annotation(data, pos, pool)
+    if tag == b'[':
+        (count,) = _U2.unpack_from(data, pos)
+        pos += 2
+        values = []
+        for _ in range(count):
+            value, pos = _read_element_value(data, pos, pool)
+            values.append(value)
+        return values, pos
+    raise ClassFileError(f"Unknown element value tag {tag!r}")
+
+
+def _skip_annotation(data: bytes, pos: int, pool: ConstantPool) -> int:
+    pairs = _U2_U2.unpack_from(data, pos)[1]
+    pos += 4
+    for _ in range(pairs):
+        _, pos = _read_element_value(data, pos + 2, pool)
+    return pos
+
+
+def find_class_annotation(
+    data: bytes,
+    descriptors: Iterable[bytes],
+    pool: Optional[ConstantPool] = None
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Find the first class-level runtime annotation of one of the given types.
+
+    Args:
+        data: The complete class file
+        descriptors: Annotation type descriptors, e.g. b'Lcom/example/Mod;'
+        pool: Constant pool already read from data, if any
+
+    Returns:
+        Tuple of (descriptor, element values by name), or None if the class
+        has no such annotation
+
+    Raises:
+        ClassFileError: If the class file is malformed or truncated
+    """
+    wanted = frozenset(descriptors)
+    try:
+        if pool is None:
+            pool = read_constant_pool(data)
+        if not pool.contains(wanted):
+            return None
+
+        # access_flags, this_class, super_class, then the interfaces
+        pos = pool.end + 6
+        pos += 2 + 2 * _U2.unpack_from(data, pos)[0]
+        pos = _skip_members(data, pos)  # fields
+        pos = _skip_members(data, pos)  # methods
+
+        (attributes,) = _U2.unpack_from(data, pos)
+        pos += 2
+        for _ in range(attributes):
+            name_index, length = _U2_U4.unpack_from(data, pos)
+            pos += 6
+            if pool.raw(name_index) != _ANNOTATIONS_ATTRIBUTE:
+                pos += length
+                continue
+
+            (count,) = _U2.unpack_from(data, pos)
+            pos += 2
+            for _ in range(count):
+                type_index, pairs = _U2_U2.unpack_from(data, pos)
+                descriptor = pool.raw(type_index)
+                if descriptor not in wanted:
+                    pos = _skip_annotation(data, pos, pool)
+                    continue
+                pos += 4
+                values = {}
+                for _ in range(pairs):
+                    (element_index,) = _U2.unpack_from(data, pos)
+                    values[pool.string(element_index)], pos = _read_element_value(data, pos + 2, pool)
+                return descriptor.decode('ascii', 'replace'), values
+            return None
+    except (struct.error, IndexError) as e:
+        raise TruncatedClassError(f"Class file truncated: {e}")
+    except RecursionError:
+        raise ClassFileError("Annotation values nested too deeply")
+    return None
@@ -1,25 +1,63 @@
 """
 Mod metadata extractors for various mod loaders.
+
+Extractor modules are imported lazily: the registry routes JARs on each
+extractor's declared metadata entries (BUILTIN_EXTRACTORS holds their
+ExtractorSpec objects), and the classes below, like the extractor
+instances in ALL_EXTRACTORS and DEEP_EXTRACTORS, are only imported when
+first accessed.
 """
 
+from importlib import import_module
+
 from .base import BaseExtractor
-from .fabric import FabricExtractor
-from .quilt import QuiltExtractor
-from .forge import ForgeTomlExtractor, LegacyForgeExtractor
-
-# All available extractors in priority order
-ALL_EXTRACTORS = [
-    FabricExtractor(),
-    QuiltExtractor(),
-    ForgeTomlExtractor(),
-    LegacyForgeExtractor(),
-]
+from .context import ExtractionContext
+from .registry import (
+    BUILTIN_EXTRACTORS, ENTRY_POINT_GROUP, ExtractorSpec, discover_extractors, extractor_id, get_extractors,
+    plugin_versions,
+)
+
+# Instances of the built-in extractors in priority order, and of the slower
+# ones only used for deep scans, loaded on first access
+_LAZY_INSTANCES = {
+    'ALL_EXTRACTORS': False,
+    'DEEP_EXTRACTORS': True,
+}
+
+# Extractor classes, imported on first access
+_LAZY_CLASSES = {
+    'FabricExtractor': '.fabric',
+    'QuiltExtractor': '.quilt',
+    'ForgeTomlExtractor': '.forge',
+    'LegacyForgeExtractor': '.forge',
+    'ModAnnotationExtractor': '.annotation',
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_INSTANCES:
+        return [spec.load() for spec in get_extractors(deep=_LAZY_INSTANCES[name], plugins=False)]
+    module = _LAZY_CLASSES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
+
 
 __all__ = [
     'BaseExtractor',
+    'ExtractionContext',
+    'ExtractorSpec',
     'FabricExtractor',
     'QuiltExtractor',
     'ForgeTomlExtractor',
     'LegacyForgeExtractor',
+    'ModAnnotationExtractor',
     'ALL_EXTRACTORS',
+    'DEEP_EXTRACTORS',
+    'BUILTIN_EXTRACTORS',
+    'ENTRY_POINT_GROUP',
+    'discover_extractors',
+    'extractor_id',
+    'get_extractors',
+    'plugin_versions',
 ]
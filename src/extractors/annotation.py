@@ -0,0 +1,207 @@
+"""
+Deep extractor reading the @Mod annotation from class files.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseExtractor
+from .context import MANIFEST_FILE, ExtractionContext
+from ..classfile import ClassFileError, TruncatedClassError, find_class_annotation, read_constant_pool
+from ..models import ModInfo
+
+logger = logging.getLogger(__name__)
+
+# @Mod annotation descriptors and the loader each one implies
+MOD_ANNOTATIONS = {
+    'Lnet/minecraftforge/fml/common/Mod;': 'forge',
+    'Lcpw/mods/fml/common/Mod;': 'forge',
+    'Lnet/neoforged/fml/common/Mod;': 'neoforge',
+}
+
+CLASS_SUFFIX = '.class'
+
+# Bytes decompressed per candidate; the constant pool of a typical mod class fits
+CLASS_HEAD_SIZE = 8 * 1024
+
+# Candidate classes examined per JAR before giving up
+MAX_CANDIDATES = 256
+
+# Packages that rarely hold the mod's main class
+_UNLIKELY_PACKAGES = frozenset({
+    'api', 'asm', 'client', 'compat', 'data', 'datagen', 'gui', 'integration',
+    'lib', 'libs', 'mixin', 'mixins', 'network', 'render', 'shadow', 'shaded',
+    'util', 'utils',
+})
+# Class name endings typical for main mod classes
+_MAIN_CLASS_SUFFIXES = ('mod', 'main', 'core', 'common')
+# Filename words that say nothing about the mod's name
+_FILENAME_NOISE = frozenset({
+    'forge', 'neoforge', 'fabric', 'quilt', 'mc', 'mod', 'universal', 'all',
+    'client', 'server', 'release', 'beta', 'alpha', 'snapshot', 'jar', 'disabled',
+})
+_WORD = re.compile(r'[a-z]+')
+
+
+def rank_class_candidates(names: List[str], filename: str) -> List[str]:
+    """
+    Order class entries by how likely they are to hold the @Mod annotation.
+    
+    Classes named after the JAR (``journeymap-5.9.jar`` -> ``JourneyMap``,
+    ``JourneymapMod``) come first, then classes with typical main class
+    names, then the rest. Shallow classes beat deep ones, and packages like
+    ``mixin`` or ``client`` are pushed back. Inner classes are dropped.
+    
+    Args:
+        names: Class entry names
+        filename: JAR file name
+    
+    Returns:
+        Candidate entry names, most likely first
+    """
+    words = [w for w in _WORD.findall(filename.lower()) if len(w) > 1 and w not in _FILENAME_NOISE]
+    joined = ''.join(words)
+    
+    ranked = []
+    for name in names:
+        path, _, simple = name[:-len(CLASS_SUFFIX)].rpartition('/')
+        if '$' in simple or simple in ('module-info', 'package-info') or name.startswith('META-INF/'):
+            continue
+        
+        lower = simple.lower()
+        stem = lower
+        for suffix in _MAIN_CLASS_SUFFIXES:
+            if lower.endswith(suffix) and len(lower) > len(suffix):
+                stem = lower[:-len(suffix)]
+                break
+        
+        if joined and (lower == joined or stem == joined or stem in words):
+            score = 0
+        elif stem != lower or any(word in lower for word in words):
+            score = 1
+        else:
+            score = 2
+        if _UNLIKELY_PACKAGES.intersection(path.lower().split('/')):
+            score += 3
+        ranked.append((score, path.count('/'), len(name), name))
+    
+    ranked.sort()
+    return [entry[-1] for entry in ranked]
+
+
+def _parse_legacy_dependencies(dependencies: Any) -> List[str]:
+    """Required mod IDs from a legacy ``dependencies`` string ("required-after:Forge@[10.13,)")."""
+    if not isinstance(dependencies, str):
+        return []
+    
+    mod_ids = []
+    for part in dependencies.split(';'):
+        kind, _, target = part.partition(':')
+        mod_id = target.split('@', 1)[0].strip()
+        if kind.strip().startswith('required') and mod_id and mod_id != '*':
+            mod_ids.append(mod_id)
+    return mod_ids
+
+
+class ModAnnotationExtractor(BaseExtractor):
+    """
+    Extractor for JARs without metadata files, reading @Mod from class files.
+    
+    Only enabled for deep scans: it walks the central directory a second
+    time to list class entries, then decompresses just the head of each
+    candidate to check its constant pool for an @Mod descriptor. Candidates
+    are ranked by name so most JARs are resolved after one or two classes.
+    """
+    
+    # Offered every JAR; ordered after every metadata extractor by priority
+    METADATA_FILES = ()
+    AUXILIARY_FILES = (MANIFEST_FILE,)
+    
+    _DESCRIPTORS = frozenset(descriptor.encode('ascii') for descriptor in MOD_ANNOTATIONS)
+    
+    @property
+    def name(self) -> str:
+        return "Class Annotation"
+    
+    @property
+    def priority(self) -> int:
+        return 10
+    
+    def can_extract(self, ctx: ExtractionContext) -> bool:
+        return True
+    
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
+        jar_path = ctx.jar_path
+        try:
+            candidates = rank_class_candidates(ctx.find(CLASS_SUFFIX), jar_path.name)
+            for name in candidates[:MAX_CANDIDATES]:
+                annotation = self._read_annotation(ctx, name)
+                if annotation is None:
+                    continue
+                mod_info = self._build_mod_info(ctx, *annotation)
+                if mod_info:
+                    logger.debug(f"Found @Mod in {name} of {jar_path.name}")
+                    return mod_info
+        except Exception as e:
+            logger.error(f"Error scanning classes of {jar_path.name}: {e}")
+        
+        return None
+    
+    def _read_annotation(self, ctx: ExtractionContext, name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Find the @Mod annotation of a class, decompressing as little as possible."""
+        try:
+            head = ctx.read_head(name, CLASS_HEAD_SIZE)
+            try:
+                pool = read_constant_pool(head)
+            except TruncatedClassError:
+                # Constant pool larger than the head; only the full class will tell
+                pool = None
+            
+            if pool is not None:
+                if not pool.contains(self._DESCRIPTORS):
+                    return None
+                if len(head) < CLASS_HEAD_SIZE:
+                    # The head is the whole class
+                    return find_class_annotation(head, self._DESCRIPTORS, pool)
+            
+            return find_class_annotation(bytes(ctx.read(name)), self._DESCRIPTORS)
+        except ClassFileError as e:
+            logger.debug(f"Skipping malformed class {name} in {ctx.jar_path.name}: {e}")
+            return None
+    
+    def _build_mod_info(self, ctx: ExtractionContext, descriptor: str, values: Dict[str, Any]) -> Optional[ModInfo]:
+        """Create a ModInfo from @Mod element values (modid/name/version or value)."""
+        jar_path = ctx.jar_path
+        mod_id = values.get('modid') or values.get('value')
+        if not isinstance(mod_id, str) or not mod_id.strip():
+            return None
+        mod_id = mod_id.strip()
+        
+        name = values.get('name')
+        if not isinstance(name, str) or not name.strip():
+            name = mod_id
+        
+        version = values.get('version')
+        if not isinstance(version, str) or not version.strip():
+            version = ctx.manifest().get('Implementation-Version') or 'Unknown'
+        
+        mc_versions = ()
+        accepted = values.get('acceptedMinecraftVersions') if ctx.wants('mc_versions') else None
+        if isinstance(accepted, str):
+            mc_versions = self._parse_mc_versions(accepted)
+        
+        dependencies = []
+        if ctx.wants('dependencies'):
+            dependencies = _parse_legacy_dependencies(values.get('dependencies'))
+        
+        logger.debug(f"Extracted @Mod annotation: {name} v{version}")
+        return ModInfo(
+            name=name.strip(),
+            loader=MOD_ANNOTATIONS[descriptor],
+            version=version.strip(),
+            filename=jar_path.name,
+            mod_id=mod_id,
+            dependencies=dependencies,
+            mc_versions=mc_versions
+        )
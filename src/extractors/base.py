@@ -3,34 +3,77 @@ Base extractor class and utilities for mod metadata extraction.
 """
 
 import re
-import zipfile
 import logging
 from abc import ABC, abstractmethod
-from pathlib import Path
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Tuple
 
-from ..models import ModInfo
+from .context import ExtractionContext
+from ..models import ModInfo, intern_tuple
 
 logger = logging.getLogger(__name__)
 
 
-# Regex patterns for parsing Minecraft version constraints
-MC_VERSION_PATTERNS = [
-    # Exact version: 1.20.1
-    re.compile(r'^(\d+\.\d+(?:\.\d+)?)$'),
-    # Semver range: >=1.20 <1.21, >=1.20.1
-    re.compile(r'[><=~^]*\s*(\d+\.\d+(?:\.\d+)?)'),
-    # Maven range: [1.20,1.21), [1.20.1,)
-    re.compile(r'[\[\(](\d+\.\d+(?:\.\d+)?)\s*,'),
-    re.compile(r',\s*(\d+\.\d+(?:\.\d+)?)[\]\)]'),
-    # Wildcard: 1.20.x, 1.20.*
-    re.compile(r'(\d+\.\d+)(?:\.[x*])?'),
-]
+# Runs of dot-separated numbers ("1.20.1", "1.21" in "[1.21,1.22)")
+MC_VERSION_RUN = re.compile(r'\d+(?:\.\d+)*')
+
+# Distinct constraint strings memoized by parse_mc_versions
+MC_VERSION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=MC_VERSION_CACHE_SIZE)
+def parse_mc_versions(constraint: str) -> Tuple[str, ...]:
+    """
+    Parse a Minecraft version constraint string into its versions.
+    
+    Handles common formats:
+    - Exact: "1.20.1"
+    - Semver: ">=1.20 <1.21", "~1.20.1", "^1.20"
+    - Maven: "[1.20,1.21)", "[1.20.1,)"
+    - Wildcard: "1.20.x", "1.20.*"
+    
+    Each run of dot-separated numbers yields its leading three-part
+    versions (a trailing pair included) and its two-part prefixes, so
+    "1.20.1" gives both "1.20.1" and "1.20". tests/test_mc_versions.py
+    checks the results against those of the regex parser this replaced.
+    
+    Returns:
+        Sorted tuple of distinct interned versions, shared between calls
+        (and with equal results of other constraints, see intern_tuple)
+    """
+    versions = set()
+    for match in MC_VERSION_RUN.finditer(constraint):
+        parts = match.group().split('.')
+        count = len(parts)
+        if count < 2:
+            continue
+        # major.minor.patch triples, then a trailing major.minor pair
+        i = 0
+        while count - i >= 3:
+            versions.add('.'.join(parts[i:i + 3]))
+            i += 3
+        if count - i == 2:
+            versions.add('.'.join(parts[i:]))
+        # major.minor pairs
+        for i in range(0, count - 1, 2):
+            versions.add(f"{parts[i]}.{parts[i + 1]}")
+    return intern_tuple(sorted(versions))
 
 
 class BaseExtractor(ABC):
     """Abstract base class for mod metadata extractors."""
     
+    # Archive entries this extractor owns. The scanner only offers a JAR to
+    # extractors owning one of its entries; extractors that declare none
+    # are offered every JAR.
+    METADATA_FILES: Tuple[str, ...] = ()
+    
+    # Extra entries read during extraction (indexed, but not used for routing)
+    AUXILIARY_FILES: Tuple[str, ...] = ()
+    
+    # Entries listing embedded JARs, indexed only when nested JARs are scanned
+    NESTED_FILES: Tuple[str, ...] = ()
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -44,21 +87,36 @@ class BaseExtractor(ABC):
         pass
     
     @abstractmethod
-    def can_extract(self, jar: zipfile.ZipFile, files: List[str]) -> bool:
+    def can_extract(self, ctx: ExtractionContext) -> bool:
         """Check if this extractor can handle the given JAR file."""
         pass
     
     @abstractmethod
-    def extract(self, jar: zipfile.ZipFile, jar_path: Path, files: List[str]) -> Optional[ModInfo]:
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
         """Extract mod information from the JAR file."""
         pass
     
-    def _safe_decode(self, content: bytes, encoding: str = 'utf-8') -> str:
-        """Safely decode bytes to string."""
-        try:
-            return content.decode(encoding)
-        except UnicodeDecodeError:
-            return content.decode('latin-1')
+    def nested_jars(self, ctx: ExtractionContext) -> List[str]:
+        """
+        Entry names of the JARs embedded (jar-in-jar) in a JAR this extractor handled.
+        
+        Only called after extract() succeeded on the same context.
+        """
+        return []
+    
+    def _nested_jar_paths(self, jars, key: str) -> List[str]:
+        """
+        Entry names from a metadata list of embedded JARs.
+        
+        Handles plain path strings and objects holding the path under key.
+        """
+        paths = []
+        if isinstance(jars, list):
+            for jar in jars:
+                path = jar.get(key) if isinstance(jar, dict) else jar
+                if isinstance(path, str) and path.strip():
+                    paths.append(path.strip().lstrip('/'))
+        return paths
     
     def _extract_dependencies(self, data: dict, dep_fields: List[str]) -> List[str]:
         """Extract dependency list from metadata."""
@@ -108,41 +166,23 @@ class BaseExtractor(ABC):
         
         return None
     
-    def _parse_mc_versions(self, version_constraint) -> List[str]:
+    def _parse_mc_versions(self, version_constraint) -> Tuple[str, ...]:
         """
-        Parse Minecraft version constraint into list of versions.
+        Parse a Minecraft version constraint (or a list of them) into versions.
         
-        Handles common formats:
-        - Exact: "1.20.1"
-        - Semver: ">=1.20 <1.21", "~1.20.1", "^1.20"
-        - Maven: "[1.20,1.21)", "[1.20.1,)"
-        - Wildcard: "1.20.x", "1.20.*"
+        See parse_mc_versions for the supported formats. The shared tuple is
+        returned as is, ready to be stored in ModInfo.mc_versions.
         """
         if not version_constraint:
-            return []
+            return ()
+        
+        if isinstance(version_constraint, str):
+            return parse_mc_versions(version_constraint)
         
         if isinstance(version_constraint, list):
-            # Recursively parse list items
-            versions = []
+            versions = set()
             for item in version_constraint:
-                versions.extend(self._parse_mc_versions(item))
-            return list(set(versions))
-        
-        if not isinstance(version_constraint, str):
-            return []
-        
-        versions = set()
-        constraint = version_constraint.strip()
+                versions.update(self._parse_mc_versions(item))
+            return intern_tuple(sorted(versions))
         
-        # Extract all version numbers from the constraint
-        for pattern in MC_VERSION_PATTERNS:
-            for match in pattern.finditer(constraint):
-                version = match.group(1)
-                if version:
-                    # Normalize: ensure at least major.minor format
-                    parts = version.split('.')
-                    if len(parts) >= 2:
-                        versions.add(version)
-        
-        return sorted(versions)
-        return dependencies
+        return ()
@@ -0,0 +1,226 @@
+"""
+Per-JAR extraction context shared by all extractors.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Union
+
+from .. import jsonbackend
+from ..jarfile import JarIndex
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'META-INF/MANIFEST.MF'
+
+# The JAR spec allows CRLF, LF or CR line endings
+_MANIFEST_LINE_SPLIT = re.compile(r'\r\n|\r|\n')
+
+
+@lru_cache(maxsize=None)
+def load_tomllib():
+    """
+    The TOML parser module, imported on first use.
+    
+    Uses tomllib (Python 3.11+), falling back to tomli.
+    
+    Returns:
+        The module, or None if no TOML parser is installed
+    """
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            logger.warning("TOML parsing not available. Install 'tomli' for full Forge/NeoForge support.")
+            return None
+    return tomllib
+
+
+def decode_text(content: Union[bytes, memoryview], encoding: str = 'utf-8') -> str:
+    """Safely decode bytes (or a zero-copy view of them) to string."""
+    try:
+        return str(content, encoding)
+    except UnicodeDecodeError:
+        return str(content, 'latin-1')
+
+
+def parse_manifest(content: str) -> Dict[str, str]:
+    """
+    Parse the main section of a JAR manifest.
+    
+    Lines starting with a single space continue the previous attribute
+    (long values are wrapped at 72 bytes), and the main section ends at the
+    first blank line. Values are stripped of surrounding whitespace.
+    
+    Args:
+        content: Decoded manifest text
+    
+    Returns:
+        Dictionary of main attribute names to values
+    """
+    attributes: Dict[str, str] = {}
+    key = None
+    for line in _MANIFEST_LINE_SPLIT.split(content.lstrip('\ufeff')):
+        if not line:
+            if attributes:
+                break
+            continue
+        if line[0] == ' ':
+            if key is not None:
+                attributes[key] += line[1:]
+            continue
+        name, sep, value = line.partition(':')
+        if not sep:
+            key = None
+            continue
+        key = name.strip()
+        attributes[key] = value
+    return {name: value.strip() for name, value in attributes.items()}
+
+
+class ExtractionContext:
+    """
+    View of a single JAR handed to every extractor.
+    
+    Entry bytes, decoded text and parsed documents are memoized, so each
+    metadata entry is decompressed and parsed at most once per JAR no matter
+    how many extractors (and the scanner's fallback) look at it. Parse
+    errors are memoized as well and re-raised on every access.
+    
+    Extractors check ``wants()`` before computing optional fields, so work
+    for fields nobody asked for (dependency walking, author normalization,
+    version-constraint parsing) is skipped.
+    """
+    
+    def __init__(self, jar: JarIndex, jar_path: Path, fields: Optional[FrozenSet[str]] = None):
+        """
+        Args:
+            jar: Open index of the JAR's metadata entries
+            jar_path: Path to the JAR file
+            fields: ModInfo fields requested by the caller (None for all)
+        """
+        self.jar = jar
+        self.jar_path = jar_path
+        self.fields = fields
+        self.files: List[str] = jar.namelist()
+        self._raw: Dict[str, Union[bytes, memoryview]] = {}
+        self._text: Dict[str, str] = {}
+        self._parsed: Dict[tuple, Any] = {}
+    
+    def __enter__(self) -> 'ExtractionContext':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.jar
+    
+    def wants(self, field: str) -> bool:
+        """
+        Whether an optional ModInfo field was requested.
+        
+        name, loader, version, filename and mod_id are always extracted.
+        """
+        return self.fields is None or field in self.fields
+    
+    def close(self) -> None:
+        """Release memoized views into the JAR's mapping."""
+        for content in self._raw.values():
+            if isinstance(content, memoryview):
+                content.release()
+        self._raw.clear()
+    
+    def read(self, name: str) -> Union[bytes, memoryview]:
+        """Raw (decompressed) content of an entry."""
+        content = self._raw.get(name)
+        if content is None:
+            content = self._raw[name] = self.jar.read(name)
+        return content
+    
+    def read_head(self, name: str, size: int) -> bytes:
+        """
+        First size bytes of an entry (fewer if it is shorter), not memoized.
+        
+        Only as much of the entry as needed is decompressed.
+        """
+        content = self.jar.read(name, size)
+        if isinstance(content, memoryview):
+            with content:
+                return content.tobytes()
+        return content
+    
+    def find(self, suffix: str) -> List[str]:
+        """
+        Names of all entries ending with suffix, indexed so they can be read.
+        
+        Walks the JAR's central directory again; meant for deep scans only.
+        """
+        return self.jar.find(suffix)
+    
+    def text(self, name: str) -> str:
+        """Content of an entry decoded as UTF-8, falling back to Latin-1."""
+        content = self._text.get(name)
+        if content is None:
+            content = self._text[name] = decode_text(self.read(name))
+        return content
+    
+    def parse(self, kind: str, name: str, parser: Callable[[Any], Any], raw: bool = False) -> Any:
+        """
+        Parse an entry with a custom parser, memoized under ``kind``.
+        
+        The parser gets the entry's decoded text, or its raw content when
+        ``raw`` is set (for parsers that decode bytes themselves).
+        
+        Raises:
+            Exception: Whatever the parser raised (on this or an earlier call)
+        """
+        key = (kind, name)
+        if key not in self._parsed:
+            try:
+                self._parsed[key] = parser(self.read(name) if raw else self.text(name))
+            except Exception as e:
+                self._parsed[key] = e
+        value = self._parsed[key]
+        if isinstance(value, Exception):
+            raise value
+        return value
+    
+    def json(self, name: str, lenient: bool = False) -> Any:
+        """
+        Parsed JSON content of an entry, read straight from its bytes.
+        
+        Args:
+            name: Entry name
+            lenient: Accept comments, trailing commas and control characters
+                in strings, as found in hand-written files like mcmod.info
+        
+        Raises:
+            json.JSONDecodeError: If the entry is not valid JSON
+        """
+        if lenient:
+            return self.parse('json-lenient', name, jsonbackend.loads_lenient, raw=True)
+        return self.parse('json', name, jsonbackend.loads, raw=True)
+    
+    def toml(self, name: str) -> Dict[str, Any]:
+        """
+        Parsed TOML content of an entry.
+        
+        Raises:
+            RuntimeError: If no TOML parser is installed
+            tomllib.TOMLDecodeError: If the entry is not valid TOML
+        """
+        tomllib = load_tomllib()
+        if tomllib is None:
+            raise RuntimeError("TOML parsing not available")
+        return self.parse('toml', name, tomllib.loads)
+    
+    def manifest(self) -> Dict[str, str]:
+        """Main attributes of META-INF/MANIFEST.MF (empty when the JAR has none)."""
+        if MANIFEST_FILE not in self.jar:
+            return {}
+        return self.parse('manifest', MANIFEST_FILE, parse_manifest)
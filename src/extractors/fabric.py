@@ -3,12 +3,11 @@ Fabric mod metadata extractor.
 """
 
 import json
-import zipfile
 import logging
-from pathlib import Path
-from typing import Optional, List
+from typing import List, Optional
 
 from .base import BaseExtractor
+from .context import ExtractionContext
 from ..models import ModInfo
 
 logger = logging.getLogger(__name__)
@@ -18,6 +17,7 @@ class FabricExtractor(BaseExtractor):
     """Extractor for Fabric mods (fabric.mod.json)."""
     
     METADATA_FILE = 'fabric.mod.json'
+    METADATA_FILES = (METADATA_FILE,)
     
     @property
     def name(self) -> str:
@@ -27,54 +27,59 @@ class FabricExtractor(BaseExtractor):
     def priority(self) -> int:
         return 1
     
-    def can_extract(self, jar: zipfile.ZipFile, files: List[str]) -> bool:
-        return self.METADATA_FILE in files
+    def can_extract(self, ctx: ExtractionContext) -> bool:
+        return self.METADATA_FILE in ctx
     
-    def extract(self, jar: zipfile.ZipFile, jar_path: Path, files: List[str]) -> Optional[ModInfo]:
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
+        jar_path = ctx.jar_path
         try:
-            with jar.open(self.METADATA_FILE) as f:
-                content = self._safe_decode(f.read())
-                data = json.loads(content)
-                
-                mod_id = data.get('id', '')
-                name = data.get('name', data.get('id', jar_path.stem))
-                version = data.get('version', 'Unknown')
-                
-                # Extract dependencies
+            data = ctx.json(self.METADATA_FILE)
+            
+            mod_id = data.get('id', '')
+            name = data.get('name', data.get('id', jar_path.stem))
+            version = data.get('version', 'Unknown')
+            
+            # Extract dependencies
+            dependencies = []
+            if ctx.wants('dependencies'):
                 dependencies = self._extract_dependencies(data, ['depends', 'recommends'])
-                
-                # Extract author (can be list of strings or objects)
-                author = self._normalize_authors(data.get('authors'))
-                
-                # Extract description
-                description = data.get('description')
-                if isinstance(description, str):
-                    description = description.strip() or None
-                else:
-                    description = None
-                
-                # Extract Minecraft version from depends.minecraft
-                mc_versions = []
-                depends = data.get('depends', {})
-                if isinstance(depends, dict) and 'minecraft' in depends:
-                    mc_versions = self._parse_mc_versions(depends['minecraft'])
-                
-                logger.debug(f"Extracted Fabric mod: {name} v{version}")
-                return ModInfo(
-                    name=name,
-                    loader='fabric',
-                    version=version,
-                    filename=jar_path.name,
-                    mod_id=mod_id,
-                    dependencies=dependencies,
-                    author=author,
-                    description=description,
-                    mc_versions=mc_versions
-                )
-                
+            
+            # Extract author (can be list of strings or objects)
+            author = self._normalize_authors(data.get('authors')) if ctx.wants('author') else None
+            
+            # Extract description
+            description = data.get('description') if ctx.wants('description') else None
+            if isinstance(description, str):
+                description = description.strip() or None
+            else:
+                description = None
+            
+            # Extract Minecraft version from depends.minecraft
+            mc_versions = ()
+            depends = data.get('depends', {})
+            if isinstance(depends, dict) and 'minecraft' in depends and ctx.wants('mc_versions'):
+                mc_versions = self._parse_mc_versions(depends['minecraft'])
+            
+            logger.debug(f"Extracted Fabric mod: {name} v{version}")
+            return ModInfo(
+                name=name,
+                loader='fabric',
+                version=version,
+                filename=jar_path.name,
+                mod_id=mod_id,
+                dependencies=dependencies,
+                author=author,
+                description=description,
+                mc_versions=mc_versions
+            )
+        
         except json.JSONDecodeError as e:
             logger.warning(f"Invalid JSON in {self.METADATA_FILE} for {jar_path.name}: {e}")
         except Exception as e:
             logger.error(f"Error extracting Fabric mod info from {jar_path.name}: {e}")
         
         return None
+    
+    def nested_jars(self, ctx: ExtractionContext) -> List[str]:
+        # "jars": [{"file": "META-INF/jars/library.jar"}]
+        return self._nested_jar_paths(ctx.json(self.METADATA_FILE).get('jars'), 'file')
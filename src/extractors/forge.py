@@ -3,31 +3,47 @@ Forge and NeoForge mod metadata extractors.
 """
 
 import json
-import zipfile
 import logging
 from pathlib import Path
 from typing import Optional, List, Tuple
 
 from .base import BaseExtractor
+from .context import MANIFEST_FILE, ExtractionContext, load_tomllib
+from .modstoml import scan_mods_toml
 from ..models import ModInfo
 
 logger = logging.getLogger(__name__)
 
-# Try to import tomllib (Python 3.11+), fallback to tomli
-try:
-    import tomllib
-except ImportError:
-    try:
-        import tomli as tomllib
-    except ImportError:
-        tomllib = None
-        logger.warning("TOML parsing not available. Install 'tomli' for full Forge/NeoForge support.")
+
+def parse_mods_toml(content: str) -> dict:
+    """
+    Parse a mods.toml document for ForgeTomlExtractor.
+    
+    Uses the scan_mods_toml fast path, falling back to a full tomllib parse
+    for documents it can't handle, so tomllib is only imported when needed.
+    
+    Raises:
+        RuntimeError: If the fallback is needed but no TOML parser is installed
+    """
+    data = scan_mods_toml(content)
+    if data is None:
+        tomllib = load_tomllib()
+        if tomllib is None:
+            raise RuntimeError("TOML parsing not available")
+        logger.debug("mods.toml fast path not applicable, using tomllib")
+        data = tomllib.loads(content)
+    return data
 
 
 class ForgeTomlExtractor(BaseExtractor):
     """Extractor for modern Forge/NeoForge mods (META-INF/mods.toml or neoforge.mods.toml)."""
     
     TOML_FILES = ['META-INF/neoforge.mods.toml', 'META-INF/mods.toml']
+    METADATA_FILES = tuple(TOML_FILES)
+    AUXILIARY_FILES = (MANIFEST_FILE,)
+    # JarJar index of embedded JARs, shared by Forge and NeoForge
+    JARJAR_METADATA_FILE = 'META-INF/jarjar/metadata.json'
+    NESTED_FILES = (JARJAR_METADATA_FILE,)
     
     @property
     def name(self) -> str:
@@ -37,15 +53,13 @@ class ForgeTomlExtractor(BaseExtractor):
     def priority(self) -> int:
         return 3
     
-    def can_extract(self, jar: zipfile.ZipFile, files: List[str]) -> bool:
-        if tomllib is None:
-            return False
-        return any(toml_file in files for toml_file in self.TOML_FILES)
+    def can_extract(self, ctx: ExtractionContext) -> bool:
+        return self._find_toml_file(ctx) is not None
     
-    def _find_toml_file(self, files: List[str]) -> Optional[str]:
+    def _find_toml_file(self, ctx: ExtractionContext) -> Optional[str]:
         """Find the TOML metadata file, preferring neoforge.mods.toml."""
         for toml_file in self.TOML_FILES:
-            if toml_file in files:
+            if toml_file in ctx:
                 return toml_file
         return None
     
@@ -124,7 +138,7 @@ class ForgeTomlExtractor(BaseExtractor):
         
         return dependencies
     
-    def _extract_mc_versions_from_toml(self, data: dict, mod_id: str) -> List[str]:
+    def _extract_mc_versions_from_toml(self, data: dict, mod_id: str) -> Tuple[str, ...]:
         """Extract Minecraft version constraint from TOML dependencies."""
         deps_section = data.get('dependencies', {})
         
@@ -137,99 +151,97 @@ class ForgeTomlExtractor(BaseExtractor):
                         version_range = dep.get('versionRange', '')
                         return self._parse_mc_versions(version_range)
         
-        return []
+        return ()
     
-    def extract(self, jar: zipfile.ZipFile, jar_path: Path, files: List[str]) -> Optional[ModInfo]:
-        toml_file = self._find_toml_file(files)
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
+        jar_path = ctx.jar_path
+        toml_file = self._find_toml_file(ctx)
         if not toml_file:
             return None
         
         try:
-            with jar.open(toml_file) as f:
-                content = self._safe_decode(f.read())
-                data = tomllib.loads(content)
-                
-                # Get the first mod entry
-                mods = data.get('mods', [])
-                if not mods:
-                    logger.warning(f"No mods array found in {toml_file} for {jar_path.name}")
-                    return None
-                
-                mod = mods[0]
-                mod_id = mod.get('modId', '')
-                name = mod.get('displayName', mod.get('modId', jar_path.stem))
-                version = mod.get('version', 'Unknown')
-                
-                # Handle version placeholders
-                if version.startswith('${') and version.endswith('}'):
-                    # Try to find version in JAR manifest
-                    version = self._get_version_from_manifest(jar, files) or version
-                
-                # Detect loader type
-                loader = self._detect_loader(toml_file, data, jar_path)
-                
-                # Extract dependencies
+            data = ctx.parse('mods-toml', toml_file, parse_mods_toml)
+            
+            # Get the first mod entry
+            mods = data.get('mods', [])
+            if not mods:
+                logger.warning(f"No mods array found in {toml_file} for {jar_path.name}")
+                return None
+            
+            mod = mods[0]
+            mod_id = mod.get('modId', '')
+            name = mod.get('displayName', mod.get('modId', jar_path.stem))
+            version = mod.get('version', 'Unknown')
+            
+            # Handle version placeholders
+            if version.startswith('${') and version.endswith('}'):
+                # Try to find version in JAR manifest
+                version = ctx.manifest().get('Implementation-Version') or version
+            
+            # Detect loader type
+            loader = self._detect_loader(toml_file, data, jar_path)
+            
+            # Extract dependencies
+            dependencies = []
+            if ctx.wants('dependencies'):
                 dependencies = self._extract_dependencies_from_toml(data, mod_id)
-                
-                # Extract author (string field in TOML)
-                author = mod.get('authors')
-                if isinstance(author, str):
-                    author = author.strip() or None
-                else:
-                    author = None
-                
-                # Extract description
-                description = mod.get('description')
-                if isinstance(description, str):
-                    description = description.strip() or None
-                else:
-                    description = None
-                
-                # Extract Minecraft versions
+            
+            # Extract author (string field in TOML)
+            author = mod.get('authors') if ctx.wants('author') else None
+            if isinstance(author, str):
+                author = author.strip() or None
+            else:
+                author = None
+            
+            # Extract description
+            description = mod.get('description') if ctx.wants('description') else None
+            if isinstance(description, str):
+                description = description.strip() or None
+            else:
+                description = None
+            
+            # Extract Minecraft versions
+            mc_versions = ()
+            if ctx.wants('mc_versions'):
                 mc_versions = self._extract_mc_versions_from_toml(data, mod_id)
-                
-                logger.debug(f"Extracted {loader.capitalize()} mod: {name} v{version}")
-                return ModInfo(
-                    name=name,
-                    loader=loader,
-                    version=version,
-                    filename=jar_path.name,
-                    mod_id=mod_id,
-                    dependencies=dependencies,
-                    author=author,
-                    description=description,
-                    mc_versions=mc_versions
-                )
-                
+            
+            logger.debug(f"Extracted {loader.capitalize()} mod: {name} v{version}")
+            return ModInfo(
+                name=name,
+                loader=loader,
+                version=version,
+                filename=jar_path.name,
+                mod_id=mod_id,
+                dependencies=dependencies,
+                author=author,
+                description=description,
+                mc_versions=mc_versions
+            )
+        
         except Exception as e:
             logger.error(f"Error extracting Forge/NeoForge mod info from {jar_path.name}: {e}")
         
         return None
     
-    def _get_version_from_manifest(self, jar: zipfile.ZipFile, files: List[str]) -> Optional[str]:
-        """Try to extract version from JAR manifest."""
-        if 'META-INF/MANIFEST.MF' not in files:
-            return None
-        
+    def nested_jars(self, ctx: ExtractionContext) -> List[str]:
+        # {"jars": [{"identifier": {...}, "version": {...}, "path": "META-INF/jarjar/library.jar"}]}
+        if self.JARJAR_METADATA_FILE not in ctx:
+            return []
         try:
-            with jar.open('META-INF/MANIFEST.MF') as f:
-                content = self._safe_decode(f.read())
-                for line in content.split('\n'):
-                    line = line.strip()
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        if key.strip() == 'Implementation-Version':
-                            return value.strip()
-        except Exception:
-            pass
-        
-        return None
+            data = ctx.json(self.JARJAR_METADATA_FILE)
+        except Exception as e:
+            logger.warning(f"Invalid {self.JARJAR_METADATA_FILE} in {ctx.jar_path.name}: {e}")
+            return []
+        if not isinstance(data, dict):
+            return []
+        return self._nested_jar_paths(data.get('jars'), 'path')
 
 
 class LegacyForgeExtractor(BaseExtractor):
     """Extractor for legacy Forge mods (mcmod.info)."""
     
     METADATA_FILE = 'mcmod.info'
+    METADATA_FILES = (METADATA_FILE,)
     
     @property
     def name(self) -> str:
@@ -239,67 +251,68 @@ class LegacyForgeExtractor(BaseExtractor):
     def priority(self) -> int:
         return 4
     
-    def can_extract(self, jar: zipfile.ZipFile, files: List[str]) -> bool:
-        return self.METADATA_FILE in files
+    def can_extract(self, ctx: ExtractionContext) -> bool:
+        return self.METADATA_FILE in ctx
     
-    def extract(self, jar: zipfile.ZipFile, jar_path: Path, files: List[str]) -> Optional[ModInfo]:
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
+        jar_path = ctx.jar_path
         try:
-            with jar.open(self.METADATA_FILE) as f:
-                content = self._safe_decode(f.read())
-                data = json.loads(content)
-                
-                # mcmod.info can be an array or object
-                if isinstance(data, list) and data:
-                    mod = data[0]
-                elif isinstance(data, dict):
-                    # Sometimes wrapped in 'modList' key
-                    if 'modList' in data and isinstance(data['modList'], list):
-                        mod = data['modList'][0] if data['modList'] else {}
-                    else:
-                        mod = data
+            data = ctx.json(self.METADATA_FILE, lenient=True)
+            
+            # mcmod.info can be an array or object
+            if isinstance(data, list) and data:
+                mod = data[0]
+            elif isinstance(data, dict):
+                # Sometimes wrapped in 'modList' key
+                if 'modList' in data and isinstance(data['modList'], list):
+                    mod = data['modList'][0] if data['modList'] else {}
                 else:
-                    logger.warning(f"Invalid mcmod.info format in {jar_path.name}")
-                    return None
-                
-                mod_id = mod.get('modid', '')
-                name = mod.get('name', mod.get('modid', jar_path.stem))
-                version = mod.get('version', 'Unknown')
-                
-                # Extract dependencies
-                dependencies = []
-                deps = mod.get('dependencies', []) or mod.get('requiredMods', [])
-                if isinstance(deps, list):
-                    dependencies = [d for d in deps if isinstance(d, str)]
-                
-                # Extract author (can be string or list)
+                    mod = data
+            else:
+                logger.warning(f"Invalid mcmod.info format in {jar_path.name}")
+                return None
+            
+            mod_id = mod.get('modid', '')
+            name = mod.get('name', mod.get('modid', jar_path.stem))
+            version = mod.get('version', 'Unknown')
+            
+            # Extract dependencies
+            dependencies = []
+            deps = (mod.get('dependencies', []) or mod.get('requiredMods', [])) if ctx.wants('dependencies') else None
+            if isinstance(deps, list):
+                dependencies = [d for d in deps if isinstance(d, str)]
+            
+            # Extract author (can be string or list)
+            author = None
+            if ctx.wants('author'):
                 author = self._normalize_authors(mod.get('authorList') or mod.get('authors'))
-                
-                # Extract description
-                description = mod.get('description')
-                if isinstance(description, str):
-                    description = description.strip() or None
-                else:
-                    description = None
-                
-                # Extract Minecraft version
-                mc_versions = []
-                mc_version = mod.get('mcversion')
-                if mc_version and isinstance(mc_version, str):
-                    mc_versions = self._parse_mc_versions(mc_version)
-                
-                logger.debug(f"Extracted Legacy Forge mod: {name} v{version}")
-                return ModInfo(
-                    name=name,
-                    loader='forge',
-                    version=version,
-                    filename=jar_path.name,
-                    mod_id=mod_id,
-                    dependencies=dependencies,
-                    author=author,
-                    description=description,
-                    mc_versions=mc_versions
-                )
-                
+            
+            # Extract description
+            description = mod.get('description') if ctx.wants('description') else None
+            if isinstance(description, str):
+                description = description.strip() or None
+            else:
+                description = None
+            
+            # Extract Minecraft version
+            mc_versions = ()
+            mc_version = mod.get('mcversion') if ctx.wants('mc_versions') else None
+            if mc_version and isinstance(mc_version, str):
+                mc_versions = self._parse_mc_versions(mc_version)
+            
+            logger.debug(f"Extracted Legacy Forge mod: {name} v{version}")
+            return ModInfo(
+                name=name,
+                loader='forge',
+                version=version,
+                filename=jar_path.name,
+                mod_id=mod_id,
+                dependencies=dependencies,
+                author=author,
+                description=description,
+                mc_versions=mc_versions
+            )
+        
         except json.JSONDecodeError as e:
             logger.warning(f"Invalid JSON in {self.METADATA_FILE} for {jar_path.name}: {e}")
         except Exception as e:
@@ -0,0 +1,406 @@
+"""
+Fast path for reading the keys the Forge extractor needs from mods.toml.
+
+``tomllib`` builds the whole document, including large mixin, access
+transformer and dependency tables the extractor never looks at.
+``scan_mods_toml`` walks the document with a handful of regexes instead,
+decoding only the values the extractor reads and checking everything else
+just enough to follow the document's structure. Whenever it meets a
+construct it can't prove it handles (dotted keys or inline tables touching
+the tables it reads, non-string values for the keys it reads, quoted keys
+with escapes, duplicate keys or tables, a table header naming a key
+already set, ...) it gives up and the caller falls back to a full
+``tomllib`` parse. tests/test_modstoml.py checks both paths agree on a
+corpus of documents.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Keys read by ForgeTomlExtractor, per table
+ROOT_KEYS = frozenset({'modLoader', 'loaderVersion'})
+MOD_KEYS = frozenset({'modId', 'version', 'displayName', 'authors', 'description'})
+DEPENDENCY_KEYS = frozenset({'modId', 'versionRange'})
+
+# Control characters TOML forbids outside of strings' escapes (tab is allowed)
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b-\x1f\x7f]')
+
+_KEY_PART = r'(?:[A-Za-z0-9_-]+|"[^"\\\n]*"|\'[^\'\n]*\')'
+_KEY = rf'{_KEY_PART}(?:[ \t]*\.[ \t]*{_KEY_PART})*'
+_KEY_PARTS = re.compile(rf'[ \t]*({_KEY_PART})[ \t]*(?:\.|$)')
+
+# Blank lines, comment lines and leading whitespace before a statement
+_SKIP = re.compile(r'(?:[ \t]*(?:#[^\n]*)?\n)*[ \t]*')
+# Whitespace, newlines and comments inside an array
+_ARRAY_SKIP = re.compile(r'(?:[ \t\n]|#[^\n]*)*')
+_INLINE_SKIP = re.compile(r'[ \t]*')
+_LINE_END = re.compile(r'[ \t]*(?:#[^\n]*)?(?:\n|\Z)')
+
+_ARRAY_TABLE = re.compile(rf'\[\[[ \t]*({_KEY})[ \t]*\]\]')
+_TABLE = re.compile(rf'\[[ \t]*({_KEY})[ \t]*\]')
+_KEY_VALUE = re.compile(rf'({_KEY})[ \t]*=[ \t]*')
+
+# The common statement shapes in one match: a bare key set to a string
+# without escapes, a boolean or an integer, or a header of bare keys
+_BARE_KEY = r'[A-Za-z0-9_-]+'
+_SIMPLE_STATEMENT = re.compile(rf'''
+    (?:[ \t]*(?:\#[^\n]*)?\n)*[ \t]*
+    (?:
+        (?P<key>{_BARE_KEY})[ \t]*=[ \t]*
+        (?:"(?P<basic>[^"\\\n]*)"|'(?P<literal>[^'\n]*)'|true|false|[+-]?(?:0|[1-9][0-9]*))
+      | \[\[[ \t]*(?P<array>{_BARE_KEY}(?:\.{_BARE_KEY})*)[ \t]*\]\]
+      | \[[ \t]*(?P<table>{_BARE_KEY}(?:\.{_BARE_KEY})*)[ \t]*\]
+    )
+    [ \t]*(?:\#[^\n]*)?(?:\n|\Z)
+''', re.VERBOSE)
+
+_BASIC_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+_LITERAL_STRING = re.compile(r"'([^'\n]*)'")
+# Multi-line strings close at the first unescaped triple quote; up to two
+# quotes right after it still belong to the content
+_ML_BASIC_STRING = re.compile(r'"""((?:[^"\\]|\\.|"(?!""))*)"""("{0,2})', re.DOTALL)
+_ML_LITERAL_STRING = re.compile(r"'''((?:[^']|'(?!''))*)'''('{0,2})")
+# Booleans, numbers, dates and times (field ranges are not checked)
+_SCALAR = re.compile(r'''
+    true | false
+  | [+-]?(?:inf|nan)
+  | 0x[0-9A-Fa-f](?:_?[0-9A-Fa-f])*
+  | 0o[0-7](?:_?[0-7])*
+  | 0b[01](?:_?[01])*
+  | \d{4}-\d{2}-\d{2}(?:[Tt ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:\d{2})?)?
+  | \d{2}:\d{2}:\d{2}(?:\.\d+)?
+  | [+-]?(?:0|[1-9](?:_?\d)*)(?:\.\d(?:_?\d)*)?(?:[eE][+-]?\d(?:_?\d)*)?
+''', re.VERBOSE)
+
+_ESCAPE = re.compile(r'\\(?:([btnfr"\\])|u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|[ \t]*\n[ \t\n]*)')
+_SIMPLE_ESCAPES = {'b': '\b', 't': '\t', 'n': '\n', 'f': '\f', 'r': '\r', '"': '"', '\\': '\\'}
+
+# Marker for values the scanner skips without decoding
+_SKIPPED = object()
+
+# What defined a name in a table: a key set to a value, a dotted key going
+# through it, or a table header naming it (directly or as a parent table)
+_BY_VALUE, _BY_DOTTED_KEY, _BY_HEADER = range(3)
+
+
+class _Unsupported(Exception):
+    """The document uses a construct the fast path does not handle."""
+
+
+def _unescape(content: str, multiline: bool) -> str:
+    """Decode the escape sequences of a basic string."""
+    def replace(match: re.Match) -> str:
+        simple, short, long = match.groups()
+        if simple:
+            return _SIMPLE_ESCAPES[simple]
+        if short or long:
+            code = int(short or long, 16)
+            if 0xD800 <= code <= 0xDFFF or code > 0x10FFFF:
+                raise _Unsupported("invalid unicode escape")
+            return chr(code)
+        if not multiline:
+            raise _Unsupported("line ending backslash outside multi-line string")
+        return ''
+    
+    decoded = _ESCAPE.sub(replace, content)
+    # Any backslash left over was an escape TOML doesn't define
+    if '\\' in _ESCAPE.sub('', content):
+        raise _Unsupported("invalid escape")
+    return decoded
+
+
+def _key_parts(key: str) -> Tuple[str, ...]:
+    """Split a (possibly dotted) key into its unquoted parts."""
+    parts = []
+    for match in _KEY_PARTS.finditer(key):
+        part = match.group(1)
+        if part[0] in '"\'':
+            part = part[1:-1]
+        parts.append(part)
+    return tuple(parts)
+
+
+def _parse_value(src: str, pos: int, decode: bool) -> Tuple[Any, int]:
+    """
+    Parse a value starting at pos.
+    
+    Returns:
+        Tuple of (decoded string or _SKIPPED, position after the value)
+    """
+    head = src[pos:pos + 3]
+    if head == '"""':
+        match = _ML_BASIC_STRING.match(src, pos)
+        if not match:
+            raise _Unsupported("unterminated string")
+        value = match.group(1) + match.group(2)
+        if value.startswith('\n'):
+            value = value[1:]
+        if decode or '\\' in value:
+            value = _unescape(value, True)
+        return (value if decode else _SKIPPED), match.end()
+    if head == "'''":
+        match = _ML_LITERAL_STRING.match(src, pos)
+        if not match:
+            raise _Unsupported("unterminated string")
+        value = match.group(1) + match.group(2)
+        if value.startswith('\n'):
+            value = value[1:]
+        return (value if decode else _SKIPPED), match.end()
+    
+    char = src[pos:pos + 1]
+    if char == '"':
+        match = _BASIC_STRING.match(src, pos)
+        if not match:
+            raise _Unsupported("unterminated string")
+        value = match.group(1)
+        if decode or '\\' in value:
+            value = _unescape(value, False)
+        return (value if decode else _SKIPPED), match.end()
+    if char == "'":
+        match = _LITERAL_STRING.match(src, pos)
+        if not match:
+            raise _Unsupported("unterminated string")
+        return (match.group(1) if decode else _SKIPPED), match.end()
+    if decode:
+        # The extractor only handles strings; let tomllib produce the real value
+        raise _Unsupported("non-string value for a key the extractor reads")
+    
+    if char == '[':
+        pos = _ARRAY_SKIP.match(src, pos + 1).end()
+        while src[pos:pos + 1] != ']':
+            _, pos = _parse_value(src, pos, False)
+            pos = _ARRAY_SKIP.match(src, pos).end()
+            if src[pos:pos + 1] == ',':
+                pos = _ARRAY_SKIP.match(src, pos + 1).end()
+            elif src[pos:pos + 1] != ']':
+                raise _Unsupported("malformed array")
+        return _SKIPPED, pos + 1
+    if char == '{':
+        seen = set()
+        pos += 1
+        while True:
+            pos = _INLINE_SKIP.match(src, pos).end()
+            if src[pos:pos + 1] == '}' and not seen:
+                return _SKIPPED, pos + 1
+            match = _KEY_VALUE.match(src, pos)
+            if not match:
+                raise _Unsupported("malformed inline table")
+            key = _key_parts(match.group(1))
+            if key in seen:
+                raise _Unsupported("duplicate key")
+            seen.add(key)
+            _, pos = _parse_value(src, match.end(), False)
+            pos = _INLINE_SKIP.match(src, pos).end()
+            char = src[pos:pos + 1]
+            pos += 1
+            if char == '}':
+                return _SKIPPED, pos
+            if char != ',':
+                raise _Unsupported("malformed inline table")
+    
+    match = _SCALAR.match(src, pos)
+    if not match:
+        raise _Unsupported("unrecognised value")
+    return _SKIPPED, match.end()
+
+
+class _Scanner:
+    """Follows which table statements land in while walking a document."""
+    
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.first_mod: Optional[Dict[str, str]] = None
+        self.dependencies: Dict[str, List[Dict[str, str]]] = {}
+        
+        # Table receiving key/values (None while in a table the extractor
+        # ignores) and the keys read from it
+        self.current: Optional[Dict[str, str]] = self.data
+        self.relevant = ROOT_KEYS
+        self.at_root = True
+        self.mods_count = 0
+        
+        # Names defined in each table, by the table's path from the root
+        # (paths through an array of tables include the element's index),
+        # with what defined them; the current table's path and names, the
+        # tables declared by a header, and the index of the last element of
+        # each array of tables
+        self.path: Tuple[Any, ...] = ()
+        self.names: Dict[str, int] = {}
+        self.tables: Dict[Tuple[Any, ...], Dict[str, int]] = {(): self.names}
+        self.headers = set()
+        self.arrays: Dict[Tuple[Any, ...], int] = {}
+    
+    def _declare(self, parts: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """
+        Path of the table a header declares, checked against what is defined.
+        
+        Headers may only open tables no key or dotted key defined, so
+        ``foo = 1`` followed by ``[foo]`` or ``[foo.bar]`` is unsupported.
+        """
+        path = ()
+        for part in parts:
+            if path in self.arrays:
+                path += (self.arrays[path],)
+            names = self.tables.setdefault(path, {})
+            if names.setdefault(part, _BY_HEADER) != _BY_HEADER:
+                raise _Unsupported("table header collides with a key")
+            path += (part,)
+        return path
+    
+    def _enter(self, path: Tuple[Any, ...]) -> None:
+        """Make the table at path receive the following keys."""
+        self.path = path
+        self.names = self.tables.setdefault(path, {})
+        self.at_root = False
+    
+    def array_table(self, parts: Tuple[str, ...]) -> None:
+        """Enter an ``[[array.of.tables]]`` element."""
+        path = self._declare(parts)
+        if path in self.tables and path not in self.arrays:
+            raise _Unsupported("table redefined as array")
+        index = self.arrays[path] = self.arrays.get(path, -1) + 1
+        self._enter(path + (index,))
+        if parts == ('mods',):
+            self.mods_count += 1
+            if self.mods_count == 1:
+                self.first_mod = self.current = {}
+                self.relevant = MOD_KEYS
+            else:
+                self.current = None
+        elif parts[0] == 'dependencies':
+            if len(parts) != 2:
+                raise _Unsupported("nested dependency table")
+            self.current = {}
+            self.relevant = DEPENDENCY_KEYS
+            self.dependencies.setdefault(parts[1], []).append(self.current)
+        else:
+            if parts[0] == 'mods' and not self.mods_count:
+                raise _Unsupported("mods sub-table before [[mods]]")
+            self.current = None
+    
+    def table(self, parts: Tuple[str, ...]) -> None:
+        """Enter a ``[standard.table]``."""
+        if parts[0] in ('mods', 'dependencies') and (len(parts) == 1 or not self.mods_count):
+            raise _Unsupported("table layout the fast path does not follow")
+        if parts[0] == 'dependencies':
+            raise _Unsupported("dependency sub-table")
+        path = self._declare(parts)
+        if path in self.headers or path in self.arrays:
+            raise _Unsupported("duplicate table")
+        self.headers.add(path)
+        self._enter(path)
+        self.current = None
+    
+    def key(self, parts: Tuple[str, ...]) -> bool:
+        """Register a key of the current table; returns whether its value is read."""
+        names = self.names
+        if len(parts) > 1:
+            table = self.path
+            for part in parts[:-1]:
+                if names.setdefault(part, _BY_DOTTED_KEY) != _BY_DOTTED_KEY:
+                    raise _Unsupported("dotted key collides with a table or key")
+                table += (part,)
+                names = self.tables.setdefault(table, {})
+        if parts[-1] in names:
+            raise _Unsupported("duplicate key")
+        names[parts[-1]] = _BY_VALUE
+        
+        name = parts[0]
+        if self.at_root and name in ('mods', 'dependencies'):
+            raise _Unsupported("mods or dependencies defined with keys")
+        wanted = self.current is not None and name in self.relevant
+        if wanted and len(parts) > 1:
+            raise _Unsupported("dotted key under a key the extractor reads")
+        return wanted
+    
+    def result(self) -> Dict[str, Any]:
+        """The partial document collected so far."""
+        data = self.data
+        if self.first_mod is not None:
+            data['mods'] = [self.first_mod]
+        if self.dependencies:
+            data['dependencies'] = self.dependencies
+        return data
+
+
+def _scan(src: str) -> Dict[str, Any]:
+    """Scan a whole document; raises _Unsupported when unsure."""
+    src = src.replace('\r\n', '\n')
+    if '\r' in src or _CONTROL_CHARS.search(src):
+        raise _Unsupported("control characters")
+    
+    scanner = _Scanner()
+    simple_statement = _SIMPLE_STATEMENT.match
+    pos = 0
+    end = len(src)
+    while True:
+        match = simple_statement(src, pos)
+        if match is not None:
+            key, basic, literal, array, table = match.group('key', 'basic', 'literal', 'array', 'table')
+            if key is not None:
+                if scanner.key((key,)):
+                    if basic is None and literal is None:
+                        raise _Unsupported("non-string value for a key the extractor reads")
+                    scanner.current[key] = literal if basic is None else basic
+            elif array is not None:
+                scanner.array_table(tuple(array.split('.')))
+            else:
+                scanner.table(tuple(table.split('.')))
+            pos = match.end()
+            continue
+        
+        pos = _SKIP.match(src, pos).end()
+        if pos >= end:
+            break
+        
+        if src.startswith('[[', pos):
+            match = _ARRAY_TABLE.match(src, pos)
+            if not match:
+                raise _Unsupported("malformed table header")
+            scanner.array_table(_key_parts(match.group(1)))
+            pos = match.end()
+        
+        elif src.startswith('[', pos):
+            match = _TABLE.match(src, pos)
+            if not match:
+                raise _Unsupported("malformed table header")
+            scanner.table(_key_parts(match.group(1)))
+            pos = match.end()
+        
+        else:
+            match = _KEY_VALUE.match(src, pos)
+            if not match:
+                raise _Unsupported("malformed statement")
+            parts = _key_parts(match.group(1))
+            wanted = scanner.key(parts)
+            value, pos = _parse_value(src, match.end(), wanted)
+            if wanted:
+                scanner.current[parts[0]] = value
+        
+        line_end = _LINE_END.match(src, pos)
+        if not line_end:
+            raise _Unsupported("trailing characters")
+        pos = line_end.end()
+    
+    return scanner.result()
+
+
+def scan_mods_toml(src: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the subset of a mods.toml document read by ForgeTomlExtractor.
+    
+    The result has the same shape as the ``tomllib`` parse, restricted to
+    the root loader keys, the first ``[[mods]]`` entry and the
+    ``[[dependencies.<modId>]]`` entries, each limited to the string keys
+    the extractor reads.
+    
+    Args:
+        src: Decoded mods.toml text
+    
+    Returns:
+        The partial document, or None when the full parser must be used
+    """
+    try:
+        return _scan(src)
+    except (_Unsupported, RecursionError):
+        return None
@@ -3,12 +3,11 @@ Quilt mod metadata extractor.
 """
 
 import json
-import zipfile
 import logging
-from pathlib import Path
-from typing import Optional, List
+from typing import List, Optional
 
 from .base import BaseExtractor
+from .context import ExtractionContext
 from ..models import ModInfo
 
 logger = logging.getLogger(__name__)
@@ -18,6 +17,7 @@ class QuiltExtractor(BaseExtractor):
     """Extractor for Quilt mods (quilt.mod.json)."""
     
     METADATA_FILE = 'quilt.mod.json'
+    METADATA_FILES = (METADATA_FILE,)
     
     @property
     def name(self) -> str:
@@ -27,76 +27,83 @@ class QuiltExtractor(BaseExtractor):
     def priority(self) -> int:
         return 2
     
-    def can_extract(self, jar: zipfile.ZipFile, files: List[str]) -> bool:
-        return self.METADATA_FILE in files
+    def can_extract(self, ctx: ExtractionContext) -> bool:
+        return self.METADATA_FILE in ctx
     
-    def extract(self, jar: zipfile.ZipFile, jar_path: Path, files: List[str]) -> Optional[ModInfo]:
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
+        jar_path = ctx.jar_path
         try:
-            with jar.open(self.METADATA_FILE) as f:
-                content = self._safe_decode(f.read())
-                data = json.loads(content)
-                
-                # Quilt uses a nested structure under 'quilt_loader'
-                quilt_loader = data.get('quilt_loader', {})
-                metadata = quilt_loader.get('metadata', {})
-                
-                mod_id = quilt_loader.get('id', '')
-                name = metadata.get('name', mod_id or jar_path.stem)
-                version = quilt_loader.get('version', 'Unknown')
-                
-                # Extract dependencies
-                dependencies = []
-                mc_versions = []
-                depends = quilt_loader.get('depends', [])
-                if isinstance(depends, list):
-                    for dep in depends:
-                        if isinstance(dep, dict):
-                            dep_id = dep.get('id')
-                            if dep_id:
-                                # Check for minecraft version
-                                if dep_id == 'minecraft':
+            data = ctx.json(self.METADATA_FILE)
+            
+            # Quilt uses a nested structure under 'quilt_loader'
+            quilt_loader = data.get('quilt_loader', {})
+            metadata = quilt_loader.get('metadata', {})
+            
+            mod_id = quilt_loader.get('id', '')
+            name = metadata.get('name', mod_id or jar_path.stem)
+            version = quilt_loader.get('version', 'Unknown')
+            
+            # Extract dependencies
+            dependencies = []
+            mc_versions = ()
+            want_dependencies = ctx.wants('dependencies')
+            want_mc_versions = ctx.wants('mc_versions')
+            depends = quilt_loader.get('depends', []) if want_dependencies or want_mc_versions else None
+            if isinstance(depends, list):
+                for dep in depends:
+                    if isinstance(dep, dict):
+                        dep_id = dep.get('id')
+                        if dep_id:
+                            # Check for minecraft version
+                            if dep_id == 'minecraft':
+                                if want_mc_versions:
                                     versions = dep.get('versions') or dep.get('version')
                                     mc_versions = self._parse_mc_versions(versions)
-                                else:
-                                    dependencies.append(dep_id)
-                        elif isinstance(dep, str):
-                            dependencies.append(dep)
-                
-                # Extract author from metadata.contributors or metadata.authors
-                author = None
-                contributors = metadata.get('contributors')
-                if contributors:
-                    # Contributors can be dict {name: role} or list
-                    if isinstance(contributors, dict):
-                        author = ', '.join(contributors.keys())
-                    else:
-                        author = self._normalize_authors(contributors)
-                if not author:
-                    author = self._normalize_authors(metadata.get('authors'))
-                
-                # Extract description
-                description = metadata.get('description')
-                if isinstance(description, str):
-                    description = description.strip() or None
+                            elif want_dependencies:
+                                dependencies.append(dep_id)
+                    elif isinstance(dep, str) and want_dependencies:
+                        dependencies.append(dep)
+            
+            # Extract author from metadata.contributors or metadata.authors
+            author = None
+            contributors = metadata.get('contributors') if ctx.wants('author') else None
+            if contributors:
+                # Contributors can be dict {name: role} or list
+                if isinstance(contributors, dict):
+                    author = ', '.join(contributors.keys())
                 else:
-                    description = None
-                
-                logger.debug(f"Extracted Quilt mod: {name} v{version}")
-                return ModInfo(
-                    name=name,
-                    loader='quilt',
-                    version=version,
-                    filename=jar_path.name,
-                    mod_id=mod_id,
-                    dependencies=dependencies,
-                    author=author,
-                    description=description,
-                    mc_versions=mc_versions
-                )
-                
+                    author = self._normalize_authors(contributors)
+            if not author and ctx.wants('author'):
+                author = self._normalize_authors(metadata.get('authors'))
+            
+            # Extract description
+            description = metadata.get('description') if ctx.wants('description') else None
+            if isinstance(description, str):
+                description = description.strip() or None
+            else:
+                description = None
+            
+            logger.debug(f"Extracted Quilt mod: {name} v{version}")
+            return ModInfo(
+                name=name,
+                loader='quilt',
+                version=version,
+                filename=jar_path.name,
+                mod_id=mod_id,
+                dependencies=dependencies,
+                author=author,
+                description=description,
+                mc_versions=mc_versions
+            )
+        
         except json.JSONDecodeError as e:
             logger.warning(f"Invalid JSON in {self.METADATA_FILE} for {jar_path.name}: {e}")
         except Exception as e:
             logger.error(f"Error extracting Quilt mod info from {jar_path.name}: {e}")
         
         return None
+    
+    def nested_jars(self, ctx: ExtractionContext) -> List[str]:
+        # "quilt_loader": {"jars": ["META-INF/jars/library.jar"]}
+        quilt_loader = ctx.json(self.METADATA_FILE).get('quilt_loader', {})
+        return self._nested_jar_paths(quilt_loader.get('jars'), 'file')
@@ -0,0 +1,216 @@
+"""
+Extractor registry with lazily imported implementations.
+
+Every extractor is described by an ``ExtractorSpec``: its name, priority and
+the archive entries it owns, declared statically next to the dotted path of
+its implementation. The scanner routes JARs on the declared entries alone,
+so an extractor's module (and whatever it imports, like ``tomllib``) is
+only imported once a JAR actually contains one of its entries.
+
+Extractors shipped by other packages are discovered through the
+``modlist_generator.extractors`` entry point group. An entry point may
+reference an ``ExtractorSpec`` (lazy), or an extractor class or instance
+(imported when the entry point is loaded)::
+
+    # pyproject.toml of a plugin package
+    [project.entry-points."modlist_generator.extractors"]
+    bukkit = "modlist_bukkit.spec:SPEC"
+    
+    # modlist_bukkit/spec.py
+    SPEC = ExtractorSpec(
+        'modlist_bukkit.extractor:BukkitExtractor',
+        name='Bukkit', priority=5, metadata_files=('plugin.yml',)
+    )
+"""
+
+import logging
+from functools import lru_cache
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Iterable, List, Optional, Tuple
+
+from .base import BaseExtractor
+from .context import MANIFEST_FILE, ExtractionContext
+from ..models import ModInfo
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'modlist_generator.extractors'
+
+
+class ExtractorSpec(BaseExtractor):
+    """
+    Static description of an extractor that imports the implementation on first use.
+    
+    Specs are drop-in extractors: routing only reads the declared entries,
+    and the first call to can_extract/extract/nested_jars imports and
+    instantiates the target class. Specs pickle without the loaded instance,
+    so process workers import only what their JARs need.
+    """
+    
+    def __init__(
+        self,
+        target: str,
+        name: str,
+        priority: int,
+        metadata_files: Iterable[str] = (),
+        auxiliary_files: Iterable[str] = (),
+        nested_files: Iterable[str] = (),
+        deep: bool = False
+    ):
+        """
+        Args:
+            target: Implementation as "package.module:ClassName"
+            name: Human-readable name of the extractor
+            priority: Extraction order (lower = higher priority)
+            metadata_files: Entries the extractor owns (routing); none means every JAR
+            auxiliary_files: Extra entries read during extraction
+            nested_files: Entries listing embedded JARs
+            deep: Only used for deep scans
+        """
+        self.target = target
+        self._name = name
+        self._priority = priority
+        self.METADATA_FILES: Tuple[str, ...] = tuple(metadata_files)
+        self.AUXILIARY_FILES: Tuple[str, ...] = tuple(auxiliary_files)
+        self.NESTED_FILES: Tuple[str, ...] = tuple(nested_files)
+        self.deep = deep
+        self._extractor: Optional[BaseExtractor] = None
+    
+    def __repr__(self) -> str:
+        return f"ExtractorSpec({self.target!r}, priority={self._priority})"
+    
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_extractor'] = None
+        return state
+    
+    @property
+    def name(self) -> str:
+        return self._name
+    
+    @property
+    def priority(self) -> int:
+        return self._priority
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the implementation has been imported."""
+        return self._extractor is not None
+    
+    def load(self) -> BaseExtractor:
+        """
+        Import and instantiate the implementation (once).
+        
+        Raises:
+            ImportError: If the module cannot be imported
+            AttributeError: If the module has no such class
+        """
+        if self._extractor is None:
+            module_name, _, class_name = self.target.partition(':')
+            logger.debug(f"Loading {self._name} extractor from {self.target}")
+            extractor_class = getattr(import_module(module_name), class_name)
+            self._extractor = extractor_class()
+        return self._extractor
+    
+    def can_extract(self, ctx: ExtractionContext) -> bool:
+        return self.load().can_extract(ctx)
+    
+    def extract(self, ctx: ExtractionContext) -> Optional[ModInfo]:
+        return self.load().extract(ctx)
+    
+    def nested_jars(self, ctx: ExtractionContext) -> List[str]:
+        nested_jars = getattr(self.load(), 'nested_jars', None)
+        return nested_jars(ctx) if nested_jars is not None else []
+
+
+# Built-in extractors; the entries declared here repeat the class attributes
+# so routing needs no import (tests/test_registry.py checks they match)
+BUILTIN_EXTRACTORS = [
+    ExtractorSpec(
+        f'{__package__}.fabric:FabricExtractor',
+        name="Fabric", priority=1,
+        metadata_files=('fabric.mod.json',)
+    ),
+    ExtractorSpec(
+        f'{__package__}.quilt:QuiltExtractor',
+        name="Quilt", priority=2,
+        metadata_files=('quilt.mod.json',)
+    ),
+    ExtractorSpec(
+        f'{__package__}.forge:ForgeTomlExtractor',
+        name="Forge/NeoForge TOML", priority=3,
+        metadata_files=('META-INF/neoforge.mods.toml', 'META-INF/mods.toml'),
+        auxiliary_files=(MANIFEST_FILE,),
+        nested_files=('META-INF/jarjar/metadata.json',)
+    ),
+    ExtractorSpec(
+        f'{__package__}.forge:LegacyForgeExtractor',
+        name="Legacy Forge", priority=4,
+        metadata_files=('mcmod.info',)
+    ),
+    ExtractorSpec(
+        f'{__package__}.annotation:ModAnnotationExtractor',
+        name="Class Annotation", priority=10,
+        auxiliary_files=(MANIFEST_FILE,),
+        deep=True
+    ),
+]
+
+
+@lru_cache(maxsize=None)
+def discover_extractors() -> Tuple[BaseExtractor, ...]:
+    """
+    Extractors registered by installed packages (looked up once per process).
+    
+    Entry points that fail to load or don't reference an extractor are
+    skipped with a warning.
+    """
+    extractors = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            extractor = entry_point.load()
+            if isinstance(extractor, type) and issubclass(extractor, BaseExtractor):
+                extractor = extractor()
+        except Exception as e:
+            logger.warning(f"Failed to load extractor plugin '{entry_point.name}': {e}")
+            continue
+        if not isinstance(extractor, BaseExtractor):
+            logger.warning(f"Extractor plugin '{entry_point.name}' is not an extractor: {extractor!r}")
+            continue
+        logger.debug(f"Registered extractor plugin '{entry_point.name}' ({extractor.name})")
+        extractors.append(extractor)
+    return tuple(extractors)
+
+
+def extractor_id(extractor: BaseExtractor) -> str:
+    """Stable identifier of an extractor: its implementation as "module:ClassName"."""
+    if isinstance(extractor, ExtractorSpec):
+        return extractor.target
+    extractor_class = type(extractor)
+    return f"{extractor_class.__module__}:{extractor_class.__qualname__}"
+
+
+@lru_cache(maxsize=None)
+def plugin_versions() -> Tuple[str, ...]:
+    """Installed distributions registering extractors, as sorted "name==version" strings."""
+    versions = set()
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        dist = getattr(entry_point, 'dist', None)
+        if dist is not None:
+            versions.add(f"{dist.metadata['Name']}=={dist.version}")
+    return tuple(sorted(versions))
+
+
+def get_extractors(deep: bool = False, plugins: bool = True) -> List[BaseExtractor]:
+    """
+    Registered extractors, built-in first.
+    
+    Args:
+        deep: Return the extractors only used for deep scans instead
+        plugins: Include extractors registered through entry points
+    """
+    extractors = list(BUILTIN_EXTRACTORS)
+    if plugins:
+        extractors.extend(discover_extractors())
+    return [e for e in extractors if getattr(e, 'deep', False) == deep]
@@ -0,0 +1,140 @@
+"""
+Best-effort metadata from mod JAR file names.
+
+Mod files are usually named ``<name>-<mc version>-<mod version>`` or some
+permutation of it, with optional loader tags: ``sodium-fabric-0.5.8+mc1.20.1``,
+``AdvancedAE-1.4.5-1.21.1``, ``jei-1.21.1-neoforge-19.22.0.315``. The
+parser splits the name into parts once with compiled regexes and classifies
+each part, so JARs without any metadata still get a usable name, loader and
+versions.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+# Checked in this order when a loader is only found inside another word
+LOADERS = ('fabric', 'neoforge', 'forge', 'quilt')
+
+# Distinct file names memoized by parse_filename
+FILENAME_CACHE_SIZE = 8192
+
+_JAR_SUFFIX = re.compile(r'\.jar(?:\.disabled)?$', re.IGNORECASE)
+# Parts between separators; '+' is kept apart so build metadata can be recognized
+_PART = re.compile(r'[^\s_+\-\[\]()]+')
+# A version, optionally with an "mc" prefix, a letter suffix ("0.5.1f",
+# "0.5.1.f") and a loader glued to its end ("1.21.1neoforge", "1.21.1.neoforge")
+_VERSION_PART = re.compile(
+    r'(?P<mc>mc)?v?(?P<version>\d+(?:\.\d+)*(?:\.x|\.?[a-z](?=$|\.?(?:neo)?forge|\.?fabric|\.?quilt))?)'
+    r'(?:\.?(?P<loader>neoforge|forge|fabric|quilt))?$',
+    re.IGNORECASE
+)
+# Minecraft 1.x releases since modding took off (1.7 to 1.21, the last 1.x line)
+_MC_VERSION = re.compile(r'1\.(?:[7-9]|1\d|2[01])(?:\.\d{1,2}|\.x)?')
+_MC_PREFIX = 'mc'
+_NAME_TRIM = ' -_+[('
+
+
+class ParsedFilename(NamedTuple):
+    """Metadata recovered from a JAR file name (None where not found)."""
+    name: str
+    loader: Optional[str]
+    version: Optional[str]
+    mc_version: Optional[str]
+
+
+def _detect_loader(stem: str) -> Optional[str]:
+    """Loader named anywhere in the file name, even glued to other words."""
+    lower = stem.lower()
+    for loader in LOADERS:
+        if loader in lower:
+            return loader
+    return None
+
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    """Numeric sort key of a Minecraft-like version ("1.21.x" sorts as 1.21.0)."""
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split('.'))
+
+
+@lru_cache(maxsize=FILENAME_CACHE_SIZE)
+def parse_filename(filename: str) -> ParsedFilename:
+    """
+    Parse a mod JAR file name into name, loader, mod version and MC version.
+
+    The name runs up to the first version or loader part. The Minecraft
+    version is, in order of preference, a part prefixed with "mc", a
+    Minecraft-like version after a '+', the first Minecraft-like version
+    followed by another version ("create-1.20.1-0.5.1.f"), or the newest
+    Minecraft-like version when there are several versions. The mod
+    version is the first other version that doesn't look like a Minecraft
+    version, else the last other version; a lone version is taken as the
+    mod version.
+
+    Args:
+        filename: JAR file name (with or without the .jar/.jar.disabled suffix)
+
+    Returns:
+        ParsedFilename; the name falls back to the whole stem
+    """
+    stem = _JAR_SUFFIX.sub('', filename)
+
+    name_end = None
+    loader = None
+    versions = []  # (version, explicitly mc, after '+')
+    mc_prefix = False
+    previous_end = 0
+    for match in _PART.finditer(stem):
+        part = match.group()
+        after_plus = '+' in stem[previous_end:match.start()]
+        previous_end = match.end()
+        lower = part.lower()
+
+        if lower in LOADERS:
+            loader = loader or lower
+            # A leading loader word is part of the name ("fabric-api")
+            if name_end is None and match.start() > 0:
+                name_end = match.start()
+            continue
+        if lower == _MC_PREFIX:
+            mc_prefix = True
+            if name_end is None:
+                name_end = match.start()
+            continue
+
+        version_match = _VERSION_PART.match(part)
+        if version_match is None or not ('.' in part or part.isdigit() or version_match.group('mc')):
+            mc_prefix = False
+            continue
+
+        if name_end is None:
+            name_end = match.start()
+        versions.append((version_match.group('version'), mc_prefix or bool(version_match.group('mc')), after_plus))
+        loader = loader or (version_match.group('loader') or '').lower() or None
+        mc_prefix = False
+
+    name = stem[:name_end].rstrip(_NAME_TRIM) if name_end else ''
+    if not name:
+        name = stem
+
+    mc_version = next((v for v, explicit, _ in versions if explicit), None)
+    if mc_version is None:
+        mc_version = next((v for v, _, plus in versions if plus and _MC_VERSION.fullmatch(v)), None)
+    if mc_version is None and len(versions) > 1:
+        mc_version = next((v for v, _, _ in versions[:-1] if _MC_VERSION.fullmatch(v)), None)
+    if mc_version is None and len(versions) > 1:
+        candidates = [v for v, _, _ in versions if _MC_VERSION.fullmatch(v)]
+        if candidates:
+            mc_version = max(candidates, key=_version_key)
+
+    others = [v for v, explicit, _ in versions if not explicit and v != mc_version]
+    version = next((v for v in others if not _MC_VERSION.fullmatch(v)), None)
+    if version is None and others:
+        version = others[-1]
+
+    return ParsedFilename(
+        name=name,
+        loader=loader or _detect_loader(stem),
+        version=version,
+        mc_version=mc_version,
+    )
@@ -3,18 +3,40 @@ Output formatters for different export formats.
 """
 
 import csv
-import json
 import io
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import FrozenSet, Iterable, List, Optional
 
-from .models import ScanResult
+from . import jsonbackend
+from .models import ScanResult, UpdateReport
 
 logger = logging.getLogger(__name__)
 
 
+def _selected(fields: Optional[FrozenSet[str]], field: str) -> bool:
+    """Whether a mod field is part of the output (fields=None selects all)."""
+    return fields is None or field in fields
+
+
+def _hash_algorithms(result: ScanResult, fields: Optional[FrozenSet[str]]) -> List[str]:
+    """Hash algorithms present on any mod, in order of appearance (none unless selected)."""
+    if not _selected(fields, 'hashes'):
+        return []
+    return list(dict.fromkeys(algorithm for mod in result.mods if mod.hashes for algorithm in mod.hashes))
+
+
+def _yaml_list(values: Iterable[str]) -> str:
+    """Inline YAML list of double-quoted strings."""
+    return '[' + ', '.join(f'"{value}"' for value in values) + ']'
+
+
+def _has_fingerprints(result: ScanResult, fields: Optional[FrozenSet[str]]) -> bool:
+    """Whether any mod has a CurseForge fingerprint to output."""
+    return _selected(fields, 'fingerprint') and any(mod.fingerprint is not None for mod in result.mods)
+
+
 class BaseFormatter(ABC):
     """Abstract base class for output formatters."""
     
@@ -32,12 +54,28 @@ class BaseFormatter(ABC):
     
     @abstractmethod
     def format(self, result: ScanResult, include_errors: bool = True, **kwargs) -> str:
-        """Format the scan result as a string."""
+        """
+        Format the scan result as a string.
+        
+        Keyword arguments common to all formatters:
+            fields: Mod fields to output (see models.MOD_FIELDS; None for all)
+        """
+        pass
+    
+    @abstractmethod
+    def format_updates(self, report: UpdateReport, **kwargs) -> str:
+        """Format an update report (see updates.check_updates) as a string."""
         pass
     
     def save(self, result: ScanResult, output_path: Path, include_errors: bool = True, **kwargs) -> None:
         """Save formatted output to file."""
-        content = self.format(result, include_errors, **kwargs)
+        self._write(self.format(result, include_errors, **kwargs), output_path)
+    
+    def save_updates(self, report: UpdateReport, output_path: Path, **kwargs) -> None:
+        """Save a formatted update report to file."""
+        self._write(self.format_updates(report, **kwargs), output_path)
+    
+    def _write(self, content: str, output_path: Path) -> None:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(content)
         logger.info(f"Saved {self.name} output to {output_path}")
@@ -57,7 +95,11 @@ class JsonFormatter(BaseFormatter):
     def format(self, result: ScanResult, include_errors: bool = True, **kwargs) -> str:
         compact = kwargs.get('compact', False)
         indent = None if compact else 2
-        return json.dumps(result.to_dict(include_errors), indent=indent, ensure_ascii=False)
+        return jsonbackend.dumps(result.to_dict(include_errors, fields=kwargs.get('fields')), indent=indent)
+    
+    def format_updates(self, report: UpdateReport, **kwargs) -> str:
+        indent = None if kwargs.get('compact', False) else 2
+        return jsonbackend.dumps(report.to_dict(), indent=indent)
 
 
 class CsvFormatter(BaseFormatter):
@@ -71,33 +113,92 @@ class CsvFormatter(BaseFormatter):
     def extension(self) -> str:
         return ".csv"
     
+    # (header, field, cell value) in column order
+    COLUMNS = (
+        ('Name', 'name', lambda mod: mod.name),
+        ('Loader', 'loader', lambda mod: mod.loader),
+        ('Version', 'version', lambda mod: mod.version),
+        ('Filename', 'filename', lambda mod: mod.filename),
+        ('Mod ID', 'mod_id', lambda mod: mod.mod_id or ''),
+        ('Author', 'author', lambda mod: mod.author or ''),
+        ('MC Versions', 'mc_versions', lambda mod: '; '.join(mod.mc_versions) if mod.mc_versions else ''),
+        ('Disabled', 'disabled', lambda mod: 'Yes' if mod.disabled else ''),
+        ('Dependencies', 'dependencies', lambda mod: '; '.join(mod.dependencies) if mod.dependencies else ''),
+        ('Parent', 'parent', lambda mod: mod.parent or ''),
+    )
+    
     def format(self, result: ScanResult, include_errors: bool = True, **kwargs) -> str:
         output = io.StringIO()
         writer = csv.writer(output)
         
-        # Header - now includes new fields
-        writer.writerow(['Name', 'Loader', 'Version', 'Filename', 'Mod ID', 'Author', 'MC Versions', 'Disabled', 'Dependencies'])
+        # Columns for the selected fields; Parent by default only when embedded mods were scanned
+        fields = kwargs.get('fields')
+        has_parents = fields is not None or any(mod.parent for mod in result.mods)
+        columns = [
+            column for column in self.COLUMNS
+            if _selected(fields, column[1]) and (column[1] != 'parent' or has_parents)
+        ]
+        # One column per hash algorithm, and one for fingerprints, when they were computed
+        algorithms = _hash_algorithms(result, fields)
+        fingerprints = _has_fingerprints(result, fields)
+        headers = [header for header, _, _ in columns] + [algorithm.upper() for algorithm in algorithms]
+        writer.writerow(headers + ['Fingerprint'] * fingerprints)
         
         # Data rows
         for mod in result.mods:
+            hashes = mod.hashes or {}
+            row = [value(mod) for _, _, value in columns] + [hashes.get(a, '') for a in algorithms]
+            if fingerprints:
+                row.append('' if mod.fingerprint is None else mod.fingerprint)
+            writer.writerow(row)
+        
+        return output.getvalue()
+    
+    def format_updates(self, report: UpdateReport, **kwargs) -> str:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Name', 'Mod ID', 'Loader', 'Filename', 'Current Version', 'Latest Version',
+                         'MC Versions', 'URL'])
+        for candidate in report.updates:
+            mod = candidate.mod
             writer.writerow([
-                mod.name,
-                mod.loader,
-                mod.version,
-                mod.filename,
-                mod.mod_id or '',
-                mod.author or '',
-                '; '.join(mod.mc_versions) if mod.mc_versions else '',
-                'Yes' if mod.disabled else '',
-                '; '.join(mod.dependencies) if mod.dependencies else ''
+                mod.name, mod.mod_id, mod.loader, mod.filename, mod.version, candidate.latest_version,
+                '; '.join(candidate.mc_versions), candidate.url or ''
             ])
-        
         return output.getvalue()
 
 
 class MarkdownFormatter(BaseFormatter):
     """Markdown table output formatter."""
     
+    # (header, field) in column order; Filename only when selected explicitly
+    COLUMNS = (
+        ('Name', 'name'),
+        ('Loader', 'loader'),
+        ('Version', 'version'),
+        ('Filename', 'filename'),
+        ('Author', 'author'),
+        ('MC Version', 'mc_versions'),
+        ('Status', 'disabled'),
+    )
+    
+    @staticmethod
+    def _cell(mod, field: str, fields: Optional[FrozenSet[str]]) -> str:
+        """Table cell of a mod field, with pipe characters escaped."""
+        if field == 'author':
+            value = (mod.author or '')[:30]  # Truncate long authors
+        elif field == 'mc_versions':
+            value = ', '.join(mod.mc_versions[:2]) if mod.mc_versions else '-'  # Show first 2
+        elif field == 'disabled':
+            value = ''
+            if _selected(fields, 'disabled'):
+                value = '🔴 Disabled' if mod.disabled else '✅'
+            if mod.parent and _selected(fields, 'parent'):
+                value = f"{value} (in {mod.parent})".lstrip()
+        else:
+            value = getattr(mod, field)
+        return value.replace('|', '\\|')
+    
     @property
     def name(self) -> str:
         return "Markdown"
@@ -107,6 +208,7 @@ class MarkdownFormatter(BaseFormatter):
         return ".md"
     
     def format(self, result: ScanResult, include_errors: bool = True, **kwargs) -> str:
+        fields = kwargs.get('fields')
         lines = [
             f"# Modlist",
             f"",
@@ -117,14 +219,14 @@ class MarkdownFormatter(BaseFormatter):
         ]
         
         # Count disabled mods
-        disabled_count = sum(1 for mod in result.mods if mod.disabled)
+        disabled_count = sum(1 for mod in result.mods if mod.disabled) if _selected(fields, 'disabled') else 0
         if disabled_count > 0:
             lines.append(f"**Disabled Mods:** {disabled_count}  ")
             lines.append(f"")
         
         # Count by MC version
         mc_version_counts = {}
-        for mod in result.mods:
+        for mod in result.mods if _selected(fields, 'mc_versions') else ():
             for v in mod.mc_versions:
                 mc_version_counts[v] = mc_version_counts.get(v, 0) + 1
         if mc_version_counts:
@@ -132,20 +234,31 @@ class MarkdownFormatter(BaseFormatter):
             lines.append(f"**MC Versions:** {mc_summary}  ")
             lines.append(f"")
         
+        # Status shows the disabled flag and the parent of embedded mods
+        columns = [
+            (header, field) for header, field in self.COLUMNS
+            if (fields is not None and field in fields)
+            or (fields is None and field != 'filename')
+            or (field == 'disabled' and _selected(fields, 'parent'))
+        ]
+        algorithms = _hash_algorithms(result, fields)
+        fingerprints = _has_fingerprints(result, fields)
+        headers = [header for header, _ in columns] + [algorithm.upper() for algorithm in algorithms]
+        headers += ['Fingerprint'] * fingerprints
         lines.extend([
             f"## Mods",
             f"",
-            f"| Name | Loader | Version | Author | MC Version | Status |",
-            f"|------|--------|---------|--------|------------|--------|",
+            f"| {' | '.join(headers)} |",
+            f"|{'|'.join('-' * (len(header) + 2) for header in headers)}|",
         ])
         
         for mod in result.mods:
-            # Escape pipe characters in values
-            name = mod.name.replace('|', '\\|')
-            author = (mod.author or '').replace('|', '\\|')[:30]  # Truncate long authors
-            mc_ver = ', '.join(mod.mc_versions[:2]) if mod.mc_versions else '-'  # Show first 2
-            status = '🔴 Disabled' if mod.disabled else '✅'
-            lines.append(f"| {name} | {mod.loader} | {mod.version} | {author} | {mc_ver} | {status} |")
+            hashes = mod.hashes or {}
+            cells = [self._cell(mod, field, fields) for _, field in columns]
+            cells.extend(hashes.get(algorithm, '-') for algorithm in algorithms)
+            if fingerprints:
+                cells.append('-' if mod.fingerprint is None else str(mod.fingerprint))
+            lines.append(f"| {' | '.join(cells)} |")
         
         if include_errors and result.errors:
             lines.extend([
@@ -157,6 +270,49 @@ class MarkdownFormatter(BaseFormatter):
                 lines.append(f"- {error}")
         
         return '\n'.join(lines)
+    
+    def format_updates(self, report: UpdateReport, **kwargs) -> str:
+        lines = [
+            f"# Mod Updates",
+            f"",
+            f"**Updates Available:** {len(report.updates)}  ",
+            f"**Up to Date:** {report.up_to_date}  ",
+            f"**Not in Catalog:** {len(report.not_found)}  ",
+            f"**Not Comparable:** {len(report.not_comparable)}  ",
+            f"**Generated:** {report.generated_at or 'N/A'}  ",
+            f"",
+            f"## Updates",
+            f"",
+            f"| Name | Loader | Current | Latest | MC Version |",
+            f"|------|--------|---------|--------|------------|",
+        ]
+        for candidate in report.updates:
+            mod = candidate.mod
+            latest = f"[{candidate.latest_version}]({candidate.url})" if candidate.url else candidate.latest_version
+            cells = [
+                mod.name, mod.loader, mod.version, latest,
+                ', '.join(candidate.mc_versions[:2]) if candidate.mc_versions else '-'
+            ]
+            cells = [cell.replace('|', '\\|') for cell in cells]
+            lines.append(f"| {' | '.join(cells)} |")
+        
+        if report.not_found:
+            lines.extend([
+                f"",
+                f"## Not in Catalog ({len(report.not_found)})",
+                f"",
+            ])
+            lines.extend(f"- {filename}" for filename in report.not_found)
+        
+        if report.not_comparable:
+            lines.extend([
+                f"",
+                f"## Not Comparable ({len(report.not_comparable)})",
+                f"",
+            ])
+            lines.extend(f"- {filename}" for filename in report.not_comparable)
+        
+        return '\n'.join(lines)
 
 
 class YamlFormatter(BaseFormatter):
@@ -172,6 +328,7 @@ class YamlFormatter(BaseFormatter):
     
     def format(self, result: ScanResult, include_errors: bool = True, **kwargs) -> str:
         # Simple YAML output without external dependency
+        fields = kwargs.get('fields')
         lines = [
             f"# Modlist Generator Output",
             f"total_mods: {len(result.mods)}",
@@ -183,28 +340,42 @@ class YamlFormatter(BaseFormatter):
         ]
         
         for mod in result.mods:
-            lines.extend([
-                f"  - name: \"{mod.name}\"",
-                f"    loader: {mod.loader}",
-                f"    version: \"{mod.version}\"",
-                f"    filename: \"{mod.filename}\"",
-            ])
-            if mod.mod_id:
-                lines.append(f"    mod_id: \"{mod.mod_id}\"")
-            if mod.author:
+            entry = []
+            if _selected(fields, 'name'):
+                entry.append(f"name: \"{mod.name}\"")
+            if _selected(fields, 'loader'):
+                entry.append(f"loader: {mod.loader}")
+            if _selected(fields, 'version'):
+                entry.append(f"version: \"{mod.version}\"")
+            if _selected(fields, 'filename'):
+                entry.append(f"filename: \"{mod.filename}\"")
+            if mod.mod_id and _selected(fields, 'mod_id'):
+                entry.append(f"mod_id: \"{mod.mod_id}\"")
+            if mod.author and _selected(fields, 'author'):
                 # Escape quotes in author string
                 author_escaped = mod.author.replace('"', '\\"')
-                lines.append(f"    author: \"{author_escaped}\"")
-            if mod.description:
+                entry.append(f"author: \"{author_escaped}\"")
+            if mod.description and _selected(fields, 'description'):
                 # Truncate long descriptions and escape quotes
                 desc = mod.description[:200].replace('"', '\\"').replace('\n', ' ')
-                lines.append(f"    description: \"{desc}\"")
-            if mod.mc_versions:
-                lines.append(f"    mc_versions: [{', '.join(f'\"{v}\"' for v in mod.mc_versions)}]")
-            if mod.disabled:
-                lines.append(f"    disabled: true")
-            if mod.dependencies:
-                lines.append(f"    dependencies: [{', '.join(f'\"{d}\"' for d in mod.dependencies)}]")
+                entry.append(f"description: \"{desc}\"")
+            if mod.mc_versions and _selected(fields, 'mc_versions'):
+                entry.append(f"mc_versions: {_yaml_list(mod.mc_versions)}")
+            if mod.disabled and _selected(fields, 'disabled'):
+                entry.append(f"disabled: true")
+            if mod.parent and _selected(fields, 'parent'):
+                entry.append(f"parent: \"{mod.parent}\"")
+            if mod.dependencies and _selected(fields, 'dependencies'):
+                entry.append(f"dependencies: {_yaml_list(mod.dependencies)}")
+            if mod.hashes and _selected(fields, 'hashes'):
+                hashes = ', '.join(f'{algorithm}: "{digest}"' for algorithm, digest in mod.hashes.items())
+                entry.append(f"hashes: {{{hashes}}}")
+            if mod.fingerprint is not None and _selected(fields, 'fingerprint'):
+                entry.append(f"fingerprint: {mod.fingerprint}")
+            
+            # Every selected field can be empty, leaving nothing to list
+            lines.append(f"  - {entry[0]}" if entry else "  - {}")
+            lines.extend(f"    {line}" for line in entry[1:])
         
         if include_errors and result.errors:
             lines.extend([
@@ -216,6 +387,45 @@ class YamlFormatter(BaseFormatter):
                 lines.append(f"  - \"{error_escaped}\"")
         
         return '\n'.join(lines)
+    
+    def format_updates(self, report: UpdateReport, **kwargs) -> str:
+        lines = [
+            f"# Modlist Generator Update Report",
+            f"total_updates: {len(report.updates)}",
+            f"up_to_date: {report.up_to_date}",
+            f"catalog_entries: {report.catalog_entries}",
+            f"generated_at: \"{report.generated_at.isoformat() if report.generated_at else 'N/A'}\"",
+            f"",
+            f"updates:" if report.updates else f"updates: []",
+        ]
+        for candidate in report.updates:
+            mod = candidate.mod
+            lines.append(f"  - name: \"{mod.name}\"")
+            lines.append(f"    mod_id: \"{mod.mod_id}\"")
+            lines.append(f"    loader: {mod.loader}")
+            lines.append(f"    filename: \"{mod.filename}\"")
+            lines.append(f"    current_version: \"{mod.version}\"")
+            lines.append(f"    latest_version: \"{candidate.latest_version}\"")
+            if candidate.mc_versions:
+                lines.append(f"    mc_versions: {_yaml_list(candidate.mc_versions)}")
+            if candidate.url:
+                lines.append(f"    url: \"{candidate.url}\"")
+        
+        if report.not_found:
+            lines.extend([
+                f"",
+                f"not_found:",
+            ])
+            lines.extend(f"  - \"{filename}\"" for filename in report.not_found)
+        
+        if report.not_comparable:
+            lines.extend([
+                f"",
+                f"not_comparable:",
+            ])
+            lines.extend(f"  - \"{filename}\"" for filename in report.not_comparable)
+        
+        return '\n'.join(lines)
 
 
 # Registry of available formatters
@@ -0,0 +1,373 @@
+"""
+Offline index identifying JARs by their content hashes.
+
+Maps SHA-1, SHA-512 and CurseForge fingerprints to the project id, name,
+loader and version of a published file. The index is built once from a
+metadata dump (``build_index``) and stored as a binary file of sorted,
+fixed-width key tables. ``HashIndex`` memory-maps the file and binary
+searches the tables in place: opening it reads only the header, and a
+lookup touches about log2(n) pages, so a million-entry index costs
+almost no time or memory.
+
+File layout (little-endian)::
+
+    header    magic, format version, record count, key count per kind
+    records   record count x 4 string offsets (project id, name, loader, version)
+    keys      per kind in KEY_KINDS order: sorted (key, record number) pairs
+    strings   length-prefixed UTF-8 strings, deduplicated
+
+Dumps are JSON Lines, a JSON array, or a JSON object with a "mods" array
+(so modlist JSON output scanned with ``--hash``/``--fingerprint`` works as
+a dump). Each entry describes one file::
+
+    {"project_id": "AANobbMI", "name": "Sodium", "loader": "fabric",
+     "version": "0.5.8", "sha1": "...", "sha512": "...", "fingerprint": 1234}
+
+Hashes may also be given in a "hashes" object, the project id as
+"mod_id", and the loader as the first of a "loaders" list.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from . import jsonbackend
+from .jarfile import JarIndex
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MLHASHIX'
+FORMAT_VERSION = 1
+
+SHA1 = 'sha1'
+SHA512 = 'sha512'
+FINGERPRINT = 'fingerprint'
+
+# Key kinds and their width in bytes, in file order; also the lookup order,
+# cheapest to compute first
+KEY_KINDS = ((SHA1, 20), (SHA512, 64), (FINGERPRINT, 4))
+
+_HEADER = struct.Struct(f'<8s2I{len(KEY_KINDS)}I')
+_RECORD = struct.Struct('<4I')
+_KEY_RECORD = struct.Struct('<I')
+_STRING_LENGTH = struct.Struct('<I')
+_FINGERPRINT = struct.Struct('>I')
+
+
+class IndexEntry(NamedTuple):
+    """Project file identified by a hash."""
+    project_id: str
+    name: str
+    loader: str
+    version: str
+
+
+class _KeyColumn:
+    """Keys of one sorted table as a sequence, read from the mapping on access."""
+
+    def __init__(self, mm: mmap.mmap, offset: int, count: int, width: int):
+        self._mm = mm
+        self._offset = offset
+        self._count = count
+        self._width = width
+        self._stride = width + _KEY_RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> bytes:
+        start = self._offset + position * self._stride
+        return self._mm[start:start + self._width]
+
+    def record(self, position: int) -> int:
+        """Record number stored next to the key at a position."""
+        return _KEY_RECORD.unpack_from(self._mm, self._offset + position * self._stride + self._width)[0]
+
+
+def encode_key(kind: str, value: Union[str, int, bytes]) -> bytes:
+    """
+    Binary key of a hash as stored in the index.
+
+    Args:
+        kind: One of the KEY_KINDS names
+        value: Hex digest or raw digest for SHA-1/SHA-512, integer for fingerprints
+
+    Raises:
+        ValueError: If the kind is unknown or the value malformed
+    """
+    widths = dict(KEY_KINDS)
+    if kind not in widths:
+        raise ValueError(f"Unknown hash kind '{kind}'")
+    if kind == FINGERPRINT:
+        try:
+            return _FINGERPRINT.pack(int(value))
+        except (TypeError, struct.error):
+            raise ValueError(f"Invalid fingerprint {value!r}")
+    key = bytes.fromhex(value) if isinstance(value, str) else bytes(value)
+    if len(key) != widths[kind]:
+        raise ValueError(f"Invalid {kind} digest {value!r}")
+    return key
+
+
+class HashIndex:
+    """
+    Read-only, memory-mapped hash index (see build_index).
+
+    Lookups are thread-safe. Instances pickle by path, so process workers
+    map the file themselves.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Map an index file.
+
+        Args:
+            path: Index file written by build_index
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the file is not an index or is truncated
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{self.path} is empty")
+        if hasattr(mmap, 'MADV_RANDOM'):
+            # Lookups touch scattered pages; readahead would only inflate RSS
+            self._mm.madvise(mmap.MADV_RANDOM)
+
+        try:
+            self._load_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _load_header(self) -> None:
+        """Validate the header and locate the tables."""
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a hash index")
+        magic, version, self.record_count, *key_counts = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a hash index")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has unsupported index format {version}")
+
+        offset = _HEADER.size
+        self._records_offset = offset
+        offset += self.record_count * _RECORD.size
+        self._columns: Dict[str, _KeyColumn] = {}
+        for (kind, width), count in zip(KEY_KINDS, key_counts):
+            self._columns[kind] = _KeyColumn(self._mm, offset, count, width)
+            offset += count * (width + _KEY_RECORD.size)
+        self._strings_offset = offset
+        if offset > len(self._mm):
+            raise ValueError(f"{self.path} is truncated")
+
+    def __reduce__(self):
+        return (HashIndex, (str(self.path),))
+
+    def __enter__(self) -> 'HashIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    @property
+    def kinds(self) -> List[str]:
+        """Key kinds present in the index, cheapest to compute first."""
+        return [kind for kind, _ in KEY_KINDS if len(self._columns[kind])]
+
+    def _string(self, offset: int) -> str:
+        start = self._strings_offset + offset
+        length, = _STRING_LENGTH.unpack_from(self._mm, start)
+        start += _STRING_LENGTH.size
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _entry(self, record: int) -> IndexEntry:
+        offsets = _RECORD.unpack_from(self._mm, self._records_offset + record * _RECORD.size)
+        return IndexEntry(*(self._string(offset) for offset in offsets))
+
+    def lookup(self, kind: str, value: Union[str, int, bytes]) -> Optional[IndexEntry]:
+        """
+        Find the project file with a hash.
+
+        Args:
+            kind: One of the KEY_KINDS names
+            value: Hash as accepted by encode_key
+
+        Returns:
+            The entry, or None if the hash is unknown or shared by several
+            entries (32-bit fingerprints do collide)
+
+        Raises:
+            ValueError: If the kind is unknown or the value malformed
+        """
+        if self._mm is None:
+            raise ValueError("Attempt to read from a closed HashIndex")
+        key = encode_key(kind, value)
+        column = self._columns[kind]
+        position = bisect_left(column, key)
+        if position == len(column) or column[position] != key:
+            return None
+        if position + 1 < len(column) and column[position + 1] == key:
+            logger.debug(f"Ambiguous {kind} {value!r} in {self.path.name}")
+            return None
+        return self._entry(column.record(position))
+
+    def identify(self, jar: JarIndex, algorithms: Iterable[str] = ()) -> Optional[IndexEntry]:
+        """
+        Identify an open JAR by each kind of hash the index holds, cheapest first.
+
+        The digests the index holds are computed in one pass over the JAR,
+        along with any other algorithms the caller needs; digests the JAR
+        already computed are reused. The fingerprint is only computed when
+        no digest matched.
+
+        Args:
+            jar: The JAR (hashes are computed from its whole content)
+            algorithms: Other hashlib algorithms to digest in the same pass
+
+        Returns:
+            The entry for the first hash found, or None
+
+        Raises:
+            JarTimeoutError: If the JAR's deadline passes while hashing
+        """
+        kinds = self.kinds
+        digests = jar.digests(dict.fromkeys([kind for kind in kinds if kind != FINGERPRINT] + list(algorithms)))
+        for kind in kinds:
+            entry = self.lookup(kind, jar.fingerprint() if kind == FINGERPRINT else digests[kind])
+            if entry is not None:
+                return entry
+        return None
+
+
+def read_dump(path: Union[str, Path]) -> Iterator[Mapping[str, Any]]:
+    """
+    Entries of a metadata dump (JSON Lines, a JSON array or {"mods": [...]}).
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        # JSON Lines unless the first line is not an entry on its own
+        try:
+            first = jsonbackend.loads(f.readline())
+        except ValueError:
+            first = None
+        f.seek(0)
+        if not isinstance(first, dict) or 'mods' in first:
+            document = jsonbackend.loads(f.read())
+            entries = document.get('mods', []) if isinstance(document, dict) else document
+            yield from (entry for entry in entries if isinstance(entry, dict))
+            return
+
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = jsonbackend.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {e}")
+            if isinstance(entry, dict):
+                yield entry
+
+
+def _dump_keys(entry: Mapping[str, Any]) -> List[Tuple[str, bytes]]:
+    """(kind, key) pairs of a dump entry."""
+    hashes = entry.get('hashes') if isinstance(entry.get('hashes'), dict) else {}
+    keys = []
+    for kind, _ in KEY_KINDS:
+        value = entry.get(kind, hashes.get(kind))
+        if value is not None:
+            keys.append((kind, encode_key(kind, value)))
+    return keys
+
+
+def _dump_record(entry: Mapping[str, Any]) -> Optional[Tuple[str, str, str, str]]:
+    """(project id, name, loader, version) of a dump entry, None without a name or id."""
+    project_id = entry.get('project_id') or entry.get('mod_id') or ''
+    name = entry.get('name') or project_id
+    if not name:
+        return None
+    loader = entry.get('loader')
+    if not loader and isinstance(entry.get('loaders'), list) and entry['loaders']:
+        loader = entry['loaders'][0]
+    return (str(project_id), str(name), str(loader or 'unknown'), str(entry.get('version') or 'Unknown'))
+
+
+def build_index(entries: Iterable[Mapping[str, Any]], path: Union[str, Path]) -> int:
+    """
+    Write an index file from dump entries.
+
+    Identical records are stored once. The file is written next to the
+    target and moved into place, so open indexes are never modified.
+
+    Args:
+        entries: Dump entries (see read_dump)
+        path: Index file to write
+
+    Returns:
+        Number of keys indexed
+
+    Raises:
+        ValueError: If an entry has a malformed hash
+        OSError: If the file cannot be written
+    """
+    records: Dict[Tuple[str, str, str, str], int] = {}
+    keys: Dict[str, set] = {kind: set() for kind, _ in KEY_KINDS}
+    skipped = 0
+    for entry in entries:
+        record = _dump_record(entry)
+        entry_keys = _dump_keys(entry)
+        if record is None or not entry_keys:
+            skipped += 1
+            continue
+        number = records.setdefault(record, len(records))
+        for kind, key in entry_keys:
+            keys[kind].add((key, number))
+    if skipped:
+        logger.warning(f"Skipped {skipped} dump entries without a name or hash")
+
+    strings = bytearray()
+    string_offsets: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        offset = string_offsets.get(value)
+        if offset is None:
+            encoded = value.encode('utf-8')
+            offset = string_offsets[value] = len(strings)
+            strings.extend(_STRING_LENGTH.pack(len(encoded)))
+            strings.extend(encoded)
+        return offset
+
+    path = Path(path)
+    temporary = path.with_name(f"{path.name}.tmp")
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(records), *(len(keys[kind]) for kind, _ in KEY_KINDS)))
+        for record in records:
+            f.write(_RECORD.pack(*(intern(value) for value in record)))
+        for kind, _ in KEY_KINDS:
+            f.writelines(key + _KEY_RECORD.pack(number) for key, number in sorted(keys[kind]))
+        f.write(strings)
+    os.replace(temporary, path)
+
+    total = sum(len(kind_keys) for kind_keys in keys.values())
+    logger.debug(f"Indexed {total} hashes of {len(records)} files in {path}")
+    return total
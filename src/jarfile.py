@@ -0,0 +1,681 @@
+"""
+Lightweight JAR reader that only indexes the entries we care about.
+
+``zipfile.ZipFile`` builds a ``ZipInfo`` object for every entry in the
+archive, which is wasted work for mods with tens of thousands of class
+files when only a handful of metadata files are ever read. ``JarIndex``
+memory-maps the archive, walks the central directory straight from the
+mapping and records only the requested entries. Archives embedded in other
+archives (jar-in-jar) are indexed straight from the parent's buffer.
+
+Reads are bounded by ``ScanLimits`` so hostile archives (zip bombs, huge
+metadata files, central directories with millions of records) are
+rejected while streaming rather than after the damage is done.
+"""
+
+import hashlib
+import mmap
+import struct
+import time
+import zlib
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .fingerprint import curseforge_fingerprint
+
+# End of central directory record
+_EOCD_SIGNATURE = b'PK\x05\x06'
+_EOCD = struct.Struct('<4s4H2LH')
+_EOCD_MAX_COMMENT = 0xFFFF
+
+# ZIP64 end of central directory locator and record
+_ZIP64_LOCATOR_SIGNATURE = b'PK\x06\x07'
+_ZIP64_LOCATOR = struct.Struct('<4sLQL')
+_ZIP64_EOCD_SIGNATURE = b'PK\x06\x06'
+_ZIP64_EOCD = struct.Struct('<4sQ2H2L4Q')
+_ZIP64_EXTRA_ID = 0x0001
+
+# Central directory file header
+_CD_SIGNATURE = b'PK\x01\x02'
+_CD_HEADER = struct.Struct('<4s6H3L5H2L')
+
+# Local file header
+_LOCAL_SIGNATURE = b'PK\x03\x04'
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+_FLAG_ENCRYPTED = 0x1
+
+STORED = 0
+DEFLATED = 8
+
+# How many central directory records to walk between deadline checks
+_DEADLINE_CHECK_INTERVAL = 1024
+
+# Compressed bytes fed to zlib, and most output produced, per inflate step
+_INFLATE_CHUNK = 64 * 1024
+_INFLATE_STEP = 1024 * 1024
+
+# Bytes fed to every hash per step when hashing a whole archive; hashlib
+# releases the GIL for buffers this large, so worker threads hash in parallel
+_HASH_CHUNK = 1024 * 1024
+
+# Output produced before the compression ratio limit applies, so small
+# highly repetitive files are not rejected
+_RATIO_GRACE_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ScanLimits:
+    """
+    Resource limits applied to every JAR. None disables a limit.
+
+    Attributes:
+        max_entry_size: Maximum uncompressed size of a single metadata entry
+        max_entries: Maximum number of central directory records
+        max_compression_ratio: Maximum uncompressed/compressed ratio while inflating
+        max_total_bytes: Maximum uncompressed bytes read from one JAR
+        max_nested_size: Maximum uncompressed size of a compressed embedded JAR
+        max_nested_depth: Maximum jar-in-jar nesting level scanned
+    """
+    max_entry_size: Optional[int] = 8 * 1024 * 1024
+    max_entries: Optional[int] = 1_000_000
+    max_compression_ratio: Optional[float] = 100.0
+    max_total_bytes: Optional[int] = 32 * 1024 * 1024
+    max_nested_size: Optional[int] = 64 * 1024 * 1024
+    max_nested_depth: Optional[int] = 3
+
+
+DEFAULT_LIMITS = ScanLimits()
+UNLIMITED = ScanLimits(None, None, None, None, None, None)
+
+
+class JarTimeoutError(TimeoutError):
+    """Raised when reading a JAR runs past its deadline."""
+
+
+class JarLimitError(Exception):
+    """
+    Raised when a JAR exceeds one of its ScanLimits.
+
+    Attributes:
+        limit: Name of the ScanLimits field that was exceeded
+        value: Observed value (a lower bound when detected while streaming)
+        maximum: Configured maximum
+        entry: Archive entry being read, or None for archive-wide limits
+    """
+
+    def __init__(self, limit: str, value: float, maximum: float, entry: Optional[str] = None):
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+        self.entry = entry
+        where = f" in {entry}" if entry else ""
+        super().__init__(f"{limit} exceeded{where} ({value} > {maximum})")
+
+
+def check_deadline(deadline: Optional[float]) -> None:
+    """Raise JarTimeoutError if a ``time.monotonic()`` deadline has passed."""
+    if deadline is not None and time.monotonic() > deadline:
+        raise JarTimeoutError("Deadline exceeded")
+
+
+def normalize_hash_algorithms(algorithms: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Validate hash algorithm names for JarIndex.digests.
+
+    Args:
+        algorithms: hashlib algorithm names, e.g. 'sha1', 'sha512'
+
+    Returns:
+        Lowercase names without duplicates, in the given order
+
+    Raises:
+        ValueError: If an algorithm is unavailable or has no fixed digest size
+    """
+    names = tuple(dict.fromkeys(algorithm.strip().lower() for algorithm in algorithms))
+    for name in names:
+        try:
+            usable = hashlib.new(name).digest_size > 0
+        except ValueError:
+            usable = False
+        if not usable:
+            raise ValueError(f"Unsupported hash algorithm '{name}'")
+    return names
+
+
+class JarEntry(NamedTuple):
+    """Location of a single entry inside the archive."""
+    name: str
+    method: int
+    flags: int
+    compressed_size: int
+    file_size: int
+    header_offset: int
+
+
+class JarIndex:
+    """
+    Memory-mapped JAR reader that indexes only the requested entries.
+
+    STORED entries are returned as zero-copy ``memoryview`` slices of the
+    mapping, DEFLATED entries are inflated with ``zlib``. Views returned by
+    ``read`` must not be used after the index is closed. Use ``from_buffer``
+    to index an archive already in memory.
+
+    The first limit violation is remembered, so callers that swallow
+    exceptions from ``read`` can still surface it through ``check()``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        wanted: Iterable[str],
+        deadline: Optional[float] = None,
+        limits: ScanLimits = DEFAULT_LIMITS
+    ):
+        """
+        Open and index a JAR file.
+
+        Args:
+            path: Path to the JAR file
+            wanted: Entry names to record while walking the central directory
+            deadline: Optional ``time.monotonic()`` value after which indexing is aborted
+            limits: Resource limits for this archive
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a readable ZIP archive
+            JarTimeoutError: If the deadline passes while indexing
+            JarLimitError: If the central directory exceeds limits.max_entries
+        """
+        self._init_state(path, deadline, limits)
+
+        with open(self.path, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                raise zipfile.BadZipFile("File is empty")
+
+        self._load(wanted)
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: Union[bytes, memoryview],
+        path: Union[str, Path],
+        wanted: Iterable[str],
+        deadline: Optional[float] = None,
+        limits: ScanLimits = DEFAULT_LIMITS
+    ) -> 'JarIndex':
+        """
+        Index an archive held in memory, such as a JAR embedded in another.
+
+        The buffer is used in place: STORED entries are returned as views of
+        it, so a STORED archive inside a memory-mapped JAR is read without
+        any copy.
+
+        Args:
+            buffer: Archive content; mutable buffers are copied
+            path: Name reported for the archive
+            wanted: Entry names to record while walking the central directory
+            deadline: Optional ``time.monotonic()`` value after which indexing is aborted
+            limits: Resource limits for this archive
+
+        Raises:
+            zipfile.BadZipFile: If the buffer is not a readable ZIP archive
+            JarTimeoutError: If the deadline passes while indexing
+            JarLimitError: If the central directory exceeds limits.max_entries
+        """
+        index = cls.__new__(cls)
+        index._init_state(path, deadline, limits)
+        if not len(buffer):
+            raise zipfile.BadZipFile("File is empty")
+        view = memoryview(buffer).toreadonly()
+        if not isinstance(view.obj, (bytes, mmap.mmap)):
+            # Name lookups hash slices of the view, which needs a hashable
+            # (immutable) underlying object
+            view.release()
+            view = memoryview(bytes(buffer))
+        index._mm = view
+        index._load(wanted)
+        return index
+
+    def _init_state(self, path: Union[str, Path], deadline: Optional[float], limits: ScanLimits) -> None:
+        self.path = Path(path)
+        self.deadline = deadline
+        self.limits = limits
+        self.entries: Dict[str, JarEntry] = {}
+        self.entry_count = 0
+        self.bytes_read = 0
+        self.violation: Optional[JarLimitError] = None
+        self._mm: Optional[Union[mmap.mmap, memoryview]] = None
+        # (start, end, prepended bytes) of the central directory
+        self._central_directory = (0, 0, 0)
+        # Hex digests and fingerprint of the whole archive, computed at most once
+        self._digests: Dict[str, str] = {}
+        self._fingerprint: Optional[int] = None
+
+    def _load(self, wanted: Iterable[str]) -> None:
+        """Index the mapped archive, closing it on failure."""
+        try:
+            self._index({name.encode('utf-8'): name for name in wanted})
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'JarIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def close(self) -> None:
+        """Release the memory mapping (or the view of the buffer)."""
+        if self._mm is not None:
+            try:
+                if isinstance(self._mm, memoryview):
+                    self._mm.release()
+                else:
+                    self._mm.close()
+            except BufferError:
+                # A caller still holds a view; the mapping is released on GC
+                pass
+            self._mm = None
+
+    def digest(self, algorithm: str = 'sha1') -> bytes:
+        """Hash of the whole archive, computed straight from the mapping (see digests)."""
+        return bytes.fromhex(self.digests((algorithm,))[algorithm])
+
+    def digests(self, algorithms: Iterable[str]) -> Dict[str, str]:
+        """
+        Hex digests of the whole archive for several algorithms in one pass.
+
+        The archive is read once, sequentially, in large chunks that are fed
+        to every hash in turn. Digests are remembered, so later calls only
+        read the archive again for algorithms not computed yet.
+
+        Args:
+            algorithms: hashlib algorithm names (see normalize_hash_algorithms)
+
+        Returns:
+            Hex digest by algorithm name
+
+        Raises:
+            JarTimeoutError: If the deadline passes while hashing
+        """
+        if self._mm is None:
+            raise ValueError("Attempt to read from a closed JarIndex")
+        algorithms = tuple(algorithms)
+        hashes = {algorithm: hashlib.new(algorithm) for algorithm in algorithms if algorithm not in self._digests}
+        if not hashes:
+            return {algorithm: self._digests[algorithm] for algorithm in algorithms}
+        if isinstance(self._mm, mmap.mmap) and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(self._mm) as view:
+            for start in range(0, len(view), _HASH_CHUNK):
+                check_deadline(self.deadline)
+                chunk = view[start:start + _HASH_CHUNK]
+                for hash_object in hashes.values():
+                    hash_object.update(chunk)
+                chunk.release()
+        for algorithm, hash_object in hashes.items():
+            self._digests[algorithm] = hash_object.hexdigest()
+        return {algorithm: self._digests[algorithm] for algorithm in algorithms}
+
+    def fingerprint(self) -> int:
+        """
+        CurseForge fingerprint of the whole archive (see curseforge_fingerprint).
+
+        Raises:
+            JarTimeoutError: If the deadline passes while fingerprinting
+        """
+        if self._mm is None:
+            raise ValueError("Attempt to read from a closed JarIndex")
+        if self._fingerprint is None:
+            self._fingerprint = curseforge_fingerprint(self._mm, check=lambda: check_deadline(self.deadline))
+        return self._fingerprint
+
+    def namelist(self) -> List[str]:
+        """Names of the indexed entries."""
+        return list(self.entries)
+
+    def check(self) -> None:
+        """
+        Re-raise the first limit violation, then check the deadline.
+
+        Raises:
+            JarLimitError: If any read so far exceeded a limit
+            JarTimeoutError: If the deadline has passed
+        """
+        if self.violation is not None:
+            raise self.violation
+        check_deadline(self.deadline)
+
+    def _violate(self, limit: str, value: float, maximum: float, entry: Optional[str] = None) -> JarLimitError:
+        """Record and return a limit violation."""
+        error = JarLimitError(limit, value, maximum, entry)
+        if self.violation is None:
+            self.violation = error
+        return error
+
+    def _find_eocd(self) -> int:
+        """Locate the end of central directory record."""
+        mm = self._mm
+        size = len(mm)
+        if size < _EOCD.size:
+            raise zipfile.BadZipFile("File is not a zip file")
+
+        # Fast path: no archive comment
+        start = size - _EOCD.size
+        if mm[start:start + 4] == _EOCD_SIGNATURE:
+            return start
+
+        low = max(0, start - _EOCD_MAX_COMMENT)
+        pos = bytes(mm[low:start]).rfind(_EOCD_SIGNATURE)
+        if pos < 0:
+            raise zipfile.BadZipFile("File is not a zip file")
+        return low + pos
+
+    def _index(self, wanted: Dict[bytes, str]) -> None:
+        """Walk the central directory and record wanted entries."""
+        mm = self._mm
+        max_entries = self.limits.max_entries
+        eocd_pos = self._find_eocd()
+        (_, _, _, _, total_entries, cd_size, cd_offset, _) = _EOCD.unpack_from(mm, eocd_pos)
+
+        # ZIP64 archives store the real values in a separate record
+        locator_pos = eocd_pos - _ZIP64_LOCATOR.size
+        if locator_pos >= 0 and mm[locator_pos:locator_pos + 4] == _ZIP64_LOCATOR_SIGNATURE:
+            # The record sits right before its locator; the stored offset
+            # is not trusted since data may be prepended to the archive
+            zip64_pos = locator_pos - _ZIP64_EOCD.size
+            if zip64_pos < 0 or mm[zip64_pos:zip64_pos + 4] != _ZIP64_EOCD_SIGNATURE:
+                raise zipfile.BadZipFile("Corrupt ZIP64 end of central directory")
+            fields = _ZIP64_EOCD.unpack_from(mm, zip64_pos)
+            total_entries, cd_size, cd_offset = fields[7], fields[8], fields[9]
+            eocd_pos = zip64_pos
+
+        # Reject early on the declared count; the walk below enforces the real one
+        if max_entries is not None and total_entries > max_entries:
+            raise self._violate('max_entries', total_entries, max_entries)
+
+        # Account for data prepended to the archive (e.g. self-extracting stubs)
+        concat = eocd_pos - cd_size - cd_offset
+        if concat < 0:
+            raise zipfile.BadZipFile("Bad central directory offset")
+
+        pos = cd_offset + concat
+        end = pos + cd_size
+        self._central_directory = (pos, end, concat)
+        header_size = _CD_HEADER.size
+        unpack = _CD_HEADER.unpack_from
+        lengths = {len(name) for name in wanted}
+        entries = self.entries
+
+        while pos + header_size <= end:
+            header = unpack(mm, pos)
+            if header[0] != _CD_SIGNATURE:
+                raise zipfile.BadZipFile("Bad magic number for central directory")
+            name_len, extra_len, comment_len = header[10], header[11], header[12]
+            name_start = pos + header_size
+
+            if name_len in lengths:
+                raw_name = mm[name_start:name_start + name_len]
+                name = wanted.get(raw_name)
+                if name is not None:
+                    entries[name] = self._make_entry(name, header, name_start, concat)
+
+            self.entry_count += 1
+            pos = name_start + name_len + extra_len + comment_len
+            if not self.entry_count % _DEADLINE_CHECK_INTERVAL:
+                check_deadline(self.deadline)
+                if max_entries is not None and self.entry_count > max_entries:
+                    raise self._violate('max_entries', self.entry_count, max_entries)
+
+        if max_entries is not None and self.entry_count > max_entries:
+            raise self._violate('max_entries', self.entry_count, max_entries)
+
+    def _make_entry(self, name: str, header: tuple, name_start: int, concat: int) -> JarEntry:
+        """Build the index entry for a central directory record."""
+        compressed_size, file_size, offset = header[8], header[9], header[16]
+        if 0xFFFFFFFF in (compressed_size, file_size, offset):
+            extra_start = name_start + header[10]
+            compressed_size, file_size, offset = self._read_zip64_extra(
+                self._mm[extra_start:extra_start + header[11]],
+                compressed_size, file_size, offset
+            )
+        return JarEntry(
+            name=name,
+            method=header[4],
+            flags=header[3],
+            compressed_size=compressed_size,
+            file_size=file_size,
+            header_offset=offset + concat,
+        )
+
+    def find(self, suffix: str) -> List[str]:
+        """
+        Index every entry whose name ends with suffix.
+
+        This walks the central directory a second time, so it is meant for
+        the occasional JAR that needs more than its metadata entries.
+
+        Returns:
+            Names of the matching entries, in archive order
+
+        Raises:
+            JarTimeoutError: If the deadline passes while walking
+        """
+        if self._mm is None:
+            raise ValueError("Attempt to read from a closed JarIndex")
+        mm = self._mm
+        pos, end, concat = self._central_directory
+        header_size = _CD_HEADER.size
+        unpack = _CD_HEADER.unpack_from
+        raw_suffix = suffix.encode('utf-8')
+        suffix_len = len(raw_suffix)
+        entries = self.entries
+        names = []
+        count = 0
+
+        while pos + header_size <= end:
+            header = unpack(mm, pos)
+            name_len = header[10]
+            name_start = pos + header_size
+            name_end = name_start + name_len
+            if name_len >= suffix_len and mm[name_end - suffix_len:name_end] == raw_suffix:
+                name = str(mm[name_start:name_end], 'utf-8', 'replace')
+                if name not in entries:
+                    entries[name] = self._make_entry(name, header, name_start, concat)
+                names.append(name)
+
+            count += 1
+            pos = name_end + header[11] + header[12]
+            if not count % _DEADLINE_CHECK_INTERVAL:
+                check_deadline(self.deadline)
+        return names
+
+    @staticmethod
+    def _read_zip64_extra(extra: bytes, compressed_size: int, file_size: int, offset: int):
+        """Resolve 0xFFFFFFFF placeholders from the ZIP64 extended information field."""
+        pos = 0
+        while pos + 4 <= len(extra):
+            tag, size = struct.unpack_from('<2H', extra, pos)
+            if tag == _ZIP64_EXTRA_ID:
+                data = extra[pos + 4:pos + 4 + size]
+                values = list(struct.unpack_from(f'<{len(data) // 8}Q', data))
+                if file_size == 0xFFFFFFFF:
+                    file_size = values.pop(0)
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = values.pop(0)
+                if offset == 0xFFFFFFFF:
+                    offset = values.pop(0)
+                break
+            pos += 4 + size
+        return compressed_size, file_size, offset
+
+    def _data_offset(self, entry: JarEntry) -> int:
+        """Resolve the start of an entry's data from its local header."""
+        mm = self._mm
+        header = _LOCAL_HEADER.unpack_from(mm, entry.header_offset)
+        if header[0] != _LOCAL_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad magic number for file header: {entry.name}")
+        return entry.header_offset + _LOCAL_HEADER.size + header[9] + header[10]
+
+    def read(self, name: str, size: Optional[int] = None) -> Union[bytes, memoryview]:
+        """
+        Read an indexed entry.
+
+        Args:
+            name: Entry name
+            size: Only read (at least) the first size bytes of the entry
+
+        Returns:
+            A zero-copy ``memoryview`` for STORED entries, ``bytes`` otherwise
+
+        Raises:
+            KeyError: If the entry was not indexed
+            NotImplementedError: For encrypted entries or unsupported compression
+            JarLimitError: If reading the entry would exceed a limit
+        """
+        entry, start, end = self._locate(name)
+        if entry.method == STORED:
+            if size is not None:
+                end = min(end, start + size)
+            self._account(name, end - start)
+            return memoryview(self._mm)[start:end]
+        if entry.method == DEFLATED:
+            return self._inflate(name, memoryview(self._mm)[start:end], size)
+        raise NotImplementedError(f"Unsupported compression method {entry.method}: {name}")
+
+    def open_nested(self, name: str, wanted: Iterable[str]) -> 'JarIndex':
+        """
+        Open an indexed entry that is itself a JAR, without extracting it to disk.
+
+        STORED archives are indexed in place through a zero-copy view of this
+        one; DEFLATED archives are inflated into memory first, bounded by
+        limits.max_nested_size and limits.max_compression_ratio. The nested
+        index has its own read budget, and its violations (like failing to
+        inflate it) are raised without counting against this archive.
+
+        Args:
+            name: Entry name of the embedded JAR
+            wanted: Entry names to index in the embedded JAR
+
+        Raises:
+            KeyError: If the entry was not indexed
+            zipfile.BadZipFile: If the entry is not a readable ZIP archive
+            JarLimitError: If the embedded JAR exceeds a limit
+        """
+        entry, start, end = self._locate(name)
+        if entry.method == STORED:
+            buffer = memoryview(self._mm)[start:end]
+        elif entry.method == DEFLATED:
+            buffer = self._inflate(name, memoryview(self._mm)[start:end], nested=True)
+        else:
+            raise NotImplementedError(f"Unsupported compression method {entry.method}: {name}")
+        try:
+            return JarIndex.from_buffer(buffer, name, wanted, self.deadline, self.limits)
+        finally:
+            if isinstance(buffer, memoryview):
+                # from_buffer holds its own view
+                buffer.release()
+
+    def _locate(self, name: str) -> Tuple[JarEntry, int, int]:
+        """Resolve an indexed entry and the bounds of its data, checking it can be read."""
+        if self._mm is None:
+            raise ValueError("Attempt to read from a closed JarIndex")
+        if self.violation is not None:
+            raise self.violation
+
+        entry = self.entries[name]
+        if entry.flags & _FLAG_ENCRYPTED:
+            raise NotImplementedError(f"Encrypted entry not supported: {name}")
+
+        start = self._data_offset(entry)
+        end = start + entry.compressed_size
+        if end > len(self._mm):
+            raise zipfile.BadZipFile(f"Truncated file data: {name}")
+        return entry, start, end
+
+    def _budget(self) -> Optional[int]:
+        """Bytes the next entry may produce, or None when unlimited."""
+        limits = self.limits
+        budget = limits.max_entry_size
+        if limits.max_total_bytes is not None:
+            remaining = max(0, limits.max_total_bytes - self.bytes_read)
+            budget = remaining if budget is None else min(budget, remaining)
+        return budget
+
+    def _account(self, name: str, size: int) -> None:
+        """Charge an entry's uncompressed size against the limits."""
+        limits = self.limits
+        if limits.max_entry_size is not None and size > limits.max_entry_size:
+            raise self._violate('max_entry_size', size, limits.max_entry_size, name)
+        self.bytes_read += size
+        if limits.max_total_bytes is not None and self.bytes_read > limits.max_total_bytes:
+            raise self._violate('max_total_bytes', self.bytes_read, limits.max_total_bytes, name)
+
+    def _inflate(self, name: str, data: memoryview, size: Optional[int] = None, nested: bool = False) -> bytes:
+        """
+        Inflate a DEFLATED entry in steps, stopping as soon as a limit is crossed.
+
+        The sizes in the central directory are attacker controlled, so limits
+        are enforced on the bytes zlib actually produces. With ``size``,
+        inflation stops once that many bytes have been produced. Embedded
+        JARs (``nested``) are bounded by limits.max_nested_size instead of
+        the entry and total budgets, and their violations are not recorded.
+        """
+        budget = self.limits.max_nested_size if nested else self._budget()
+        violate = JarLimitError if nested else self._violate
+        max_ratio = self.limits.max_compression_ratio
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        chunks = []
+        produced = 0
+        pos = 0
+        try:
+            while not inflater.eof:
+                if inflater.unconsumed_tail:
+                    pending = inflater.unconsumed_tail
+                elif pos < len(data):
+                    pending = data[pos:pos + _INFLATE_CHUNK]
+                    pos += len(pending)
+                else:
+                    break
+
+                # One byte past the budget is enough to detect the overrun
+                step = _INFLATE_STEP if budget is None else min(_INFLATE_STEP, budget - produced + 1)
+                if size is not None:
+                    step = min(step, size - produced)
+                chunk = inflater.decompress(pending, step)
+                produced += len(chunk)
+                chunks.append(chunk)
+
+                if budget is not None and produced > budget:
+                    if nested:
+                        raise violate('max_nested_size', produced, budget, name)
+                    self._account(name, produced)
+                if max_ratio is not None and produced > _RATIO_GRACE_BYTES:
+                    consumed = pos - len(inflater.unconsumed_tail)
+                    if produced > max_ratio * max(consumed, 1):
+                        raise violate(
+                            'max_compression_ratio', round(produced / max(consumed, 1), 1), max_ratio, name
+                        )
+                check_deadline(self.deadline)
+                if size is not None and produced >= size:
+                    break
+
+            if size is None or produced < size:
+                chunks.append(inflater.flush())
+        finally:
+            data.release()
+
+        content = b''.join(chunks)
+        if not nested:
+            self._account(name, len(content))
+        return content
@@ -0,0 +1,107 @@
+"""
+JSON backend used for mod metadata and JSON output.
+
+Uses ``orjson`` when it is installed, which parses straight from the bytes
+(or memoryview) of a JAR entry without decoding to ``str`` first, and falls
+back to the standard library otherwise. Both backends raise
+``json.JSONDecodeError`` (orjson's error subclasses it).
+"""
+
+import json
+import re
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+
+# Hints that a document uses JSON extensions: comments or trailing commas
+# ("://" is skipped so URLs in strings don't count as comments)
+_LENIENT_HINT = re.compile(rb'(?<!:)//|/\*|,\s*[\]}]')
+# Strings are matched (and kept) so comment markers inside them are ignored
+_LENIENT_TOKEN = re.compile(r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*.*?\*/|,(?=\s*[\]}])', re.DOTALL)
+
+
+def _decode(data: JsonInput) -> str:
+    """Decode input as UTF-8, falling back to Latin-1."""
+    if isinstance(data, str):
+        return data
+    try:
+        return str(data, 'utf-8')
+    except UnicodeDecodeError:
+        return str(data, 'latin-1')
+
+
+def _as_bytes(data: JsonInput) -> Union[bytes, bytearray, memoryview]:
+    return data.encode('utf-8', 'surrogatepass') if isinstance(data, str) else data
+
+
+def _strip_extensions(text: str) -> str:
+    """Remove comments and trailing commas outside of strings."""
+    return _LENIENT_TOKEN.sub(lambda match: match.group(1) or '', text)
+
+
+def loads(data: JsonInput) -> Any:
+    """
+    Parse a JSON document.
+
+    With orjson, documents it rejects but the standard library accepts
+    (NaN, huge integers, Latin-1 text) are re-parsed with the standard
+    library, so both backends accept the same input.
+
+    Args:
+        data: Raw entry content or decoded text
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(_decode(data))
+
+
+def loads_lenient(data: JsonInput) -> Any:
+    """
+    Parse JSON as written by hand in real-world metadata (e.g. mcmod.info).
+
+    Accepts ``//`` and ``/* */`` comments, trailing commas and raw control
+    characters (such as newlines) inside strings. Documents are checked for
+    comments and trailing commas with a single regex search up front, so
+    clean ones go straight to the parser instead of failing and retrying.
+
+    Args:
+        data: Raw entry content or decoded text
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid even with the extensions
+    """
+    if _LENIENT_HINT.search(_as_bytes(data)) is None:
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(_decode(data), strict=False)
+    return json.loads(_strip_extensions(_decode(data)), strict=False)
+
+
+def dumps(obj: Any, indent: Optional[int] = 2) -> str:
+    """
+    Serialize an object to JSON text, keeping non-ASCII characters as-is.
+
+    Args:
+        obj: Object to serialize
+        indent: 2 for pretty-printed output, None for compact output
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
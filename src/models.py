@@ -2,27 +2,120 @@
 Data models for the Modlist Generator.
 """
 
+import sys
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 
+# Fields that can be selected for output, in output order
+MOD_FIELDS = (
+    'name', 'loader', 'version', 'filename', 'mod_id', 'dependencies',
+    'author', 'description', 'mc_versions', 'disabled', 'parent', 'hashes',
+    'fingerprint',
+)
 
-@dataclass(frozen=True)
+# Loader categories counted by ModScanner.census(), in output order
+CENSUS_CATEGORIES = ('fabric', 'quilt', 'forge', 'neoforge', 'legacy_forge', 'unknown')
+
+# Distinct dependency and MC version tuples shared between ModInfo instances,
+# least recently used first out
+INTERNED_TUPLES_MAX = 4096
+
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+    """
+    Validate a field projection.
+    
+    Args:
+        fields: Names from MOD_FIELDS, or None for every field
+    
+    Returns:
+        Frozen set of the names, or None when every field is selected
+    
+    Raises:
+        ValueError: If a name is not a known field
+    """
+    if fields is None:
+        return None
+    fields = frozenset(fields)
+    unknown = fields.difference(MOD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s) {', '.join(sorted(unknown))}, expected any of {', '.join(MOD_FIELDS)}")
+    return None if fields.issuperset(MOD_FIELDS) else fields
+
+
+def intern_string(value: Any) -> Any:
+    """Shared copy of a string (sys.intern); other values are returned unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@lru_cache(maxsize=INTERNED_TUPLES_MAX)
+def _shared_tuple(values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """The first tuple seen equal to values, while it stays in the cache."""
+    return values
+
+
+def intern_tuple(values: Iterable[Any]) -> Tuple[Any, ...]:
+    """
+    Shared tuple of interned strings.
+    
+    The INTERNED_TUPLES_MAX most recently used distinct tuples are shared;
+    older ones are evicted, so long-running processes don't accumulate them.
+    """
+    values = tuple(intern_string(value) for value in values)
+    return _shared_tuple(values) if values else values
+
+
+@dataclass(frozen=True, slots=True)
 class ModInfo:
-    """Immutable data class to hold mod information."""
+    """
+    Immutable data class to hold mod information.
+    
+    Slotted, with dependencies and mc_versions stored as tuples: lists
+    passed in are converted, and their strings interned along with the
+    loader, the only other field with few distinct values, so large scans
+    share one copy of "fabric", "1.20.1" or "fabric-api". Equal tuples are
+    shared too (see intern_tuple). Tuples passed in are stored as they
+    are, which keeps replace() cheap.
+    """
     name: str
     loader: str
     version: str
     filename: str
     mod_id: Optional[str] = None
-    dependencies: List[str] = field(default_factory=list)
+    dependencies: Tuple[str, ...] = ()
     author: Optional[str] = None
     description: Optional[str] = None
-    mc_versions: List[str] = field(default_factory=list)
+    mc_versions: Tuple[str, ...] = ()
     disabled: bool = False
+    # Filename of the JAR this one is embedded in (jar-in-jar), None for top-level JARs
+    parent: Optional[str] = None
+    # Mods embedded in this JAR; None when nested JARs were not scanned
+    nested: Optional[List["ModInfo"]] = None
+    # Hex digests of the JAR file by algorithm ({"sha1": ..., "sha512": ...}, as
+    # in the Modrinth API); None when the scan computed no hashes
+    hashes: Optional[Dict[str, str]] = None
+    # CurseForge fingerprint of the JAR file; None when the scan computed none
+    fingerprint: Optional[int] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary, excluding None values and empty lists."""
+    def __post_init__(self) -> None:
+        for name in _INTERNED_FIELDS:
+            object.__setattr__(self, name, intern_string(getattr(self, name)))
+        for name in _TUPLE_FIELDS:
+            values = getattr(self, name)
+            if type(values) is not tuple:
+                object.__setattr__(self, name, intern_tuple(values))
+    
+    def to_dict(self, nested: bool = False, fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+        """
+        Convert to dictionary, excluding None values and empty lists.
+        
+        Args:
+            nested: Include embedded mods under "nested" (they are listed as
+                separate mods in scan output, so only the cache stores them)
+            fields: Only include these fields (None for all)
+        """
         result = {
             "name": self.name,
             "loader": self.loader,
@@ -41,7 +134,90 @@ class ModInfo:
             result["mc_versions"] = list(self.mc_versions)
         if self.disabled:
             result["disabled"] = True
+        if self.parent:
+            result["parent"] = self.parent
+        if self.hashes:
+            result["hashes"] = dict(self.hashes)
+        if self.fingerprint is not None:
+            result["fingerprint"] = self.fingerprint
+        if nested and self.nested is not None:
+            result["nested"] = [mod.to_dict(nested=True) for mod in self.nested]
+        if fields is not None:
+            result = {key: value for key, value in result.items() if key in fields}
         return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModInfo":
+        """Create a ModInfo from the output of to_dict()."""
+        return cls(
+            name=data["name"],
+            loader=data["loader"],
+            version=data["version"],
+            filename=data["filename"],
+            mod_id=data.get("mod_id"),
+            dependencies=list(data.get("dependencies", ())),
+            author=data.get("author"),
+            description=data.get("description"),
+            mc_versions=list(data.get("mc_versions", ())),
+            disabled=data.get("disabled", False),
+            parent=data.get("parent"),
+            nested=[cls.from_dict(mod) for mod in data["nested"]] if "nested" in data else None,
+            hashes=dict(data["hashes"]) if "hashes" in data else None,
+            fingerprint=data.get("fingerprint"),
+        )
+    
+    def to_tuple(self) -> Tuple:
+        """Convert to a compact positional tuple (cheap to pickle between processes)."""
+        return (
+            self.name,
+            self.loader,
+            self.version,
+            self.filename,
+            self.mod_id,
+            self.dependencies,
+            self.author,
+            self.description,
+            self.mc_versions,
+            self.disabled,
+            self.parent,
+            tuple(mod.to_tuple() for mod in self.nested) if self.nested is not None else None,
+            tuple(self.hashes.items()) if self.hashes is not None else None,
+            self.fingerprint,
+        )
+    
+    @classmethod
+    def from_tuple(cls, data: Tuple) -> "ModInfo":
+        """Create a ModInfo from the output of to_tuple()."""
+        (name, loader, version, filename, mod_id, dependencies,
+         author, description, mc_versions, disabled, parent, nested, hashes,
+         fingerprint) = data
+        return cls(
+            name=name,
+            loader=loader,
+            version=version,
+            filename=filename,
+            mod_id=mod_id,
+            dependencies=list(dependencies),
+            author=author,
+            description=description,
+            mc_versions=list(mc_versions),
+            disabled=disabled,
+            parent=parent,
+            nested=[cls.from_tuple(mod) for mod in nested] if nested is not None else None,
+            hashes=dict(hashes) if hashes is not None else None,
+            fingerprint=fingerprint,
+        )
+    
+    def iter_nested(self) -> Iterator["ModInfo"]:
+        """Yield the embedded mods at every nesting level, depth first."""
+        for mod in self.nested or ():
+            yield mod
+            yield from mod.iter_nested()
+
+
+# ModInfo fields holding few distinct strings, and the sequences stored as tuples
+_INTERNED_FIELDS = ('loader',)
+_TUPLE_FIELDS = ('dependencies', 'mc_versions')
 
 
 @dataclass
@@ -52,16 +228,30 @@ class ScanResult:
     total_files: int = 0
     scan_duration: float = 0.0
     generated_at: Optional[datetime] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cancelled: bool = False
     
-    def to_dict(self, include_errors: bool = True) -> Dict[str, Any]:
-        """Convert scan result to dictionary for JSON output."""
+    def to_dict(self, include_errors: bool = True, fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+        """
+        Convert scan result to dictionary for JSON output.
+        
+        Args:
+            include_errors: Include the errors list
+            fields: Only include these mod fields (None for all)
+        """
         result = {
-            "mods": [mod.to_dict() for mod in self.mods],
+            "mods": [mod.to_dict(fields=fields) for mod in self.mods],
             "total_mods": len(self.mods),
             "total_files_scanned": self.total_files,
             "scan_duration_seconds": round(self.scan_duration, 2),
             "generated_at": self.generated_at.isoformat() if self.generated_at else datetime.now().isoformat(),
         }
+        if self.cancelled:
+            result["cancelled"] = True
+        if self.cache_hits or self.cache_misses:
+            result["cache_hits"] = self.cache_hits
+            result["cache_misses"] = self.cache_misses
         if include_errors and self.errors:
             result["errors"] = self.errors
             result["error_count"] = len(self.errors)
@@ -96,3 +286,83 @@ class ScanResult:
         }
         if by in sort_keys:
             self.mods.sort(key=sort_keys[by], reverse=reverse)
+
+
+@dataclass
+class CensusResult:
+    """Per-loader JAR counts from a census (see ModScanner.census)."""
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(CENSUS_CATEGORIES, 0))
+    # Paths (relative to the scanned folder) of JARs without loader metadata
+    unknown: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    total_files: int = 0
+    scan_duration: float = 0.0
+    generated_at: Optional[datetime] = None
+    cancelled: bool = False
+    
+    def to_dict(self, include_errors: bool = True) -> Dict[str, Any]:
+        """Convert census to dictionary for JSON output."""
+        result = {
+            "counts": dict(self.counts),
+            "unknown": list(self.unknown),
+            "total_files_scanned": self.total_files,
+            "scan_duration_seconds": round(self.scan_duration, 2),
+            "generated_at": self.generated_at.isoformat() if self.generated_at else datetime.now().isoformat(),
+        }
+        if self.cancelled:
+            result["cancelled"] = True
+        if include_errors and self.errors:
+            result["errors"] = self.errors
+            result["error_count"] = len(self.errors)
+        return result
+
+
+@dataclass
+class UpdateCandidate:
+    """Newer catalog version of a scanned mod (see updates.check_updates)."""
+    mod: ModInfo
+    latest_version: str
+    mc_versions: List[str] = field(default_factory=list)
+    url: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary, excluding None values and empty lists."""
+        result = {
+            "name": self.mod.name,
+            "mod_id": self.mod.mod_id,
+            "loader": self.mod.loader,
+            "filename": self.mod.filename,
+            "current_version": self.mod.version,
+            "latest_version": self.latest_version,
+        }
+        if self.mc_versions:
+            result["mc_versions"] = list(self.mc_versions)
+        if self.url:
+            result["url"] = self.url
+        return result
+
+
+@dataclass
+class UpdateReport:
+    """Mods with newer versions in a version catalog."""
+    updates: List[UpdateCandidate] = field(default_factory=list)
+    # Mods found in the catalog without a newer compatible version
+    up_to_date: int = 0
+    # Filenames of mods without a mod ID or absent from the catalog
+    not_found: List[str] = field(default_factory=list)
+    # Filenames of catalog mods whose own version can't be ordered ("Unknown")
+    not_comparable: List[str] = field(default_factory=list)
+    catalog_entries: int = 0
+    generated_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to dictionary for JSON output."""
+        return {
+            "updates": [candidate.to_dict() for candidate in self.updates],
+            "total_updates": len(self.updates),
+            "up_to_date": self.up_to_date,
+            "not_found": list(self.not_found),
+            "not_comparable": list(self.not_comparable),
+            "catalog_entries": self.catalog_entries,
+            "generated_at": self.generated_at.isoformat() if self.generated_at else datetime.now().isoformat(),
+        }
@@ -2,35 +2,226 @@
 Core scanner module with parallel processing support.
 """
 
+import asyncio
+import hashlib
+import math
+import os
+import threading
 import zipfile
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
+import weakref
+from dataclasses import replace
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path, PurePosixPath
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
-from .models import ModInfo, ScanResult
-from .extractors import ALL_EXTRACTORS
+from .cache import ScanCache
+from .filename import parse_filename
+from .hashindex import HashIndex
+from .jarfile import DEFAULT_LIMITS, JarIndex, JarLimitError, ScanLimits, normalize_hash_algorithms
+from .models import CensusResult, ModInfo, ScanResult, normalize_fields
+from .walker import JarFile, walk_jars
+from .extractors import extractor_id, get_extractors, plugin_versions
+from .extractors.context import MANIFEST_FILE, ExtractionContext
 
 logger = logging.getLogger(__name__)
 
+# Archive entries read by _fallback_extraction. Together with the entries
+# declared by the extractors, these are the only ones indexed when walking
+# a JAR's central directory.
+FALLBACK_ENTRIES = (MANIFEST_FILE,)
+
+# Manifest attributes used by _fallback_extraction, in order of preference
+MANIFEST_NAME_ATTRIBUTES = ('Implementation-Title', 'Bundle-Name', 'Automatic-Module-Name')
+MANIFEST_VERSION_ATTRIBUTES = ('Implementation-Version', 'Bundle-Version')
+
+# Census categories by marker entry, in extractor priority order. Only these
+# entries are indexed for a census, and none of them is ever decompressed.
+CENSUS_MARKERS = (
+    ('fabric.mod.json', 'fabric'),
+    ('quilt.mod.json', 'quilt'),
+    ('META-INF/neoforge.mods.toml', 'neoforge'),
+    ('META-INF/mods.toml', 'forge'),
+    ('mcmod.info', 'legacy_forge'),
+)
+CENSUS_ENTRIES = frozenset(entry for entry, _ in CENSUS_MARKERS)
+
+# Execution modes accepted by ModScanner(executor=...)
+EXECUTORS = ('auto', 'thread', 'process')
+
+# 'auto' switches to a process pool once this many files need parsing;
+# below it, process startup costs more than the GIL contention it avoids
+PROCESS_MIN_FILES = 200
+
+# Upper bound on files handed to a worker process per task
+PROCESS_MAX_CHUNK = 32
+
+# Default cap on the on-disk size of JARs submitted but not yet consumed.
+# Together with the task cap this keeps peak memory flat for huge folders.
+DEFAULT_MAX_IN_FLIGHT_BYTES = 256 * 1024 * 1024
+
+# Timeout and limit errors depend on scanner settings and are never cached
+TIMEOUT_ERROR_PREFIX = "Timed out after"
+LIMIT_ERROR_PREFIX = "Resource limit exceeded"
+_UNCACHEABLE_ERROR_PREFIXES = (TIMEOUT_ERROR_PREFIX, LIMIT_ERROR_PREFIX)
+
+# Error of mods described from their file name alone; deep scans retry them
+NO_METADATA_ERROR_PREFIX = "No mod metadata found"
+
+# How often a scan wakes up to check for cancellation and per-file timeouts
+POLL_INTERVAL = 0.1
+
+# Scanner instance owned by each worker process (see _init_process_worker)
+_worker_scanner: Optional['ModScanner'] = None
+
+
+class CancellationToken:
+    """Thread-safe flag for stopping a running scan from another thread."""
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+
+def _init_process_worker(
+    extractors: List,
+    timeout: Optional[float],
+    limits: ScanLimits,
+    nested: bool,
+    fields: Optional[FrozenSet[str]],
+    hashes: Tuple[str, ...],
+    fingerprint: bool,
+    index: Optional[HashIndex]
+) -> None:
+    """Create the per-process scanner used by _process_chunk."""
+    global _worker_scanner
+    _worker_scanner = ModScanner(
+        workers=1, extractors=extractors, timeout=timeout, limits=limits, nested=nested, fields=fields,
+        hashes=hashes, fingerprint=fingerprint, index=index
+    )
+
+
+def _process_chunk(chunk: List[Tuple[str, bool]]) -> List[Tuple[Optional[Tuple], Optional[str]]]:
+    """
+    Extract a chunk of JAR files inside a worker process.
+    
+    Results are sent back as compact tuples rather than pickled dataclasses.
+    """
+    results = []
+    for path, disabled in chunk:
+        mod_info, error = _worker_scanner._extract_single_mod(Path(path), disabled)
+        results.append((mod_info.to_tuple() if mod_info else None, error))
+    return results
+
 
 class ModScanner:
     """Scanner for extracting mod information from JAR files."""
     
-    def __init__(self, workers: int = 4, extractors: Optional[List] = None):
+    def __init__(
+        self,
+        workers: int = 4,
+        extractors: Optional[List] = None,
+        cache: Optional[ScanCache] = None,
+        executor: str = 'auto',
+        max_in_flight: Optional[int] = None,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+        timeout: Optional[float] = None,
+        limits: ScanLimits = DEFAULT_LIMITS,
+        deep: bool = False,
+        nested: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        hashes: Iterable[str] = (),
+        fingerprint: bool = False,
+        index: Optional[HashIndex] = None
+    ):
         """
         Initialize the scanner.
         
         Args:
             workers: Number of parallel workers for processing
-            extractors: List of extractors to use (defaults to all)
+            extractors: List of extractors to use (defaults to all registered ones,
+                including entry point plugins)
+            cache: Optional persistent cache; unchanged files are served from it
+            executor: 'thread', 'process', or 'auto' to pick based on file count
+            max_in_flight: Maximum tasks submitted but not yet consumed (default: 4x workers)
+            max_in_flight_bytes: Maximum combined size of the JARs in flight
+            timeout: Per-file deadline in seconds; slower files are recorded as timeout errors
+            limits: Resource limits for each JAR; violating files are recorded as limit errors
+            deep: Also scan class files of JARs no metadata extractor could handle
+            nested: Also scan JARs embedded in mods (jar-in-jar), reported as
+                separate mods with parent set; depth is bounded by limits.max_nested_depth
+            fields: ModInfo fields to extract (see models.MOD_FIELDS; None for all).
+                Extractors skip the work for optional fields not listed; name,
+                loader, version, filename and mod_id are always extracted
+            hashes: hashlib algorithms (e.g. 'sha1', 'sha512') to digest every JAR
+                file with, in the same pass that reads it; stored in ModInfo.hashes
+            fingerprint: Compute the CurseForge fingerprint of every JAR file
+                (ModInfo.fingerprint); vectorized when NumPy is installed
+            index: Hash index identifying JARs that have no metadata by their
+                content, consulted before the manifest and file name fallbacks
+        
+        Raises:
+            ValueError: If the executor, a field or a hash algorithm is unknown
         """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {', '.join(EXECUTORS)}")
+        
         self.workers = workers
-        self.extractors = extractors or ALL_EXTRACTORS
+        self.cache = cache
+        self.executor = executor
+        self.max_in_flight = max_in_flight or workers * 4
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.timeout = timeout
+        self.limits = limits
+        self.deep = deep
+        self.nested = nested
+        self.fields = normalize_fields(fields)
+        self.hashes = normalize_hash_algorithms(hashes)
+        self.fingerprint = fingerprint
+        self.index = index
+        self.extractors = list(extractors) if extractors else get_extractors()
+        if deep:
+            self.extractors += get_extractors(deep=True)
         # Sort by priority
         self.extractors = sorted(self.extractors, key=lambda e: e.priority)
+        
+        # Dispatch index: metadata path -> extractors owning it, in priority order
+        self._dispatch: Dict[str, List] = {}
+        self._probe_always = [e for e in self.extractors if not getattr(e, 'METADATA_FILES', ())]
+        for extractor in self.extractors:
+            for path in getattr(extractor, 'METADATA_FILES', ()):
+                self._dispatch.setdefault(path, []).append(extractor)
+        self.metadata_entries: FrozenSet[str] = frozenset(self._dispatch).union(
+            FALLBACK_ENTRIES,
+            *(getattr(e, 'AUXILIARY_FILES', ()) for e in self.extractors),
+            *(getattr(e, 'NESTED_FILES', ()) for e in self.extractors if nested)
+        )
+        # Candidate lists by the set of metadata entries present; few distinct sets occur
+        self._routes: Dict[FrozenSet[str], Tuple] = {}
+        # Cached results only serve scans with the same configuration
+        self._cache_config = self._config_fingerprint() if cache is not None else ''
+        
+        # Shared by every async scan on this scanner (see aiter_scan)
+        self._async_executor: Optional[ThreadPoolExecutor] = None
+        # Semaphores bind to the loop that first waits on them, so there is one per loop
+        self._async_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_lock = threading.Lock()
+        
+        # Embedded JAR results by (content hash, depth), reset for every scan
+        self._nested_results: Dict[Tuple[bytes, int], Optional[ModInfo]] = {}
+        self._nested_lock = threading.Lock()
     
     def _extract_single_mod(self, jar_path: Path, disabled: bool = False) -> Tuple[Optional[ModInfo], Optional[str]]:
         """
@@ -43,103 +234,239 @@ class ModScanner:
         Returns:
             Tuple of (ModInfo or None, error message or None)
         """
+        deadline = time.monotonic() + self.timeout if self.timeout else None
         try:
-            with zipfile.ZipFile(jar_path, 'r') as jar:
-                files = jar.namelist()
-                
-                # Try each extractor in priority order
-                for extractor in self.extractors:
-                    if extractor.can_extract(jar, files):
-                        logger.debug(f"Using {extractor.name} extractor for {jar_path.name}")
-                        mod_info = extractor.extract(jar, jar_path, files)
-                        if mod_info:
-                            # Add disabled flag if needed
-                            if disabled:
-                                mod_info = ModInfo(
-                                    name=mod_info.name,
-                                    loader=mod_info.loader,
-                                    version=mod_info.version,
-                                    filename=mod_info.filename,
-                                    mod_id=mod_info.mod_id,
-                                    dependencies=mod_info.dependencies,
-                                    author=mod_info.author,
-                                    description=mod_info.description,
-                                    mc_versions=mod_info.mc_versions,
-                                    disabled=True
-                                )
-                            return (mod_info, None)
+            with JarIndex(jar_path, self.metadata_entries, deadline=deadline, limits=self.limits) as jar:
+                mod_info, error = self._extract_from_index(jar, jar_path, disabled)
+                if mod_info is not None and self.hashes:
+                    # Hashed from the mapping already open for extraction
+                    mod_info = replace(mod_info, hashes=jar.digests(self.hashes))
+                if mod_info is not None and self.fingerprint:
+                    mod_info = replace(mod_info, fingerprint=jar.fingerprint())
+                return (mod_info, error)
                 
+        except Exception as e:
+            return (None, self._jar_error(jar_path, e))
+    
+    def _classify_single(self, jar_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Classify a JAR by the marker entries in its central directory.
+        
+        Nothing is decompressed. A mods.toml alone can't tell Forge from
+        NeoForge (which used it up to 1.20.4), so the file name decides.
+        
+        Returns:
+            Tuple of (census category or None, error message or None)
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        try:
+            with JarIndex(jar_path, CENSUS_ENTRIES, deadline=deadline, limits=self.limits) as jar:
+                for entry, category in CENSUS_MARKERS:
+                    if entry in jar:
+                        if category == 'forge' and parse_filename(jar_path.name).loader == 'neoforge':
+                            category = 'neoforge'
+                        return (category, None)
+                return ('unknown', None)
+        
+        except Exception as e:
+            return (None, self._jar_error(jar_path, e))
+    
+    def _jar_error(self, jar_path: Path, exc: Exception) -> str:
+        """Log and describe an error that stopped a JAR from being read."""
+        if isinstance(exc, TimeoutError):
+            return self._timeout_error(jar_path)
+        if isinstance(exc, zipfile.BadZipFile):
+            error = f"Invalid or corrupted JAR file: {jar_path.name}"
+        elif isinstance(exc, JarLimitError):
+            error = f"{LIMIT_ERROR_PREFIX} in {jar_path.name}: {exc}"
+        else:
+            error = f"Failed to process {jar_path.name}: {str(exc)}"
+        logger.error(error)
+        return error
+    
+    def _extract_from_index(
+        self,
+        jar: JarIndex,
+        jar_path: Path,
+        disabled: bool = False,
+        depth: int = 0
+    ) -> Tuple[Optional[ModInfo], Optional[str]]:
+        """
+        Extract mod info from an open JAR (a file, or a JAR embedded in one).
+        
+        Args:
+            jar: Index of the JAR's metadata entries
+            jar_path: Path (or entry name) of the JAR
+            disabled: Whether this is a .jar.disabled file
+            depth: Nesting level of the JAR (0 for files on disk)
+        
+        Returns:
+            Tuple of (ModInfo or None, error message or None)
+        """
+        with ExtractionContext(jar, jar_path, self.fields) as ctx:
+            mod_info = None
+            # Try the extractors owning the JAR's metadata in priority order
+            for extractor in self._route(ctx.files):
+                if extractor.can_extract(ctx):
+                    logger.debug(f"Using {extractor.name} extractor for {jar_path.name}")
+                    mod_info = extractor.extract(ctx)
+                    # Extractors swallow read errors, so re-raise limit violations here
+                    jar.check()
+                    if mod_info:
+                        break
+            
+            if mod_info is None and self.index is not None:
+                mod_info = self._index_lookup(jar, jar_path, depth)
+                extractor = None
+            
+            if mod_info is None:
                 # Fallback: try alternative extraction methods
-                mod_info = self._fallback_extraction(jar, jar_path, files)
-                if mod_info:
-                    if disabled:
-                        mod_info = ModInfo(
-                            name=mod_info.name,
-                            loader=mod_info.loader,
-                            version=mod_info.version,
-                            filename=mod_info.filename,
-                            mod_id=mod_info.mod_id,
-                            dependencies=mod_info.dependencies,
-                            author=mod_info.author,
-                            description=mod_info.description,
-                            mc_versions=mod_info.mc_versions,
-                            disabled=True
-                        )
-                    return (mod_info, None)
-                
+                mod_info = self._fallback_extraction(ctx)
+                jar.check()
+                extractor = None
+            
+            if mod_info is None:
                 # No metadata found - create basic info from filename
-                logger.warning(f"No mod metadata found in {jar_path.name}")
+                error = f"{NO_METADATA_ERROR_PREFIX} in {jar_path.name}"
+                if depth:
+                    logger.debug(error)
+                else:
+                    logger.warning(error)
+                parsed = parse_filename(jar_path.name)
                 return (
                     ModInfo(
-                        name=jar_path.stem,
-                        loader='unknown',
-                        version='Unknown',
+                        name=parsed.name,
+                        loader=parsed.loader or 'unknown',
+                        version=parsed.version or 'Unknown',
                         filename=jar_path.name,
-                        disabled=disabled
+                        mc_versions=[parsed.mc_version] if parsed.mc_version else [],
+                        disabled=disabled,
+                        nested=[] if self.nested else None
                     ),
-                    f"No mod metadata found in {jar_path.name}"
+                    error
                 )
-                
-        except zipfile.BadZipFile:
-            error = f"Invalid or corrupted JAR file: {jar_path.name}"
-            logger.error(error)
-            return (None, error)
-        except Exception as e:
-            error = f"Failed to process {jar_path.name}: {str(e)}"
-            logger.error(error)
-            return (None, error)
+            
+            # Add disabled flag if needed
+            if disabled:
+                mod_info = replace(mod_info, disabled=True)
+            
+            if self.nested:
+                nested_jars = getattr(extractor, 'nested_jars', None)
+                entries = nested_jars(ctx) if nested_jars is not None else []
+                mod_info = replace(mod_info, nested=self._extract_nested(jar, mod_info, entries, depth + 1))
+            return (mod_info, None)
     
-    def _fallback_extraction(self, jar: zipfile.ZipFile, jar_path: Path, files: List[str]) -> Optional[ModInfo]:
+    def _extract_nested(self, jar: JarIndex, parent: ModInfo, entries: List[str], depth: int) -> List[ModInfo]:
+        """
+        Extract the mods embedded in a JAR, straight from its buffer.
+        
+        Embedded JARs are identified by content hash, so a library shipped
+        by several mods is only parsed once per scan. JARs nested deeper
+        than limits.max_nested_depth are skipped, and failures (corrupt or
+        oversized archives) are logged without failing the parent.
+        
+        Args:
+            jar: Open index of the parent JAR
+            parent: Mod extracted from the parent JAR
+            entries: Entry names of the embedded JARs
+            depth: Nesting level of the embedded JARs
+        
+        Returns:
+            Embedded mods, each with parent set to the parent's filename
+        """
+        max_depth = self.limits.max_nested_depth
+        if not entries or (max_depth is not None and depth > max_depth):
+            return []
+        
+        # Embedded JARs are not metadata entries, so index them on demand
+        missing = [entry for entry in entries if entry not in jar]
+        if missing:
+            jar.find('.jar')
+        
+        mods = []
+        for entry in dict.fromkeys(entries):
+            if entry not in jar:
+                logger.debug(f"Embedded JAR {entry} not found in {parent.filename}")
+                continue
+            try:
+                mod_info = self._extract_embedded(jar, entry, depth)
+            except TimeoutError:
+                raise
+            except (zipfile.BadZipFile, JarLimitError, NotImplementedError) as e:
+                logger.warning(f"Skipping embedded JAR {entry} in {parent.filename}: {e}")
+                continue
+            if mod_info is not None:
+                mods.append(self._adopt(mod_info, parent.filename, parent.disabled))
+        return mods
+    
+    def _extract_embedded(self, jar: JarIndex, entry: str, depth: int) -> Optional[ModInfo]:
+        """Extract one embedded JAR, reusing the result for identical content."""
+        with jar.open_nested(entry, self.metadata_entries) as nested_jar:
+            key = (nested_jar.digest(), depth)
+            with self._nested_lock:
+                if key in self._nested_results:
+                    return self._nested_results[key]
+            mod_info, _ = self._extract_from_index(nested_jar, Path(PurePosixPath(entry).name), depth=depth)
+        with self._nested_lock:
+            self._nested_results[key] = mod_info
+        return mod_info
+    
+    @staticmethod
+    def _adopt(mod_info: ModInfo, parent: str, disabled: bool) -> ModInfo:
+        """Copy of an embedded mod attached to its parent (disabled along with it)."""
+        nested = mod_info.nested
+        if disabled and nested:
+            nested = [ModScanner._adopt(mod, mod.parent, True) for mod in nested]
+        return replace(mod_info, parent=parent, disabled=disabled, nested=nested)
+    
+    def _route(self, files: List[str]) -> Tuple:
+        """Get the extractors to offer a JAR containing the given metadata entries."""
+        key = frozenset(files)
+        route = self._routes.get(key)
+        if route is None:
+            owners = set(self._probe_always)
+            for name in key:
+                owners.update(self._dispatch.get(name, ()))
+            route = tuple(e for e in self.extractors if e in owners)
+            self._routes[key] = route
+        return route
+    
+    def _index_lookup(self, jar: JarIndex, jar_path: Path, depth: int = 0) -> Optional[ModInfo]:
+        """Identify a JAR without metadata by its content hashes."""
+        # Files on disk are digested for the scan's hashes in the same pass
+        entry = self.index.identify(jar, () if depth else self.hashes)
+        if entry is None:
+            return None
+        logger.debug(f"Identified {jar_path.name} as {entry.name} {entry.version} from the hash index")
+        parsed = parse_filename(jar_path.name)
+        return ModInfo(
+            name=entry.name,
+            loader=entry.loader,
+            version=entry.version,
+            filename=jar_path.name,
+            mod_id=entry.project_id or None,
+            mc_versions=[parsed.mc_version] if parsed.mc_version else []
+        )
+    
+    def _fallback_extraction(self, ctx: ExtractionContext) -> Optional[ModInfo]:
         """Fallback extraction using manifest or filename parsing."""
-        # Try manifest
-        if 'META-INF/MANIFEST.MF' in files:
+        jar_path = ctx.jar_path
+        # Try manifest (already parsed if an extractor looked at it)
+        if MANIFEST_FILE in ctx:
             try:
-                with jar.open('META-INF/MANIFEST.MF') as f:
-                    content = f.read().decode('utf-8', errors='replace')
-                    name = None
-                    version = None
-                    
-                    for line in content.split('\n'):
-                        line = line.strip()
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            key = key.strip()
-                            value = value.strip()
-                            
-                            if key in ['Implementation-Title', 'Bundle-Name', 'Automatic-Module-Name']:
-                                name = value
-                            elif key in ['Implementation-Version', 'Bundle-Version']:
-                                version = value
-                    
-                    if name and version:
-                        # Try to detect loader from filename
-                        loader = self._detect_loader_from_filename(jar_path.name)
-                        return ModInfo(
-                            name=name,
-                            loader=loader,
-                            version=version,
-                            filename=jar_path.name
-                        )
+                attributes = ctx.manifest()
+                name = next((attributes[key] for key in MANIFEST_NAME_ATTRIBUTES if attributes.get(key)), None)
+                version = next((attributes[key] for key in MANIFEST_VERSION_ATTRIBUTES if attributes.get(key)), None)
+                
+                if name and version:
+                    # Try to detect loader from filename
+                    loader = self._detect_loader_from_filename(jar_path.name)
+                    return ModInfo(
+                        name=name,
+                        loader=loader,
+                        version=version,
+                        filename=jar_path.name
+                    )
             except Exception as e:
                 logger.debug(f"Manifest extraction failed for {jar_path.name}: {e}")
         
@@ -147,18 +474,314 @@ class ModScanner:
     
     def _detect_loader_from_filename(self, filename: str) -> str:
         """Detect loader type from filename hints."""
-        filename_lower = filename.lower()
+        return parse_filename(filename).loader or 'unknown'
+    
+    def _resolve_executor(self, file_count: int) -> str:
+        """Pick the execution mode for a batch of files."""
+        if self.executor != 'auto':
+            return self.executor
+        if self.workers > 1 and file_count >= PROCESS_MIN_FILES and (os.cpu_count() or 1) > 1:
+            return 'process'
+        return 'thread'
+    
+    def _unexpected_error(self, jar_path: Path, exc: Exception) -> str:
+        error = f"Unexpected error processing {jar_path.name}: {str(exc)}"
+        logger.error(error)
+        return error
+    
+    def _timeout_error(self, jar_path: Path) -> str:
+        error = f"{TIMEOUT_ERROR_PREFIX} {self.timeout:g}s processing {jar_path.name}"
+        logger.error(error)
+        return error
+    
+    @staticmethod
+    def _file_weight(jar_file: JarFile) -> int:
+        """Bytes a file counts against the in-flight budget."""
+        return jar_file.stat.st_size if jar_file.stat is not None else 0
+    
+    def _iter_windowed(
+        self,
+        executor: Executor,
+        items: Iterable[Any],
+        submit: Callable[[Executor, Any], Future],
+        weight: Callable[[Any], int],
+        cancel_token: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[Tuple[Any, Optional[Future]]]:
+        """
+        Submit work through a bounded window, refilling it as futures complete.
+        
+        At most max_in_flight tasks and max_in_flight_bytes of input are
+        outstanding at any time (a single oversized item is still admitted
+        when nothing else is in flight). Unsubmitted work is never queued,
+        and closing the iterator cancels whatever has not started yet.
         
-        if 'fabric' in filename_lower:
-            return 'fabric'
-        elif 'neoforge' in filename_lower:
-            return 'neoforge'
-        elif 'forge' in filename_lower:
-            return 'forge'
-        elif 'quilt' in filename_lower:
-            return 'quilt'
+        Once cancel_token is cancelled no more work is submitted and the
+        iterator returns without waiting for running tasks. Tasks running
+        longer than timeout seconds are abandoned.
         
-        return 'unknown'
+        Yields:
+            Tuple of (item, completed future), or (item, None) for a timed out task
+        """
+        items = iter(items)
+        in_flight = {}
+        in_flight_bytes = 0
+        started = {}
+        poll = POLL_INTERVAL if (cancel_token is not None or timeout) else None
+        next_item = next(items, None)
+        
+        try:
+            while True:
+                if cancel_token is not None and cancel_token.cancelled:
+                    return
+                
+                while next_item is not None and len(in_flight) < self.max_in_flight:
+                    item_bytes = weight(next_item)
+                    if in_flight and in_flight_bytes + item_bytes > self.max_in_flight_bytes:
+                        break
+                    in_flight[submit(executor, next_item)] = (next_item, item_bytes)
+                    in_flight_bytes += item_bytes
+                    next_item = next(items, None)
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, item_bytes = in_flight.pop(future)
+                    in_flight_bytes -= item_bytes
+                    started.pop(future, None)
+                    yield (item, future)
+                
+                if timeout:
+                    # Deadlines run from when a worker picks the task up
+                    now = time.monotonic()
+                    for future in list(in_flight):
+                        if future not in started:
+                            if future.running():
+                                started[future] = now
+                        elif now - started[future] > timeout:
+                            item, item_bytes = in_flight.pop(future)
+                            in_flight_bytes -= item_bytes
+                            del started[future]
+                            yield (item, None)
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    def _iter_thread_results(self, jar_files: List[JarFile], cancel_token: Optional[CancellationToken] = None):
+        """
+        Extract files on a thread pool.
+        
+        Yields:
+            Tuple of (JarFile, ModInfo or None, error or None, cacheable) as files complete
+        """
+        def submit(executor: Executor, jar_file: JarFile) -> Future:
+            return executor.submit(self._extract_single_mod, jar_file.path, jar_file.disabled)
+        
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for jar_file, future in self._iter_windowed(
+                executor, jar_files, submit, self._file_weight, cancel_token, self.timeout
+            ):
+                if future is None:
+                    yield (jar_file, None, self._timeout_error(jar_file.path), False)
+                    continue
+                try:
+                    mod_info, error = future.result()
+                except Exception as e:
+                    yield (jar_file, None, self._unexpected_error(jar_file.path, e), False)
+                    continue
+                yield (jar_file, mod_info, error, True)
+        finally:
+            # Don't block on abandoned (timed out or cancelled) work
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _iter_process_results(self, jar_files: List[JarFile], cancel_token: Optional[CancellationToken] = None):
+        """
+        Extract files on a process pool, several files per task.
+        
+        Yields:
+            Tuple of (JarFile, ModInfo or None, error or None, cacheable) as chunks complete
+        """
+        chunk_size = max(1, min(PROCESS_MAX_CHUNK, math.ceil(len(jar_files) / (self.workers * 4))))
+        chunks = (jar_files[i:i + chunk_size] for i in range(0, len(jar_files), chunk_size))
+        
+        def submit(executor: Executor, chunk: List[JarFile]) -> Future:
+            return executor.submit(
+                _process_chunk,
+                [(str(jar_file.path), jar_file.disabled) for jar_file in chunk]
+            )
+        
+        def weight(chunk: List[JarFile]) -> int:
+            return sum(self._file_weight(jar_file) for jar_file in chunk)
+        
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_process_worker,
+            initargs=(self.extractors, self.timeout, self.limits, self.nested, self.fields, self.hashes,
+                      self.fingerprint, self.index)
+        )
+        try:
+            # Timeouts are enforced inside the workers; the pool marks queued
+            # tasks as running, so the parent can't tell when a file started
+            for chunk, future in self._iter_windowed(executor, chunks, submit, weight, cancel_token):
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    for jar_file in chunk:
+                        yield (jar_file, None, self._unexpected_error(jar_file.path, e), False)
+                    continue
+                for jar_file, (mod_tuple, error) in zip(chunk, outcomes):
+                    mod_info = ModInfo.from_tuple(mod_tuple) if mod_tuple else None
+                    yield (jar_file, mod_info, error, True)
+        finally:
+            # shutdown() drops the executor's process table, so grab it first
+            processes = list((getattr(executor, '_processes', None) or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            if cancel_token is not None and cancel_token.cancelled:
+                # Workers still parsing abandoned JARs would otherwise block interpreter exit
+                for process in processes:
+                    process.terminate()
+    
+    def _find_jar_files(
+        self,
+        folder_path: Path,
+        recursive: bool,
+        exclude_patterns: Optional[List[str]],
+        include_disabled: bool,
+        max_depth: Optional[int] = None
+    ) -> List[JarFile]:
+        """Find JAR files to scan (both active and disabled) in a single traversal."""
+        if not folder_path.exists():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+        
+        if not folder_path.is_dir():
+            raise ValueError(f"Path is not a directory: {folder_path}")
+        
+        return list(walk_jars(
+            folder_path,
+            recursive=recursive,
+            exclude_patterns=exclude_patterns,
+            include_disabled=include_disabled,
+            max_depth=max_depth
+        ))
+    
+    def iter_scan(
+        self,
+        folder_path: Path,
+        recursive: bool = False,
+        exclude_patterns: Optional[List[str]] = None,
+        include_disabled: bool = False,
+        progress_callback=None,
+        summary: Optional[ScanResult] = None,
+        max_depth: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[Tuple[Optional[ModInfo], Optional[str]]]:
+        """
+        Scan a folder, yielding each file's result as soon as it is available.
+        
+        Nothing is accumulated, so memory stays constant regardless of the
+        number of files and callers can start consuming results immediately.
+        
+        Args:
+            folder_path: Path to the folder to scan
+            recursive: Whether to scan subdirectories
+            exclude_patterns: List of glob patterns to exclude
+            include_disabled: Whether to include .jar.disabled files
+            progress_callback: Optional callback for progress updates (current, total, filename)
+            summary: Optional ScanResult that receives the summary stats (total files,
+                duration, cache hits/misses); mods and errors are not appended to it
+            max_depth: Maximum subdirectory depth for recursive scans (None for unlimited)
+            cancel_token: Optional token that stops the scan early; files still in
+                flight are abandoned and summary.cancelled is set
+        
+        Yields:
+            Tuple of (ModInfo or None, error message or None) per file, followed
+            by (ModInfo, None) for each embedded mod when nested JARs are scanned
+        """
+        if summary is None:
+            summary = ScanResult()
+        
+        all_files = self._find_jar_files(folder_path, recursive, exclude_patterns, include_disabled, max_depth)
+        summary.total_files = len(all_files)
+        
+        if not all_files:
+            logger.warning(f"No JAR files found in {folder_path}")
+            return
+        
+        logger.info(f"Found {len(all_files)} JAR file(s). Processing with {self.workers} workers...")
+        
+        start_time = time.time()
+        completed = 0
+        mod_count = 0
+        self._nested_results.clear()
+        
+        try:
+            # Serve unchanged files from the cache
+            pending = []
+            for jar_file in all_files:
+                if cancel_token is not None and cancel_token.cancelled:
+                    break
+                if self.cache is None or jar_file.stat is None:
+                    pending.append(jar_file)
+                    continue
+                
+                cached = self._cache_lookup(jar_file)
+                if cached is None:
+                    summary.cache_misses += 1
+                    pending.append(jar_file)
+                    continue
+                
+                summary.cache_hits += 1
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, len(all_files), jar_file.path.name)
+                if cached[0]:
+                    mod_count += 1
+                yield from self._with_nested(*cached)
+            
+            # Process remaining files in parallel
+            executor_kind = self._resolve_executor(len(pending))
+            if pending:
+                logger.debug(f"Extracting {len(pending)} file(s) on a {executor_kind} pool")
+            if cancel_token is not None and cancel_token.cancelled:
+                pending = []
+            if executor_kind == 'process':
+                outcomes = self._iter_process_results(pending, cancel_token)
+            else:
+                outcomes = self._iter_thread_results(pending, cancel_token)
+            
+            for jar_file, mod_info, error, cacheable in outcomes:
+                if cancel_token is not None and cancel_token.cancelled:
+                    outcomes.close()
+                    break
+                completed += 1
+                
+                if progress_callback:
+                    progress_callback(completed, len(all_files), jar_file.path.name)
+                
+                if error and error.startswith(_UNCACHEABLE_ERROR_PREFIXES):
+                    cacheable = False
+                if cacheable and self.cache is not None and jar_file.stat is not None:
+                    self.cache.store(jar_file.path, jar_file.stat, mod_info, error, self.fields, self._cache_config)
+                if mod_info:
+                    mod_count += 1
+                yield from self._with_nested(mod_info, error)
+        
+        finally:
+            if self.cache is not None:
+                self.cache.flush()
+            
+            summary.scan_duration = time.time() - start_time
+            summary.generated_at = datetime.now()
+            if cancel_token is not None and cancel_token.cancelled:
+                summary.cancelled = True
+                logger.info(f"Scan cancelled after {completed} of {len(all_files)} file(s)")
+            
+            logger.info(f"Scan completed in {summary.scan_duration:.2f}s. Found {mod_count} mods.")
+            if self.cache is not None:
+                logger.info(f"Cache: {summary.cache_hits} hit(s), {summary.cache_misses} miss(es)")
     
     def scan_folder(
         self,
@@ -166,7 +789,9 @@ class ModScanner:
         recursive: bool = False,
         exclude_patterns: Optional[List[str]] = None,
         include_disabled: bool = False,
-        progress_callback=None
+        progress_callback=None,
+        max_depth: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> ScanResult:
         """
         Scan a folder for mod JAR files.
@@ -177,78 +802,370 @@ class ModScanner:
             exclude_patterns: List of glob patterns to exclude
             include_disabled: Whether to include .jar.disabled files
             progress_callback: Optional callback for progress updates (current, total, filename)
+            max_depth: Maximum subdirectory depth for recursive scans (None for unlimited)
+            cancel_token: Optional token that stops the scan early, keeping partial results
         
         Returns:
             ScanResult containing all extracted mod information
         """
-        if not folder_path.exists():
-            raise FileNotFoundError(f"Folder not found: {folder_path}")
+        result = ScanResult()
+        for mod_info, error in self.iter_scan(
+            folder_path,
+            recursive=recursive,
+            exclude_patterns=exclude_patterns,
+            include_disabled=include_disabled,
+            progress_callback=progress_callback,
+            summary=result,
+            max_depth=max_depth,
+            cancel_token=cancel_token
+        ):
+            if mod_info:
+                result.mods.append(mod_info)
+            if error:
+                result.errors.append(error)
         
-        if not folder_path.is_dir():
-            raise ValueError(f"Path is not a directory: {folder_path}")
+        return result
+    
+    def census(
+        self,
+        folder_path: Path,
+        recursive: bool = False,
+        exclude_patterns: Optional[List[str]] = None,
+        include_disabled: bool = False,
+        progress_callback=None,
+        max_depth: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> CensusResult:
+        """
+        Count JARs per loader from their entry names alone.
         
-        # Find JAR files (both active and disabled)
-        if recursive:
-            jar_files = list(folder_path.rglob("*.jar"))
-            if include_disabled:
-                disabled_files = list(folder_path.rglob("*.jar.disabled"))
-        else:
-            jar_files = list(folder_path.glob("*.jar"))
-            if include_disabled:
-                disabled_files = list(folder_path.glob("*.jar.disabled"))
+        Only each JAR's central directory is read: files are classified by
+        marker entries like fabric.mod.json or META-INF/neoforge.mods.toml
+        (see CENSUS_MARKERS), and nothing is decompressed or parsed. Files
+        are classified on a thread pool; the cache is not used.
         
-        # Track which files are disabled
-        disabled_set = set(disabled_files) if include_disabled else set()
-        all_files = jar_files + (disabled_files if include_disabled else [])
+        Args:
+            folder_path: Path to the folder to scan
+            recursive: Whether to scan subdirectories
+            exclude_patterns: List of glob patterns to exclude
+            include_disabled: Whether to include .jar.disabled files
+            progress_callback: Optional callback for progress updates (current, total, filename)
+            max_depth: Maximum subdirectory depth for recursive scans (None for unlimited)
+            cancel_token: Optional token that stops the census early, keeping partial counts
         
-        # Apply exclusions
-        if exclude_patterns:
-            for pattern in exclude_patterns:
-                excluded = set(folder_path.glob(pattern) if not recursive else folder_path.rglob(pattern))
-                all_files = [f for f in all_files if f not in excluded]
+        Returns:
+            CensusResult with counts per loader and the JARs of unknown loader
+        """
+        result = CensusResult()
+        all_files = self._find_jar_files(folder_path, recursive, exclude_patterns, include_disabled, max_depth)
+        result.total_files = len(all_files)
         
         if not all_files:
             logger.warning(f"No JAR files found in {folder_path}")
-            return ScanResult(total_files=0)
+            return result
         
-        logger.info(f"Found {len(all_files)} JAR file(s). Processing with {self.workers} workers...")
+        logger.info(f"Found {len(all_files)} JAR file(s). Classifying with {self.workers} workers...")
         
-        result = ScanResult(total_files=len(all_files))
-        start_time = time.time()
+        def submit(executor: Executor, jar_file: JarFile) -> Future:
+            return executor.submit(self._classify_single, jar_file.path)
         
-        # Process files in parallel
+        start_time = time.time()
         completed = 0
-        with ThreadPoolExecutor(max_workers=self.workers) as executor:
-            future_to_jar = {
-                executor.submit(
-                    self._extract_single_mod, 
-                    jar_path, 
-                    jar_path in disabled_set
-                ): jar_path
-                for jar_path in all_files
-            }
-            
-            for future in as_completed(future_to_jar):
-                jar_path = future_to_jar[future]
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            # Central directories are small, so file sizes don't count against the window
+            for jar_file, future in self._iter_windowed(
+                executor, all_files, submit, lambda jar_file: 0, cancel_token, self.timeout
+            ):
                 completed += 1
-                
                 if progress_callback:
-                    progress_callback(completed, len(all_files), jar_path.name)
+                    progress_callback(completed, len(all_files), jar_file.path.name)
                 
-                try:
-                    mod_info, error = future.result()
-                    if mod_info:
-                        result.mods.append(mod_info)
-                    if error:
-                        result.errors.append(error)
-                except Exception as e:
-                    error = f"Unexpected error processing {jar_path.name}: {str(e)}"
-                    logger.error(error)
+                if future is None:
+                    category, error = None, self._timeout_error(jar_file.path)
+                else:
+                    try:
+                        category, error = future.result()
+                    except Exception as e:
+                        category, error = None, self._unexpected_error(jar_file.path, e)
+                
+                if error:
                     result.errors.append(error)
+                if category:
+                    result.counts[category] += 1
+                    if category == 'unknown':
+                        result.unknown.append(jar_file.path.relative_to(folder_path).as_posix())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+            result.scan_duration = time.time() - start_time
+            result.generated_at = datetime.now()
+            if cancel_token is not None and cancel_token.cancelled:
+                result.cancelled = True
+                logger.info(f"Census cancelled after {completed} of {len(all_files)} file(s)")
+            logger.info(f"Census completed in {result.scan_duration:.2f}s.")
+        
+        return result
+    
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool shared by all async scans, creating it on first use."""
+        with self._async_lock:
+            if self._async_executor is None:
+                self._async_executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='modscanner'
+                )
+            return self._async_executor
+    
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore shared by all async scans on the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.workers)
+            return semaphore
+    
+    def _config_fingerprint(self) -> str:
+        """
+        Digest of the settings that change what an unchanged JAR yields.
+        
+        Covers the extractors and the installed plugin versions, the
+        resource limits, deep and nested scans, and the hash index file.
+        Fields, hashes and the fingerprint are checked per result instead
+        (see _cache_lookup), so narrower scans still hit wider results.
+        """
+        parts = [extractor_id(e) for e in self.extractors]
+        parts.extend(plugin_versions())
+        parts.append(repr(self.limits))
+        parts.append(f"deep={self.deep} nested={self.nested}")
+        if self.index is not None:
+            try:
+                st = self.index.path.stat()
+                parts.append(f"index={self.index.path.resolve()} {st.st_size} {st.st_mtime_ns}")
+            except OSError:
+                parts.append(f"index={self.index.path}")
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+    
+    def _cache_lookup(self, jar_file: JarFile) -> Optional[Tuple[Optional[ModInfo], Optional[str]]]:
+        """
+        Look up a cached result stored with the same configuration.
         
-        result.scan_duration = time.time() - start_time
-        result.generated_at = datetime.now()
+        Results extracted with a narrower field projection, or without every
+        requested hash or the fingerprint, are misses.
+        """
+        cached = self.cache.lookup(jar_file.path, jar_file.stat, self.fields, self._cache_config)
+        if cached is None or cached[0] is None:
+            return cached
+        mod_info, error = cached
+        if self.hashes and not set(self.hashes).issubset(mod_info.hashes or ()):
+            return None
+        if self.fingerprint and mod_info.fingerprint is None:
+            return None
+        # Only report the hashes and fingerprint this scan asked for
+        if mod_info.hashes and len(mod_info.hashes) != len(self.hashes):
+            hashes = {algorithm: mod_info.hashes[algorithm] for algorithm in self.hashes}
+            mod_info = replace(mod_info, hashes=hashes or None)
+        if mod_info.fingerprint is not None and not self.fingerprint:
+            mod_info = replace(mod_info, fingerprint=None)
+        return (mod_info, error)
+    
+    def _with_nested(
+        self,
+        mod_info: Optional[ModInfo],
+        error: Optional[str]
+    ) -> Iterator[Tuple[Optional[ModInfo], Optional[str]]]:
+        """A file's result followed by its embedded mods when nested JARs are scanned."""
+        yield (mod_info, error)
+        if self.nested and mod_info is not None:
+            for nested in mod_info.iter_nested():
+                yield (nested, None)
+    
+    def _extract_with_cache(self, jar_file: JarFile) -> Tuple[Optional[ModInfo], Optional[str], Optional[bool]]:
+        """
+        Extract a single file, consulting the cache first.
+        
+        Returns:
+            Tuple of (ModInfo or None, error or None, cache hit or None when uncached)
+        """
+        use_cache = self.cache is not None and jar_file.stat is not None
+        if use_cache:
+            cached = self._cache_lookup(jar_file)
+            if cached is not None:
+                return (cached[0], cached[1], True)
         
-        logger.info(f"Scan completed in {result.scan_duration:.2f}s. Found {len(result.mods)} mods.")
+        mod_info, error = self._extract_single_mod(jar_file.path, jar_file.disabled)
+        if use_cache and not (error and error.startswith(_UNCACHEABLE_ERROR_PREFIXES)):
+            self.cache.store(jar_file.path, jar_file.stat, mod_info, error, self.fields, self._cache_config)
+        return (mod_info, error, False if use_cache else None)
+    
+    async def _extract_async(self, jar_file: JarFile):
+        """Run a single extraction on the shared executor, bounded by the shared semaphore."""
+        loop = asyncio.get_running_loop()
+        async with self._get_async_semaphore():
+            try:
+                outcome = await loop.run_in_executor(
+                    self._get_async_executor(),
+                    self._extract_with_cache,
+                    jar_file
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                outcome = (None, self._unexpected_error(jar_file.path, e), None)
+        return (jar_file, outcome)
+    
+    async def aiter_scan(
+        self,
+        folder_path: Path,
+        recursive: bool = False,
+        exclude_patterns: Optional[List[str]] = None,
+        include_disabled: bool = False,
+        progress_callback=None,
+        summary: Optional[ScanResult] = None,
+        concurrency: Optional[int] = None,
+        max_depth: Optional[int] = None
+    ) -> AsyncIterator[Tuple[Optional[ModInfo], Optional[str]]]:
+        """
+        Async variant of iter_scan for use inside an event loop.
+        
+        Directory listing, cache access and parsing run on a thread pool shared
+        by every async scan on this scanner, and a semaphore shared by the scans
+        on each event loop caps the number of extractions running at once, so
+        many concurrent scans can share one loop, and the scanner can be reused
+        across asyncio.run() calls. Cancelling the consuming task cancels all
+        outstanding work for this scan.
+        
+        Args:
+            folder_path: Path to the folder to scan
+            recursive: Whether to scan subdirectories
+            exclude_patterns: List of glob patterns to exclude
+            include_disabled: Whether to include .jar.disabled files
+            progress_callback: Optional callback for progress updates (current, total, filename)
+            summary: Optional ScanResult that receives the summary stats
+            concurrency: Maximum files in flight for this scan (default: 2x workers)
+            max_depth: Maximum subdirectory depth for recursive scans (None for unlimited)
+        
+        Yields:
+            Tuple of (ModInfo or None, error message or None) per file, followed
+            by (ModInfo, None) for each embedded mod when nested JARs are scanned
+        """
+        loop = asyncio.get_running_loop()
+        if summary is None:
+            summary = ScanResult()
+        
+        all_files = await loop.run_in_executor(
+            self._get_async_executor(),
+            self._find_jar_files,
+            folder_path,
+            recursive,
+            exclude_patterns,
+            include_disabled,
+            max_depth
+        )
+        summary.total_files = len(all_files)
+        
+        if not all_files:
+            logger.warning(f"No JAR files found in {folder_path}")
+            return
+        
+        logger.info(f"Found {len(all_files)} JAR file(s). Processing with {self.workers} workers...")
+        
+        limit = max(1, concurrency or self.workers * 2)
+        self._nested_results.clear()
+        start_time = time.time()
+        completed = 0
+        mod_count = 0
+        files = iter(all_files)
+        exhausted = False
+        in_flight = set()
+        
+        try:
+            while True:
+                # Top up the window before waiting for the next completion
+                while not exhausted and len(in_flight) < limit:
+                    jar_file = next(files, None)
+                    if jar_file is None:
+                        exhausted = True
+                        break
+                    in_flight.add(asyncio.ensure_future(self._extract_async(jar_file)))
+                
+                if not in_flight:
+                    break
+                
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    jar_file, (mod_info, error, cache_hit) = task.result()
+                    completed += 1
+                    if cache_hit is True:
+                        summary.cache_hits += 1
+                    elif cache_hit is False:
+                        summary.cache_misses += 1
+                    
+                    if progress_callback:
+                        progress_callback(completed, len(all_files), jar_file.path.name)
+                    if mod_info:
+                        mod_count += 1
+                    for outcome in self._with_nested(mod_info, error):
+                        yield outcome
+        
+        finally:
+            for task in in_flight:
+                task.cancel()
+            
+            if self.cache is not None:
+                await asyncio.shield(loop.run_in_executor(self._get_async_executor(), self.cache.flush))
+            
+            summary.scan_duration = time.time() - start_time
+            summary.generated_at = datetime.now()
+            logger.info(f"Scan completed in {summary.scan_duration:.2f}s. Found {mod_count} mods.")
+    
+    async def scan_folder_async(
+        self,
+        folder_path: Path,
+        recursive: bool = False,
+        exclude_patterns: Optional[List[str]] = None,
+        include_disabled: bool = False,
+        progress_callback=None,
+        concurrency: Optional[int] = None,
+        max_depth: Optional[int] = None
+    ) -> ScanResult:
+        """
+        Async variant of scan_folder.
+        
+        Args:
+            folder_path: Path to the folder to scan
+            recursive: Whether to scan subdirectories
+            exclude_patterns: List of glob patterns to exclude
+            include_disabled: Whether to include .jar.disabled files
+            progress_callback: Optional callback for progress updates (current, total, filename)
+            concurrency: Maximum files in flight for this scan (default: 2x workers)
+            max_depth: Maximum subdirectory depth for recursive scans (None for unlimited)
+        
+        Returns:
+            ScanResult containing all extracted mod information
+        """
+        result = ScanResult()
+        async for mod_info, error in self.aiter_scan(
+            folder_path,
+            recursive=recursive,
+            exclude_patterns=exclude_patterns,
+            include_disabled=include_disabled,
+            progress_callback=progress_callback,
+            summary=result,
+            concurrency=concurrency,
+            max_depth=max_depth
+        ):
+            if mod_info:
+                result.mods.append(mod_info)
+            if error:
+                result.errors.append(error)
         
         return result
+    
+    def close(self) -> None:
+        """Shut down the thread pool used by async scans."""
+        with self._async_lock:
+            if self._async_executor is not None:
+                self._async_executor.shutdown(wait=False, cancel_futures=True)
+                self._async_executor = None
@@ -0,0 +1,177 @@
+"""
+Offline update check against a local version catalog.
+
+The catalog lists published versions of mods, one entry per version, in
+any format read_dump accepts (JSON Lines, a JSON array or {"mods": [...]})::
+
+    {"mod_id": "sodium", "version": "0.5.11", "loaders": ["fabric"],
+     "mc_versions": ["1.20.1"], "url": "https://..."}
+
+"project_id" stands in for a missing "mod_id", "loader" for "loaders" and
+"game_versions" (as in the Modrinth API) for "mc_versions".
+
+Scanned mods are hash joined with the catalog on mod ID: the scanned mods
+form the hash table and the catalog is streamed past it once, so memory
+stays proportional to the modlist and time linear in the catalog size.
+"""
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .hashindex import read_dump
+from .models import ModInfo, UpdateCandidate, UpdateReport
+from .versions import VersionKey, is_comparable, version_key
+
+logger = logging.getLogger(__name__)
+
+# Distinct mod mc_versions tuples memoized by _release_lines
+RELEASE_LINES_CACHE_SIZE = 1024
+
+
+def _strings(value: Any) -> Tuple[str, ...]:
+    """A string or list of strings from a catalog entry as a tuple."""
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, list):
+        return tuple(item for item in value if isinstance(item, str))
+    return ()
+
+
+def _release_line(version: str) -> str:
+    """The major.minor release line of a Minecraft version ("1.20.4" -> "1.20")."""
+    return '.'.join(version.split('.')[:2])
+
+
+@lru_cache(maxsize=RELEASE_LINES_CACHE_SIZE)
+def _release_lines(mc_versions: Tuple[str, ...]) -> Dict[str, Optional[VersionKey]]:
+    """
+    The Minecraft versions a mod accepts, by release line.
+
+    mc_versions as parsed from the mod's constraint (see parse_mc_versions)
+    hold the declared versions plus the major.minor prefix of each, so
+    ">=1.20.1" gives ("1.20", "1.20.1"). A prefix that only comes from a
+    longer declared version is not a version the mod declares: the mod
+    accepts that line from the declared version on. A major.minor version
+    declared on its own ("[1.20,1.21)") or a wildcard ("1.20.x", as read
+    from file names) accepts its whole line.
+
+    Returns:
+        The lowest accepted version key of each release line, None for
+        whole lines
+    """
+    lines: Dict[str, Optional[VersionKey]] = {}
+    for version in mc_versions:
+        line = _release_line(version)
+        if version[len(line) + 1:].isdigit():
+            key = version_key(version)
+            if line not in lines or key < lines[line]:
+                lines[line] = key
+    for version in mc_versions:
+        line = _release_line(version)
+        if not version[len(line) + 1:].isdigit() and line not in lines:
+            lines[line] = None
+    return lines
+
+
+def _compatible(mod: ModInfo, loaders: Tuple[str, ...], mc_versions: Tuple[str, ...]) -> bool:
+    """
+    Whether a catalog version runs on the mod's loader and Minecraft version.
+
+    A catalog Minecraft version matches if it is on a release line the mod
+    accepts and not older than the mod's lowest declared version on that
+    line (see _release_lines): a mod for ">=1.20.1" matches 1.20.4, but
+    not 1.20. Missing information on either side doesn't rule a version out.
+    """
+    if loaders and mod.loader != 'unknown' and mod.loader not in loaders:
+        return False
+    if mc_versions and mod.mc_versions:
+        lines = _release_lines(mod.mc_versions)
+        for version in mc_versions:
+            line = _release_line(version)
+            if line in lines and (lines[line] is None or version_key(version) >= lines[line]):
+                return True
+        return False
+    return True
+
+
+def check_updates(mods: Iterable[ModInfo], catalog: Iterable[Mapping[str, Any]]) -> UpdateReport:
+    """
+    Find the newest compatible catalog version of each mod, if newer than its own.
+
+    Args:
+        mods: Scanned mods (e.g. ScanResult.mods)
+        catalog: Catalog entries (see the module docstring)
+
+    Returns:
+        UpdateReport with one candidate per outdated mod, in modlist order;
+        mods whose own version can't be ordered (see is_comparable) are
+        listed as not comparable instead
+    """
+    # Build side: the modlist, by mod ID
+    by_id: Dict[str, List[int]] = {}
+    mods = list(mods)
+    not_found = []
+    for position, mod in enumerate(mods):
+        if mod.mod_id:
+            by_id.setdefault(mod.mod_id, []).append(position)
+        else:
+            not_found.append(mod.filename)
+
+    # Probe side: the catalog, streamed once
+    current: Dict[int, VersionKey] = {}
+    best: Dict[int, Tuple[VersionKey, str, Tuple[str, ...], Optional[str]]] = {}
+    matched = set()
+    not_comparable = set()
+    entries = 0
+    for entry in catalog:
+        entries += 1
+        positions = by_id.get(entry.get('mod_id') or entry.get('project_id'))
+        version = entry.get('version')
+        if positions is None or not isinstance(version, str) or not is_comparable(version):
+            continue
+        loaders = _strings(entry.get('loaders', entry.get('loader')))
+        mc_versions = _strings(entry.get('mc_versions', entry.get('game_versions')))
+        key = version_key(version)
+        for position in positions:
+            matched.add(position)
+            mod = mods[position]
+            if not _compatible(mod, loaders, mc_versions):
+                continue
+            if position in not_comparable:
+                continue
+            if position not in current:
+                if not is_comparable(mod.version):
+                    not_comparable.add(position)
+                    continue
+                current[position] = version_key(mod.version)
+            if key > current[position] and (position not in best or key > best[position][0]):
+                best[position] = (key, version, mc_versions, entry.get('url'))
+
+    report = UpdateReport(catalog_entries=entries, generated_at=datetime.now())
+    for position, mod in enumerate(mods):
+        if position in best:
+            _, version, mc_versions, url = best[position]
+            report.updates.append(UpdateCandidate(mod, version, list(mc_versions), url))
+        elif position in not_comparable:
+            report.not_comparable.append(mod.filename)
+        elif position in matched:
+            report.up_to_date += 1
+        elif mod.mod_id:
+            not_found.append(mod.filename)
+    report.not_found = not_found
+    logger.info(f"{len(report.updates)} update(s) found in {entries} catalog entries")
+    return report
+
+
+def check_updates_from_file(mods: Iterable[ModInfo], path: Union[str, Path]) -> UpdateReport:
+    """
+    Check mods for updates against a catalog file.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON
+    """
+    return check_updates(mods, read_dump(path))
@@ -0,0 +1,94 @@
+"""
+Ordering of mod version strings.
+
+Mod versions follow Maven or semver conventions, often loosely:
+``0.5.8+mc1.20.1``, ``1.21.1-19.22.0.315``, ``2.0.0-beta.3``, ``4.2-SNAPSHOT``.
+``version_key`` orders them the way Maven's ComparableVersion does for
+the common cases: numbers compare numerically, trailing zeros don't count
+(``1.0 == 1``), pre-release qualifiers sort before the release
+(alpha < beta < milestone < rc < snapshot < release < sp), and unknown
+qualifiers sort after the release, alphabetically. Semver build metadata
+(after '+') is ignored.
+"""
+
+import re
+from functools import lru_cache
+from typing import Tuple
+
+# Distinct version strings memoized by version_key
+VERSION_CACHE_SIZE = 8192
+
+# Qualifier ranks below the release, and aliases of the release itself
+_PRE_RELEASE = {
+    'alpha': 0, 'a': 0,
+    'beta': 1, 'b': 1,
+    'milestone': 2, 'm': 2,
+    'rc': 3, 'cr': 3, 'pre': 3,
+    'snapshot': 4,
+}
+_RELEASE = frozenset({'', 'ga', 'final', 'release'})
+_SERVICE_PACK = 'sp'
+
+_TOKEN = re.compile(r'\d+|[^\W\d_]+')
+# Unresolved build placeholder, as in "${file.jarVersion}"
+_PLACEHOLDER = re.compile(r'\$\{[^}]*\}')
+
+# Item kinds, in order; the release sentinel ends every key
+_QUALIFIER, _END, _WORD, _NUMBER = range(4)
+_RELEASE_END = (_END, 0, '')
+
+VersionKey = Tuple[Tuple[int, int, str], ...]
+
+
+@lru_cache(maxsize=VERSION_CACHE_SIZE)
+def version_key(version: str) -> VersionKey:
+    """
+    Sort key of a version string (see the module docstring for the ordering).
+
+    Args:
+        version: Version string, with or without a leading 'v'
+
+    Returns:
+        Tuple comparable with the keys of other versions
+    """
+    version = version.strip().lower().split('+', 1)[0]
+    if version[:1] == 'v' and version[1:2].isdigit():
+        version = version[1:]
+
+    items = []
+    for token in _TOKEN.findall(version):
+        if token.isdigit():
+            items.append((_NUMBER, int(token), ''))
+            continue
+        # Trailing zeros before a qualifier don't count ("1.0-rc1" == "1-rc1")
+        while items and items[-1] == (_NUMBER, 0, ''):
+            items.pop()
+        if token in _RELEASE:
+            continue
+        if token in _PRE_RELEASE:
+            items.append((_QUALIFIER, _PRE_RELEASE[token], ''))
+        elif token == _SERVICE_PACK:
+            items.append((_WORD, 0, ''))
+        else:
+            items.append((_WORD, 1, token))
+    while items and items[-1] == (_NUMBER, 0, ''):
+        items.pop()
+    items.append(_RELEASE_END)
+    return tuple(items)
+
+
+def is_comparable(version: str) -> bool:
+    """
+    Whether a version string can be ordered against others.
+
+    Versions without any number ("Unknown") or with an unresolved build
+    placeholder ("${file.jarVersion}") say nothing about their age, and
+    their keys would sort below every real version.
+    """
+    return not _PLACEHOLDER.search(version) and any(char.isdigit() for char in version)
+
+
+def compare_versions(a: str, b: str) -> int:
+    """Compare two version strings: negative if a < b, 0 if equal, positive if a > b."""
+    key_a, key_b = version_key(a), version_key(b)
+    return (key_a > key_b) - (key_a < key_b)
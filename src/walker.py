@@ -0,0 +1,172 @@
+"""
+Single-pass directory walker for finding mod JAR files.
+"""
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+JAR_SUFFIX = '.jar'
+DISABLED_SUFFIX = '.jar.disabled'
+
+
+class JarFile(NamedTuple):
+    """A JAR file found by the walker."""
+    path: Path
+    disabled: bool
+    stat: Optional[os.stat_result] = None
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a glob pattern to a regex where '*' and '?' do not cross '/'."""
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                parts.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**':
+                parts.append('.*')
+                i += 2
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2 if pattern[i + 1:i + 2] in ('!', ']') else i + 1)
+            if end < 0:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+def compile_excludes(patterns: Optional[List[str]], recursive: bool = False) -> Optional[Callable[[str], bool]]:
+    """
+    Compile exclude globs into a single matcher.
+
+    Patterns are matched against the path relative to the scanned folder. As
+    with ``Path.rglob``, recursive scans also match the pattern against the
+    trailing components of the path, so ``*-sources.jar`` excludes matching
+    files at any depth.
+
+    Returns:
+        A function taking a relative POSIX path, or None when there are no patterns
+    """
+    if not patterns:
+        return None
+
+    prefix = '(?:.*/)?' if recursive else ''
+    combined = '|'.join(f"(?:{_glob_to_regex(p.replace(os.sep, '/'))})" for p in patterns)
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    regex = re.compile(f"{prefix}(?:{combined})", flags)
+    return lambda rel_path: regex.fullmatch(rel_path) is not None
+
+
+def walk_jars(
+    root: Path,
+    recursive: bool = False,
+    exclude_patterns: Optional[List[str]] = None,
+    include_disabled: bool = False,
+    max_depth: Optional[int] = None
+) -> Iterator[JarFile]:
+    """
+    Find active (and optionally disabled) JAR files in a single traversal.
+
+    Excluded directories are pruned before descending, symlinked directories
+    are followed at most once, and the stat result from each directory entry
+    is kept so later stages don't stat the file again. Directories are
+    identified by a full stat: on Windows, DirEntry.stat() reports zero
+    inodes. Loop detection is skipped where even that has no inode.
+
+    Args:
+        root: Folder to scan
+        recursive: Whether to descend into subdirectories
+        exclude_patterns: Glob patterns (relative to root) to skip
+        include_disabled: Whether to include .jar.disabled files
+        max_depth: Maximum subdirectory depth to descend into (None for unlimited)
+
+    Yields:
+        JarFile for each matching file
+    """
+    excluded = compile_excludes(exclude_patterns, recursive)
+    normcase = os.path.normcase
+    visited = set()
+
+    try:
+        root_stat = root.stat()
+        if root_stat.st_ino:
+            visited.add((root_stat.st_dev, root_stat.st_ino))
+    except OSError:
+        pass
+
+    # Stack of (directory, relative prefix, depth)
+    stack = [(str(root), '', 0)]
+    while stack:
+        directory, prefix, depth = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                if not recursive or (max_depth is not None and depth >= max_depth):
+                    continue
+                if excluded and excluded(rel_path):
+                    continue
+                try:
+                    st = os.stat(entry.path)
+                except OSError:
+                    continue
+                if st.st_ino:
+                    key = (st.st_dev, st.st_ino)
+                    if key in visited:
+                        logger.debug(f"Skipping already visited directory (symlink loop?): {entry.path}")
+                        continue
+                    visited.add(key)
+                subdirs.append((entry.path, rel_path + '/', depth + 1))
+                continue
+
+            name = normcase(entry.name)
+            if name.endswith(JAR_SUFFIX):
+                disabled = False
+            elif include_disabled and name.endswith(DISABLED_SUFFIX):
+                disabled = True
+            else:
+                continue
+
+            if excluded and excluded(rel_path):
+                continue
+
+            try:
+                st = entry.stat()
+            except OSError:
+                st = None
+            yield JarFile(Path(entry.path), disabled, st)
+
+        # Reversed so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
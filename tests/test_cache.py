@@ -0,0 +1,83 @@
+"""
+Tests of the persistent scan cache.
+"""
+
+import json
+import sqlite3
+import zipfile
+
+import pytest
+
+from src.cache import CACHE_FILENAME, COMMIT_BATCH, ScanCache
+from src.jarfile import ScanLimits
+from src.models import ModInfo
+from src.scanner import ModScanner
+
+
+@pytest.fixture
+def mods(tmp_path):
+    folder = tmp_path / 'mods'
+    folder.mkdir()
+    with zipfile.ZipFile(folder / 'example-1.0.jar', 'w') as jar:
+        jar.writestr('fabric.mod.json', json.dumps({'id': 'example', 'name': 'Example', 'version': '1.0'}))
+    return folder
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ScanCache(tmp_path / 'cache')
+    yield cache
+    cache.close()
+
+
+def _scan(folder, cache, **kwargs):
+    return ModScanner(workers=1, executor='thread', cache=cache, **kwargs).scan_folder(folder)
+
+
+def test_unchanged_files_are_served_from_the_cache(mods, cache):
+    first = _scan(mods, cache)
+    second = _scan(mods, cache)
+    assert (first.cache_hits, first.cache_misses) == (0, 1)
+    assert (second.cache_hits, second.cache_misses) == (1, 0)
+    assert [mod.to_dict() for mod in second.mods] == [mod.to_dict() for mod in first.mods]
+
+
+@pytest.mark.parametrize('settings', [
+    {'limits': ScanLimits(max_nested_depth=1)},
+    {'deep': True},
+    {'nested': True},
+])
+def test_other_scanner_settings_miss(mods, cache, settings):
+    _scan(mods, cache)
+    result = _scan(mods, cache, **settings)
+    assert (result.cache_hits, result.cache_misses) == (0, 1)
+    # Both configurations keep their own entry
+    assert _scan(mods, cache).cache_hits == 1
+    assert _scan(mods, cache, **settings).cache_hits == 1
+
+
+def test_stores_are_committed_in_batches(tmp_path, mods, cache):
+    jar = mods / 'example-1.0.jar'
+    stat = jar.stat()
+    mod = ModInfo(name='Example', loader='fabric', version='1.0', filename=jar.name)
+    reader = sqlite3.connect(str(tmp_path / 'cache' / CACHE_FILENAME))
+    try:
+        for i in range(COMMIT_BATCH):
+            cache.store(mods / f'{i}.jar', stat, mod, None)
+        assert reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == COMMIT_BATCH
+        assert reader.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    finally:
+        reader.close()
+
+
+def test_other_writers_are_not_blocked_until_flush(tmp_path, mods, cache):
+    jar = mods / 'example-1.0.jar'
+    mod = ModInfo(name='Example', loader='fabric', version='1.0', filename=jar.name)
+    for i in range(COMMIT_BATCH):
+        cache.store(mods / f'{i}.jar', jar.stat(), mod, None)
+    other = sqlite3.connect(str(tmp_path / 'cache' / CACHE_FILENAME), timeout=0.1)
+    try:
+        other.execute("DELETE FROM entries WHERE path LIKE '%0.jar'")
+        other.commit()
+    finally:
+        other.close()
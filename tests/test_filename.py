@@ -0,0 +1,38 @@
+"""
+Tests of the JAR file name parser.
+"""
+
+import pytest
+
+from src.filename import ParsedFilename, parse_filename
+
+# File name -> (name, loader, mod version, MC version)
+CASES = [
+    ('sodium-fabric-0.5.8+mc1.20.1.jar', ('sodium', 'fabric', '0.5.8', '1.20.1')),
+    ('AdvancedAE-1.4.5-1.21.1.jar', ('AdvancedAE', None, '1.4.5', '1.21.1')),
+    ('jei-1.21.1-neoforge-19.22.0.315.jar', ('jei', 'neoforge', '19.22.0.315', '1.21.1')),
+    ('appleskin-fabric-mc1.20.1-2.5.1.jar', ('appleskin', 'fabric', '2.5.1', '1.20.1')),
+    ('fabric-api-0.92.2+1.20.1.jar', ('fabric-api', 'fabric', '0.92.2', '1.20.1')),
+    ('iris-1.7.0+mc1.20.1.jar', ('iris', None, '1.7.0', '1.20.1')),
+    ('geckolib-neoforge-1.21.1-4.7.jar', ('geckolib', 'neoforge', '4.7', '1.21.1')),
+    ('journeymap-1.20.1-5.10.0-forge.jar', ('journeymap', 'forge', '5.10.0', '1.20.1')),
+    ('waystones-forge-1.20-14.1.3.jar', ('waystones', 'forge', '14.1.3', '1.20')),
+    ('Xaeros_Minimap_24.0.0_Forge_1.20.jar', ('Xaeros_Minimap', 'forge', '24.0.0', '1.20')),
+    ('mod-1.21.1neoforge-2.0.jar', ('mod', 'neoforge', '2.0', '1.21.1')),
+    ('mod-1.21.1.neoforge-2.0.jar', ('mod', 'neoforge', '2.0', '1.21.1')),
+    ('cloth-config-11.1.118-fabric.jar', ('cloth-config', 'fabric', '11.1.118', None)),
+    ('rubidium-0.7.1.jar', ('rubidium', None, '0.7.1', None)),
+    ('rubidium-0.7.1.jar.disabled', ('rubidium', None, '0.7.1', None)),
+    # A Minecraft version followed by the mod version, with letter suffixes
+    ('create-1.20.1-0.5.1.f.jar', ('create', None, '0.5.1.f', '1.20.1')),
+    ('create-1.20.1-0.5.1f.jar', ('create', None, '0.5.1f', '1.20.1')),
+    ('create-1.19.2-0.5.1.c.jar', ('create', None, '0.5.1.c', '1.19.2')),
+    ('mod-1.12-1.20.1.jar', ('mod', None, '1.20.1', '1.12')),
+    ('create-1.20.x-0.5.1.f.jar', ('create', None, '0.5.1.f', '1.20.x')),
+    ('examplemod.jar', ('examplemod', None, None, None)),
+]
+
+
+@pytest.mark.parametrize('filename, expected', CASES, ids=[filename for filename, _ in CASES])
+def test_parse_filename(filename, expected):
+    assert parse_filename(filename) == ParsedFilename(*expected)
@@ -0,0 +1,103 @@
+"""
+Tests of CurseForge fingerprints.
+
+Both mixing paths are checked against a straightforward MurmurHash2
+(seed 1) of the content with whitespace removed, and against recorded
+fingerprints.
+"""
+
+import random
+
+import pytest
+
+from src.fingerprint import WHITESPACE, curseforge_fingerprint, load_numpy
+
+_M = 0x5bd1e995
+_MASK = 0xFFFFFFFF
+
+PATHS = [
+    pytest.param(False, id='python'),
+    pytest.param(True, id='numpy', marks=pytest.mark.skipif(load_numpy() is None, reason="NumPy is not installed")),
+]
+
+KNOWN = [
+    (b'', 1540447798),
+    (b'a', 626045324),
+    (b'ab', 1692487918),
+    (b'abc', 1621425345),
+    (b'abcd', 3376380438),
+    (b'hello world', 2824650221),
+    (b' \t\r\n', 1540447798),
+    (b'fabric.mod.json\n{\n  "id": "example"\n}\n', 1264838587),
+    (bytes(range(256)), 2094645347),
+]
+
+
+def _murmur2(data: bytes, seed: int = 1) -> int:
+    """Reference MurmurHash2, one block at a time."""
+    length = len(data)
+    h = (seed ^ length) & _MASK
+    end = length - length % 4
+    for i in range(0, end, 4):
+        k = int.from_bytes(data[i:i + 4], 'little')
+        k = (k * _M) & _MASK
+        k ^= k >> 24
+        k = (k * _M) & _MASK
+        h = ((h * _M) & _MASK) ^ k
+    tail = data[end:]
+    if tail:
+        for i, byte in enumerate(tail):
+            h ^= byte << (8 * i)
+        h = (h * _M) & _MASK
+    h ^= h >> 13
+    h = (h * _M) & _MASK
+    h ^= h >> 15
+    return h
+
+
+def _reference(data: bytes) -> int:
+    return _murmur2(data.translate(None, WHITESPACE))
+
+
+def _random_bytes(rng: random.Random, size: int, whitespace: bool) -> bytes:
+    alphabet = bytes(range(256)) if whitespace else bytes(set(range(256)) - set(WHITESPACE))
+    return bytes(rng.choice(alphabet) for _ in range(size))
+
+
+@pytest.mark.parametrize('use_numpy', PATHS)
+@pytest.mark.parametrize('data, fingerprint', KNOWN)
+def test_known_fingerprints(data, fingerprint, use_numpy):
+    assert _reference(data) == fingerprint
+    assert curseforge_fingerprint(data, use_numpy=use_numpy) == fingerprint
+
+
+@pytest.mark.parametrize('use_numpy', PATHS)
+@pytest.mark.parametrize('whitespace', [False, True], ids=['plain', 'whitespace'])
+@pytest.mark.parametrize('remainder', range(8))
+def test_remainders_match_reference(remainder, whitespace, use_numpy):
+    rng = random.Random(remainder)
+    for blocks in (0, 1, 7, 64):
+        data = _random_bytes(rng, blocks * 4 + remainder, whitespace)
+        assert curseforge_fingerprint(data, use_numpy=use_numpy) == _reference(data)
+
+
+@pytest.mark.parametrize('use_numpy', PATHS)
+@pytest.mark.parametrize('size', [4 * 5000 + 3, 4 * 70000 + 1], ids=['5000-blocks', '70000-blocks'])
+def test_large_inputs_match_reference(size, use_numpy):
+    data = random.Random(size).randbytes(size)
+    expected = _reference(data)
+    assert curseforge_fingerprint(data, use_numpy=use_numpy) == expected
+
+
+@pytest.mark.skipif(load_numpy() is None, reason="NumPy is not installed")
+def test_python_and_numpy_paths_agree_with_whitespace():
+    rng = random.Random(22)
+    for size in range(4 * 4096, 4 * 4096 + 8):
+        data = _random_bytes(rng, size, whitespace=True)
+        assert curseforge_fingerprint(data, use_numpy=True) == curseforge_fingerprint(data, use_numpy=False)
+
+
+def test_check_is_called_between_chunks():
+    calls = []
+    curseforge_fingerprint(bytes(4 * 70000), check=lambda: calls.append(1), use_numpy=False)
+    assert calls
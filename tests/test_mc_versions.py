@@ -0,0 +1,40 @@
+"""
+Golden tests of Minecraft version-constraint parsing.
+
+data/mc_versions.json holds constraints (common formats, edge cases and
+seeded random strings) with the versions the five-regex parser that
+parse_mc_versions replaced returned for them. Lists were returned in no
+particular order by that parser, so their recorded versions are sorted.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.extractors.base import parse_mc_versions
+from src.extractors.fabric import FabricExtractor
+from src.models import ModInfo
+
+GOLDEN = json.loads((Path(__file__).parent / 'data' / 'mc_versions.json').read_text(encoding='utf-8'))
+
+
+@pytest.mark.parametrize('constraint, versions', GOLDEN['strings'])
+def test_parse_mc_versions_matches_recorded(constraint, versions):
+    assert list(parse_mc_versions(constraint)) == versions
+
+
+@pytest.mark.parametrize('constraint, versions', GOLDEN['lists'])
+def test_constraint_lists_match_recorded(constraint, versions):
+    assert list(FabricExtractor()._parse_mc_versions(constraint)) == versions
+
+
+def test_parse_mc_versions_is_memoized():
+    assert parse_mc_versions('[1.20.1,1.21)') is parse_mc_versions('[1.20.1,1.21)')
+
+
+def test_extractors_reuse_the_memoized_tuple():
+    versions = FabricExtractor()._parse_mc_versions('>=1.20.1')
+    assert versions is parse_mc_versions('>=1.20.1')
+    mod = ModInfo(name='Example', loader='fabric', version='1.0', filename='example.jar', mc_versions=versions)
+    assert mod.mc_versions is versions
@@ -0,0 +1,81 @@
+"""
+Differential tests of the mods.toml fast path against tomllib.
+
+Every document in data/mods_toml must give the same result through
+scan_mods_toml as through a full tomllib parse restricted to the keys
+ForgeTomlExtractor reads. Files named *fallback* must be left to tomllib
+(scan_mods_toml returns None), all others must take the fast path.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from src.extractors.context import load_tomllib
+from src.extractors.modstoml import DEPENDENCY_KEYS, MOD_KEYS, ROOT_KEYS, scan_mods_toml
+
+CORPUS = sorted((Path(__file__).parent / 'data' / 'mods_toml').glob('*.toml'))
+
+tomllib = load_tomllib()
+pytestmark = pytest.mark.skipif(tomllib is None, reason="tomllib (or tomli) is not installed")
+
+
+def _read(path: Path) -> str:
+    """Document text with its line endings kept."""
+    return path.read_bytes().decode('utf-8')
+
+
+def _project(data: dict) -> dict:
+    """The part of a full parse scan_mods_toml returns."""
+    result = {key: data[key] for key in ROOT_KEYS if key in data}
+    if data.get('mods'):
+        result['mods'] = [{key: value for key, value in data['mods'][0].items() if key in MOD_KEYS}]
+    if 'dependencies' in data:
+        result['dependencies'] = {
+            mod_id: [{key: value for key, value in entry.items() if key in DEPENDENCY_KEYS} for entry in entries]
+            for mod_id, entries in data['dependencies'].items()
+        }
+    return result
+
+
+def _check(src: str):
+    """Compare both parsers on a document; returns the fast path's result."""
+    fast = scan_mods_toml(src)
+    try:
+        full = tomllib.loads(src)
+    except tomllib.TOMLDecodeError:
+        assert fast is None, f"fast path accepted an invalid document:\n{src}"
+        return fast
+    if fast is not None:
+        assert fast == _project(full), f"fast path disagrees with tomllib:\n{src}"
+    return fast
+
+
+@pytest.mark.parametrize('path', CORPUS, ids=lambda path: path.name)
+def test_corpus_matches_tomllib(path):
+    fast = _check(_read(path))
+    assert (fast is None) == ('fallback' in path.name)
+
+
+def test_mutated_corpus_matches_tomllib():
+    rng = random.Random(0)
+    documents = [_read(path) for path in CORPUS]
+    lines = [line for document in documents for line in document.splitlines()]
+    tokens = list('"\'[]{}=#\n\\ .,ab1\t') + ['"""', "'''", '[[', ']]', '\r\n', '\\u00e9', '\\x']
+
+    for _ in range(3000):
+        document = rng.choice(documents)
+        for _ in range(rng.randint(1, 3)):
+            operation = rng.random()
+            position = rng.randrange(len(document) + 1)
+            if operation < 0.3:
+                document = document[:position] + document[position + 1:]
+            elif operation < 0.6:
+                document = document[:position] + rng.choice(tokens) + document[position:]
+            else:
+                # Lines from other documents redefine keys and tables
+                document_lines = document.split('\n')
+                document_lines.insert(rng.randrange(len(document_lines) + 1), rng.choice(lines))
+                document = '\n'.join(document_lines)
+        _check(document)
@@ -0,0 +1,38 @@
+"""
+Tests of the extractor registry.
+"""
+
+import pytest
+
+from src import extractors
+from src.extractors import BUILTIN_EXTRACTORS, BaseExtractor, ExtractorSpec
+
+
+@pytest.mark.parametrize('spec', BUILTIN_EXTRACTORS, ids=lambda spec: spec.target)
+def test_builtin_spec_matches_its_class(spec):
+    extractor = spec.load()
+    assert not isinstance(extractor, ExtractorSpec)
+    assert spec.name == extractor.name
+    assert spec.priority == extractor.priority
+    assert spec.METADATA_FILES == tuple(extractor.METADATA_FILES)
+    assert spec.AUXILIARY_FILES == tuple(extractor.AUXILIARY_FILES)
+    assert spec.NESTED_FILES == tuple(extractor.NESTED_FILES)
+
+
+@pytest.mark.parametrize('spec', BUILTIN_EXTRACTORS, ids=lambda spec: spec.target)
+def test_builtin_class_is_exported(spec):
+    class_name = spec.target.rpartition(':')[2]
+    assert type(spec.load()) is getattr(extractors, class_name)
+
+
+def test_all_extractors_are_instances():
+    specs = [spec for spec in BUILTIN_EXTRACTORS if not spec.deep]
+    instances = extractors.ALL_EXTRACTORS
+    assert [type(extractor).__name__ for extractor in instances] == [
+        spec.target.rpartition(':')[2] for spec in specs
+    ]
+    assert all(isinstance(e, BaseExtractor) and not isinstance(e, ExtractorSpec) for e in instances)
+
+
+def test_deep_extractors_are_instances():
+    assert [type(extractor).__name__ for extractor in extractors.DEEP_EXTRACTORS] == ['ModAnnotationExtractor']
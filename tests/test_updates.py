@@ -0,0 +1,63 @@
+"""
+Tests of the offline update check.
+"""
+
+import pytest
+
+from src.extractors.base import parse_mc_versions
+from src.models import ModInfo
+from src.updates import check_updates
+
+
+def _mod(mc_versions, loader='fabric'):
+    return ModInfo(name='Example', loader=loader, version='1.0', filename='example-1.0.jar',
+                   mod_id='example', mc_versions=mc_versions)
+
+
+def _latest(mod, *mc_versions, loaders=('fabric',)):
+    catalog = [{'mod_id': 'example', 'version': '2.0', 'loaders': list(loaders), 'mc_versions': list(mc_versions)}]
+    updates = check_updates([mod], catalog).updates
+    return updates[0].latest_version if updates else None
+
+
+@pytest.mark.parametrize('constraint, mc_version, compatible', [
+    # Later versions the constraint allows on the declared line
+    ('>=1.20.1', '1.20.4', True),
+    ('~1.20.1', '1.20.1', True),
+    ('[1.20.1,1.21)', '1.20.6', True),
+    # The 1.20 prefix parsed from 1.20.1 is not a declared version
+    ('>=1.20.1', '1.20', False),
+    ('1.20.1', '1.20', False),
+    ('>=1.20.2', '1.20.1', False),
+    ('1.20.1', '1.19.2', False),
+    # Bare release lines and wildcards accept the whole line
+    ('1.20.x', '1.20', True),
+    ('1.20.x', '1.20.4', True),
+    ('[1.20,1.21)', '1.20.1', True),
+    ('1.20.x', '1.21', False),
+])
+def test_catalog_mc_versions_match_the_mod_constraint(constraint, mc_version, compatible):
+    mod = _mod(parse_mc_versions(constraint))
+    assert _latest(mod, mc_version) == ('2.0' if compatible else None)
+
+
+def test_any_catalog_mc_version_may_match():
+    assert _latest(_mod(parse_mc_versions('>=1.20.1')), '1.19.4', '1.20', '1.20.2') == '2.0'
+
+
+def test_file_name_wildcards_accept_the_whole_line():
+    assert _latest(_mod(['1.20.x']), '1.20') == '2.0'
+
+
+@pytest.mark.parametrize('mod_versions, catalog_versions', [
+    ((), ('1.20.1',)),
+    (parse_mc_versions('>=1.20.1'), ()),
+])
+def test_missing_mc_versions_do_not_rule_out(mod_versions, catalog_versions):
+    assert _latest(_mod(mod_versions), *catalog_versions) == '2.0'
+
+
+def test_other_loaders_are_ruled_out():
+    mod = _mod(parse_mc_versions('1.20.1'))
+    assert _latest(mod, '1.20.1', loaders=('forge',)) is None
+    assert _latest(_mod(mod.mc_versions, loader='unknown'), '1.20.1', loaders=('forge',)) == '2.0'
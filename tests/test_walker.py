@@ -0,0 +1,78 @@
+"""
+Tests of the directory walker.
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from src.walker import walk_jars
+
+
+class _ZeroInodeEntry:
+    """DirEntry whose stat() reports no inode, as on Windows."""
+
+    def __init__(self, entry):
+        self._entry = entry
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self):
+        return self._entry.is_dir()
+
+    def stat(self):
+        st = self._entry.stat()
+        return os.stat_result((st.st_mode, 0, 0) + tuple(st)[3:])
+
+
+def _zero_inode_scandir(scandir):
+    """os.scandir replacement listing _ZeroInodeEntry objects."""
+    @contextmanager
+    def zero_inode_scandir(path):
+        with scandir(path) as it:
+            yield [_ZeroInodeEntry(entry) for entry in it]
+    return zero_inode_scandir
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ('a', 'b', 'c'):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f'{name}.jar').write_bytes(b'')
+    (tmp_path / 'top.jar').write_bytes(b'')
+    return tmp_path
+
+
+def _names(root, **kwargs):
+    return sorted(jar.path.name for jar in walk_jars(root, **kwargs))
+
+
+def test_recursive_walk_finds_every_directory(tree):
+    assert _names(tree, recursive=True) == ['a.jar', 'b.jar', 'c.jar', 'top.jar']
+
+
+def test_zero_inode_dir_entries_do_not_hide_directories(tree, monkeypatch):
+    monkeypatch.setattr(os, 'scandir', _zero_inode_scandir(os.scandir))
+    assert _names(tree, recursive=True) == ['a.jar', 'b.jar', 'c.jar', 'top.jar']
+
+
+def test_zero_inodes_everywhere_do_not_hide_directories(tree, monkeypatch):
+    real_stat = os.stat
+
+    def zero_inode_stat(path, *args, **kwargs):
+        st = real_stat(path, *args, **kwargs)
+        return os.stat_result((st.st_mode, 0, 0) + tuple(st)[3:])
+
+    monkeypatch.setattr(os, 'scandir', _zero_inode_scandir(os.scandir))
+    monkeypatch.setattr(os, 'stat', zero_inode_stat)
+    assert _names(tree, recursive=True) == ['a.jar', 'b.jar', 'c.jar', 'top.jar']
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason="symlinks not supported")
+def test_symlink_loop_is_followed_once(tree):
+    try:
+        os.symlink(tree, tree / 'a' / 'loop', target_is_directory=True)
+    except OSError:
+        pytest.skip("cannot create symlinks")
+    assert _names(tree, recursive=True) == ['a.jar', 'b.jar', 'c.jar', 'top.jar']
@@ -5,6 +5,7 @@ A beautiful terminal app for extracting mod details from Minecraft JAR files.
 """
 
 import asyncio
+import multiprocessing
 import os
 import platform
 import string
@@ -33,7 +34,7 @@ from textual.widgets import (
 from textual.screen import ModalScreen
 
 from src import __version__
-from src.scanner import ModScanner
+from src.scanner import CancellationToken, ModScanner
 from src.models import ScanResult, ModInfo
 from src.formatters import FORMATTERS, get_formatter
 
@@ -184,6 +185,7 @@ class ModlistGeneratorApp(App):
         Binding("q", "quit", "Quit"),
         Binding("b", "browse", "Browse"),
         Binding("s", "scan", "Scan"),
+        Binding("c", "cancel_scan", "Cancel"),
         Binding("e", "export", "Export"),
         Binding("d", "toggle_dark", "Toggle Dark Mode"),
     ]
@@ -252,6 +254,11 @@ class ModlistGeneratorApp(App):
         margin-top: 1;
     }
     
+    #cancel-btn {
+        width: 100%;
+        margin-top: 1;
+    }
+    
     #export-btn {
         width: 100%;
         margin-top: 1;
@@ -313,6 +320,7 @@ class ModlistGeneratorApp(App):
         self.scan_result: Optional[ScanResult] = None
         self.input_folder: Path = Path.cwd()
         self.is_scanning = False
+        self.cancel_token: Optional[CancellationToken] = None
     
     def compose(self) -> ComposeResult:
         yield Header()
@@ -358,6 +366,7 @@ class ModlistGeneratorApp(App):
                 
                 # Action buttons
                 yield Button("🔍 Scan Mods", id="scan-btn", variant="success")
+                yield Button("⏹ Cancel Scan", id="cancel-btn", variant="error", disabled=True)
                 yield Button("💾 Export Results", id="export-btn", variant="primary", disabled=True)
                 
                 # Progress
@@ -405,6 +414,7 @@ class ModlistGeneratorApp(App):
         """Show folder selection screen."""
         def handle_folder(path: Optional[Path]) -> None:
             if path:
+                self.action_cancel_scan()
                 self.input_folder = path
                 self.query_one("#folder-input", Input).value = str(path)
                 log = self.query_one("#log-panel", RichLog)
@@ -416,9 +426,13 @@ class ModlistGeneratorApp(App):
     def on_folder_input_changed(self, event: Input.Changed) -> None:
         """Update input folder when text changes."""
         try:
-            self.input_folder = Path(event.value)
+            folder = Path(event.value)
         except Exception:
-            pass
+            return
+        if folder != self.input_folder:
+            # Results from the old folder are no longer wanted
+            self.action_cancel_scan()
+        self.input_folder = folder
     
     @on(DataTable.RowSelected)
     def on_row_selected(self, event: DataTable.RowSelected) -> None:
@@ -477,10 +491,29 @@ class ModlistGeneratorApp(App):
             log.write(f"[bold red]Error:[/] Folder not found: {self.input_folder}")
             return
         
-        self.run_scan()
+        self.cancel_token = CancellationToken()
+        self.query_one("#scan-btn", Button).disabled = True
+        self.query_one("#cancel-btn", Button).disabled = False
+        self.run_scan(self.cancel_token)
+    
+    @on(Button.Pressed, "#cancel-btn")
+    def on_cancel_pressed(self) -> None:
+        """Cancel scanning when button pressed."""
+        self.action_cancel_scan()
+    
+    def action_cancel_scan(self) -> None:
+        """Stop the running scan, keeping the results found so far."""
+        if self.is_scanning and self.cancel_token and not self.cancel_token.cancelled:
+            self.cancel_token.cancel()
+            self._update_status("Cancelling...", 0)
+    
+    def _scan_finished(self) -> None:
+        """Restore the scan controls after a scan ends."""
+        self.query_one("#scan-btn", Button).disabled = False
+        self.query_one("#cancel-btn", Button).disabled = True
     
     @work(exclusive=True, thread=True)
-    def run_scan(self) -> None:
+    def run_scan(self, cancel_token: CancellationToken) -> None:
         """Run the scan in a background thread."""
         self.is_scanning = True
         
@@ -505,7 +538,8 @@ class ModlistGeneratorApp(App):
                 self.input_folder,
                 recursive=recursive,
                 include_disabled=include_disabled,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                cancel_token=cancel_token
             )
             
             # Apply filters
@@ -524,7 +558,10 @@ class ModlistGeneratorApp(App):
             
             self.scan_result = result
             self.call_from_thread(self._display_results)
-            self.call_from_thread(log.write, f"[bold green]Scan complete![/] Found {len(result.mods)} mods in {result.scan_duration:.2f}s")
+            if result.cancelled:
+                self.call_from_thread(log.write, f"[bold yellow]Scan cancelled.[/] Showing {len(result.mods)} mods found before stopping")
+            else:
+                self.call_from_thread(log.write, f"[bold green]Scan complete![/] Found {len(result.mods)} mods in {result.scan_duration:.2f}s")
             
         except Exception as e:
             self.call_from_thread(log.write, f"[bold red]Error:[/] {str(e)}")
@@ -532,6 +569,7 @@ class ModlistGeneratorApp(App):
         
         finally:
             self.is_scanning = False
+            self.call_from_thread(self._scan_finished)
             self.call_from_thread(self._update_status, "Ready", 1.0)
     
     def _update_status(self, message: str, progress: float) -> None:
@@ -559,6 +597,8 @@ class ModlistGeneratorApp(App):
             f"⏱️ Duration: {result.scan_duration:.2f}s",
             f"🔧 Loaders: {loader_summary}",
         ]
+        if result.cancelled:
+            summary_lines.append("⏹ Scan cancelled (partial results)")
         if disabled_count > 0:
             summary_lines.append(f"🔴 Disabled: {disabled_count}")
         if result.errors:
@@ -637,4 +677,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()